@@ -0,0 +1,25 @@
+"""
+Per-request cost of resolving the DBConfig: re-parsing the BCOE&M config.php
+every time vs the mtime-keyed cache.
+
+    python -m benchmarks.bench_db_config
+"""
+import timeit
+
+from src.db import extract_db_config, load_db_config
+
+CONFIG = "./tests/fixtures/extract_db_config.php"
+N = 20_000
+
+
+def main() -> None:
+    parse = timeit.timeit(lambda: extract_db_config(CONFIG), number=N)
+    cached = timeit.timeit(lambda: load_db_config(CONFIG), number=N)
+
+    print(f"{'method':>10} {'us/request':>11}")
+    print(f"{'parse':>10} {parse / N * 1e6:>11.1f}")
+    print(f"{'cached':>10} {cached / N * 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Per-request cost of checking who is signed in: asking Google for userinfo on
+every request vs the session identity cache. Google is simulated with a
+fixed round trip latency.
+
+    python -m benchmarks.bench_identity
+"""
+import time
+import timeit
+from typing import Any, Dict, Optional
+
+from src.identity import resolve_identity
+
+LATENCY = 0.08
+N = 50
+
+
+class LatencyProvider:
+    def token(self) -> Optional[Dict[str, Any]]:
+        return {"access_token": "token", "expires_at": time.time() + 3600}
+
+    def userinfo(self) -> Dict[str, Any]:
+        time.sleep(LATENCY)
+        return {"email": "judge@example.com", "name": "Judge"}
+
+
+def main() -> None:
+    provider = LatencyProvider()
+    session: Dict[str, Any] = {}
+
+    uncached = timeit.timeit(
+        lambda: resolve_identity({}, provider, ttl=300), number=N
+    )
+    cached = timeit.timeit(
+        lambda: resolve_identity(session, provider, ttl=300), number=N
+    )
+
+    print(f"{'method':>10} {'ms/request':>11}")
+    print(f"{'userinfo':>10} {uncached / N * 1e3:>11.2f}")
+    print(f"{'cached':>10} {cached / N * 1e3:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
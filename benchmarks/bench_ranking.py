@@ -0,0 +1,70 @@
+"""
+Compares the key-based ranking engine with the old comparison-driven sort,
+where `ScoreEntry.__lt__` recorded countback status on every comparison.
+
+    python -m benchmarks.bench_ranking
+"""
+from copy import deepcopy
+from typing import Any, List
+
+from benchmarks.helpers import make_entries, timed
+from src.datadefs import CountbackStatus, CountbackStatusRec, ScoreEntry
+from src.ranking import rank_entries
+
+
+class LegacyScoreEntry(ScoreEntry):
+    """ScoreEntry with the previous side-effecting comparison operator"""
+
+    def __lt__(s, o: Any) -> bool:
+        if s.total_score != o.total_score:
+            return s.total_score < o.total_score
+
+        if s.overall != o.overall:
+            status = CountbackStatus.OVERALL_IMPRESSION
+        elif s.flavour != o.flavour:
+            status = CountbackStatus.FLAVOUR
+        elif s.score_spread != o.score_spread:
+            status = CountbackStatus.SMALLEST_SCORE_SPREAD
+        else:
+            status = CountbackStatus.RECALL_JUDGES
+
+        s.countback_status.add(CountbackStatusRec(status, o.entry_id))
+        o.countback_status.add(CountbackStatusRec(status, s.entry_id))
+
+        if status == CountbackStatus.OVERALL_IMPRESSION:
+            return s.overall < o.overall
+        if status == CountbackStatus.FLAVOUR:
+            return s.flavour < o.flavour
+        if status == CountbackStatus.SMALLEST_SCORE_SPREAD:
+            return s.score_spread < o.score_spread
+        return False
+
+
+def to_legacy(entries: List[ScoreEntry]) -> List[LegacyScoreEntry]:
+    memo = []
+    for e in entries:
+        legacy = LegacyScoreEntry.__new__(LegacyScoreEntry)
+        legacy.__dict__.update(deepcopy(e.__dict__))
+        memo.append(legacy)
+    return memo
+
+
+def main() -> None:
+    print(f"{'entries':>8} {'legacy s':>9} {'legacy recs':>12} {'ranked s':>9} {'ranked recs':>12}")
+
+    for n in (10_000, 50_000, 100_000):
+        entries = make_entries(n)
+        legacy = to_legacy(entries)
+
+        legacy_elapsed = timed(lambda: legacy.sort(reverse=True))
+        ranked_elapsed = timed(lambda: rank_entries(entries))
+
+        legacy_recs = sum(len(e.countback_status) for e in legacy)
+        ranked_recs = sum(len(e.countback_status) for e in entries)
+        print(
+            f"{n:>8} {legacy_elapsed:>9.3f} {legacy_recs:>12} {ranked_elapsed:>9.3f} {ranked_recs:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
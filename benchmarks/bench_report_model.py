@@ -0,0 +1,101 @@
+"""
+Allocations made building the report sections for a 5k-entry comp: the old
+per-category deepcopy of place getters vs report_model.build_report_model.
+
+    python -m benchmarks.bench_report_model
+"""
+import tracemalloc
+from copy import deepcopy
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.helpers import make_entries
+from src import constants
+from src.datadefs import ScoreEntry
+from src.models.brew_entries import BrewEntry
+from src.models.brewers import Brewer
+from src.models.judging_tables import JudgingTable
+from src.place_getter import determine_place_getters, group_by_category
+from src.ranking import rank_key
+from src.report_model import CATEGORIES_COMBOS, build_report_model, club_of_show_standings
+
+N = 5000
+
+
+def make_report_entries(n: int) -> List[ScoreEntry]:
+    # the report only covers the porter & stout categories
+    entries = make_entries(n, categories=[cc.category_code for cc in CATEGORIES_COMBOS])
+    tables = {i: JudgingTable(id=i, name=f"Table {i}", number=i) for i in range(1, 11)}
+
+    for e in entries:
+        assert e.brewer_id is not None and e.score_table is not None
+        e.brewer = Brewer(id=e.brewer_id, uid=e.brewer_id, last_name=f"Last {e.brewer_id}", first_name="First", club=f"Club {e.brewer_id % 20}")
+        e.brew_entry = BrewEntry(id=e.entry_id, name=f"Beer {e.entry_id}", style="Sweet Stout [BJCP 16A]", category=e.category, subcategory=e.sub_category)
+        e.judging_table = tables[e.score_table]
+
+    for candidates in group_by_category(entries).values():
+        determine_place_getters(candidates, 3)
+
+    return entries
+
+
+def legacy_report(entries: List[ScoreEntry], eids: Dict[str, int]) -> List[Any]:
+    memo: List[Any] = [club_of_show_standings(entries)]
+
+    for eid in eids.values():
+        memo.append([e for e in entries if e.entry_id == eid])
+
+    for cc in CATEGORIES_COMBOS:
+        placegetter_entries = sorted(
+            [deepcopy(x) for x in entries if x.category == cc.category_code and x.score_place is not None],
+            key=rank_key,
+            reverse=True,
+        )
+        placegetter_entry_ids = [p.entry_id for p in placegetter_entries]
+
+        for placegetter in placegetter_entries:
+            placegetter.countback_status = {
+                cbs for cbs in placegetter.countback_status if cbs.conflict_entry_id in placegetter_entry_ids
+            }
+
+        all_results = sorted([e for e in entries if e.category == cc.category_code], key=rank_key, reverse=True)
+        memo.append(placegetter_entries)
+        memo.append(all_results)
+
+    return memo
+
+
+def built_report(entries: List[ScoreEntry], eids: Dict[str, int]) -> List[Any]:
+    model = build_report_model(entries, eids, True)
+    # full results are ranked lazily, rank them here to compare like with like
+    return [model, [list(info.entries) for info in model.all_results_display_infos]]
+
+
+def measure(fn: Callable[[], Any]) -> Tuple[int, int]:
+    tracemalloc.start()
+    res = fn()
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(s.count for s in snapshot.statistics("filename"))
+    del res
+    return blocks, peak
+
+
+def main() -> None:
+    entries = make_report_entries(N)
+    eids: Dict[str, int] = {
+        constants.BREWER_OF_SHOW: entries[0].entry_id,
+        constants.BEST_NOVICE: entries[1].entry_id,
+    }
+
+    legacy_blocks, legacy_peak = measure(lambda: legacy_report(entries, eids))
+    model_blocks, model_peak = measure(lambda: built_report(entries, eids))
+
+    print(f"{N} entries")
+    print(f"{'method':>14} {'live blocks':>12} {'peak KiB':>9}")
+    print(f"{'deepcopy':>14} {legacy_blocks:>12} {legacy_peak / 1024:>9.0f}")
+    print(f"{'report_model':>14} {model_blocks:>12} {model_peak / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Compares the chunked bulk insert in `score_process.save_entries` with the
+previous one-`execute`-per-row loop.
+
+Uses a fake connection that sleeps for a fixed latency per round trip, which is
+what dominates on shared-hosting MySQL.
+
+    python -m benchmarks.bench_save_entries
+"""
+from typing import List
+
+from benchmarks.helpers import LatencyConnection, make_entries, timed
+from src.datadefs import ScoreEntry
+from src.score_process import INSERT_SCORE_SQL, save_entries, score_entry_row
+
+LATENCY = 0.002  # 2ms per round trip
+
+
+def save_entries_per_row(cnn: LatencyConnection, entries: List[ScoreEntry]) -> None:
+    cursor = cnn.cursor()
+
+    for entry in entries:
+        cursor.execute(INSERT_SCORE_SQL, score_entry_row(entry))
+
+    cnn.commit()
+
+
+def main() -> None:
+    print(f"{'entries':>8} {'method':>14} {'round trips':>12} {'seconds':>8} {'rows/sec':>10}")
+
+    for n in (500, 2000, 5000):
+        entries = make_entries(n)
+
+        cnn = LatencyConnection(LATENCY)
+        elapsed = timed(lambda: save_entries_per_row(cnn, entries))
+        print(f"{n:>8} {'per-row':>14} {cnn.round_trips:>12} {elapsed:>8.2f} {n / elapsed:>10.0f}")
+
+        for chunk_size in (100, 500):
+            cnn = LatencyConnection(LATENCY)
+            messages: List[str] = []
+            elapsed = timed(
+                lambda: save_entries(cnn, entries, messages, chunk_size=chunk_size)  # type: ignore
+            )
+            label = f"chunked/{chunk_size}"
+            print(f"{n:>8} {label:>14} {cnn.round_trips:>12} {elapsed:>8.2f} {n / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Time to first byte and total time for the full results page of a 10k-entry
+comp: render_template building the whole page vs stream_template.
+
+Entries are produced lazily with a small per-row delay standing in for
+reading rows off an unbuffered MySQL cursor.
+
+    python -m benchmarks.bench_stream_results
+"""
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+from flask import Flask, render_template, stream_template
+
+from benchmarks.bench_report_model import make_report_entries
+from src.controllers.all_results import results_display_info
+from src.datadefs import CountedIterable, ScoreEntry
+
+N = 10000
+ROW_DELAY = 0.00002
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+app = Flask(
+    __name__,
+    template_folder=str(SRC_PATH / "controllers" / "templates"),
+    static_folder=str(SRC_PATH / "static"),
+)
+
+
+def fetch_rows(entries: List[ScoreEntry]) -> Iterator[ScoreEntry]:
+    for e in entries:
+        time.sleep(ROW_DELAY)
+        yield e
+
+
+def buffered(entries: List[ScoreEntry]) -> Iterator[str]:
+    fetched = list(fetch_rows(entries))
+    yield render_template(
+        "all_results.html",
+        env_full_name="Benchmark",
+        results_display_info=results_display_info(fetched),
+    )
+
+
+def streamed(entries: List[ScoreEntry]) -> Iterator[str]:
+    return stream_template(
+        "all_results.html",
+        env_full_name="Benchmark",
+        results_display_info=results_display_info(
+            CountedIterable(fetch_rows(entries), len(entries))
+        ),
+    )
+
+
+def main() -> None:
+    entries = make_report_entries(N)
+    print(f"{N} entries, {ROW_DELAY * 1e6:.0f}us per row fetched")
+
+    for name, page in (("render_template", buffered), ("stream_template", streamed)):
+        with app.test_request_context():
+            start = time.perf_counter()
+            chunks = iter(page(entries))
+            first = next(chunks)
+            ttfb = time.perf_counter() - start
+            size = len(first) + sum(len(c) for c in chunks)
+            total = time.perf_counter() - start
+
+        print(f"{name:>16}: ttfb {ttfb * 1000:8.1f}ms  total {total * 1000:8.1f}ms  {size / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
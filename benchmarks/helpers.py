@@ -0,0 +1,86 @@
+import random
+import time
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from src.datadefs import ScoreEntry
+
+CATEGORIES = ["10", "11", "12", "13", "14", "15", "16", "17", "18", "19"]
+
+
+def make_entries(
+    n: int, seed: int = 42, categories: Sequence[str] = CATEGORIES
+) -> List[ScoreEntry]:
+    """Builds `n` synthetic score entries with a realistic amount of tied totals"""
+    rnd = random.Random(seed)
+    memo = []
+
+    for i in range(n):
+        aroma = rnd.randint(4, 12)
+        appearance = rnd.randint(1, 3)
+        flavour = rnd.randint(8, 20)
+        body = rnd.randint(2, 5)
+        overall = rnd.randint(4, 10)
+        memo.append(
+            ScoreEntry(
+                entry_id=i + 1,
+                category=rnd.choice(categories),
+                sub_category=f"{rnd.randint(1, 5):02}",
+                total_score=float(aroma + appearance + flavour + body + overall),
+                aroma=float(aroma),
+                appearance=float(appearance),
+                flavour=float(flavour),
+                body=float(body),
+                overall=float(overall),
+                score_spread=float(rnd.randint(0, 7)),
+                brewer_id=rnd.randint(1, max(1, n // 3)),
+                score_table=rnd.randint(1, 10),
+            )
+        )
+
+    return memo
+
+
+class LatencyCursor:
+    """Stand-in for a MySQLCursor that pays a fixed latency per round trip"""
+
+    def __init__(self, cnn: "LatencyConnection") -> None:
+        self.cnn = cnn
+
+    def execute(self, sql: str, params: Optional[Sequence[Any]] = None) -> None:
+        self.cnn.round_trip()
+
+    def executemany(self, sql: str, seq_params: Sequence[Sequence[Any]]) -> None:
+        self.cnn.round_trip()
+
+    def fetchall(self) -> List[Tuple]:
+        return []
+
+    def fetchone(self) -> Optional[Tuple]:
+        return None
+
+
+class LatencyConnection:
+    """Stand-in for a MySQLConnection, counts round trips and sleeps `latency` seconds per trip"""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.round_trips = 0
+
+    def round_trip(self) -> None:
+        self.round_trips += 1
+        time.sleep(self.latency)
+
+    def cursor(self, *args: Any, **kwargs: Any) -> LatencyCursor:
+        return LatencyCursor(self)
+
+    def commit(self) -> None:
+        self.round_trip()
+
+    def rollback(self) -> None:
+        self.round_trip()
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
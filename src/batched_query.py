@@ -0,0 +1,59 @@
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+from mysql.connector import MySQLConnection
+from mysql.connector.cursor import MySQLCursor
+
+T = TypeVar("T")
+
+DEFAULT_LOOKUP_CHUNK_SIZE = 500
+
+
+def chunked(items: Sequence[T], chunk_size: int) -> Iterator[Sequence[T]]:
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+
+    for i in range(0, len(items), chunk_size):
+        yield items[i : i + chunk_size]
+
+
+def placeholders(count: int, key_width: int = 1) -> str:
+    if key_width == 1:
+        return ", ".join(["%s"] * count)
+
+    row = "(" + ", ".join(["%s"] * key_width) + ")"
+    return ", ".join([row] * count)
+
+
+def select_in_chunks(
+    cnn: MySQLConnection,
+    sql: str,
+    keys: Iterable[Any],
+    chunk_size: int = DEFAULT_LOOKUP_CHUNK_SIZE,
+    params: Tuple = (),
+) -> Iterator[Tuple]:
+    """
+    Runs `sql` once per chunk of distinct `keys`, yielding every row.
+
+    `sql` must contain a single `{keys}` marker where the IN list goes, e.g.
+    `SELECT id, brewBrewerID FROM brewing WHERE id IN ({keys})`.
+    Keys may be tuples for row constructor lookups such as
+    `WHERE (a, b) IN ({keys})`. `params` are bound after the keys.
+    """
+    distinct_keys: List[Any] = sorted(set(keys))
+
+    if len(distinct_keys) == 0:
+        return
+
+    key_width = len(distinct_keys[0]) if isinstance(distinct_keys[0], tuple) else 1
+
+    for chunk in chunked(distinct_keys, chunk_size):
+        flat: List[Any] = []
+        for key in chunk:
+            flat.extend(key if key_width > 1 else (key,))
+
+        cursor: MySQLCursor = cnn.cursor()
+        cursor.execute(
+            sql.format(keys=placeholders(len(chunk), key_width)), tuple(flat) + params
+        )
+
+        for row in cursor.fetchall():
+            yield row
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar, Union
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    name: str
+    size: int
+    max_entries: int
+    ttl: float
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Union[str, int, float]]:
+        return {**asdict(self), "hit_rate": round(self.hit_rate(), 3)}
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Thread-safe LRU cache whose entries also expire `ttl` seconds after being set
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._clock = clock
+        # key -> (expires at, value), least recently used first
+        self._entries: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._stats = CacheStats(name=name, size=0, max_entries=0, ttl=0)
+        self.configure(max_entries, ttl)
+
+    def configure(self, max_entries: int, ttl: float) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+
+        with self._lock:
+            self.max_entries = max_entries
+            self.ttl = ttl
+            self._evict()
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            cached = self._entries.get(key)
+
+            if cached is None:
+                self._stats.misses += 1
+                return None
+
+            expires_at, value = cached
+
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._stats.expired += 1
+                self._stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def get_or_set(self, key: K, factory: Callable[[], V]) -> V:
+        value = self.get(key)
+
+        if value is None:
+            value = factory()
+            self.set(key, value)
+
+        return value
+
+    def invalidate(self, predicate: Callable[[K], bool]) -> int:
+        """
+        Removes every entry whose key matches `predicate`, returns how many were removed
+        """
+        with self._lock:
+            stale = [k for k in self._entries if predicate(k)]
+
+            for k in stale:
+                del self._entries[k]
+
+            self._stats.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self) -> None:
+        self.invalidate(lambda k: True)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                **{
+                    **asdict(self._stats),
+                    "size": len(self._entries),
+                    "max_entries": self.max_entries,
+                    "ttl": self.ttl,
+                }
+            )
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
@@ -1,14 +1,28 @@
-from typing import List, Optional
-from flask import Blueprint, current_app, render_template, request
+import time
+from typing import Iterator, List, Optional, Union
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    render_template,
+    request,
+    stream_template,
+    stream_with_context,
+)
 
 from src.controllers.helpers import (
+    capture_stream,
+    conditional_response,
     db_config_for_env_shortname,
     get_db_connection,
     message_log,
 )
 
-from src.datadefs import ResultsDisplayInfo, ScoreEntry
+from src.datadefs import CountedIterable, ResultsDisplayInfo, ScoreEntry
+from src import result_cache, snapshots
 from src.models import score_entries
+from src.models.data_version import RESULT_SOURCES, data_fingerprint
+from src.results_export import iter_csv
 from src.utils import must_have_valid_compenv, topt_or_authorized
 from mysql.connector import MySQLConnection
 
@@ -24,12 +38,23 @@ def before_request() -> None:
 
 
 @all_results.route("")
-def show() -> str:
+def show() -> Union[str, Response]:
     env_short_name = request.args.get("comp_env")
+    # checked by must_have_valid_compenv
+    assert env_short_name is not None
     env_full_name = [
         x[1] for x in current_app.config["BCOME_ENV_CHOICES"] if x[0] == env_short_name
     ][0]
 
+    view = snapshots.ALL_RESULTS_VIEW
+    snapshot = snapshots.read_snapshot(
+        env_short_name, view, current_app.config["SNAPSHOT_MAX_AGE"]
+    )
+
+    if snapshot is not None:
+        html = snapshot.html
+        return conditional_response(view, snapshot.fingerprint, lambda: html)
+
     messages: List[str] = []
     db_config = db_config_for_env_shortname(env_short_name, messages)
     cnn: Optional[MySQLConnection] = None
@@ -40,8 +65,67 @@ def show() -> str:
         messages.append(f"Error connecting to database: {e}")
         return message_log(messages)
 
-    entries: list[ScoreEntry] = score_entries.load_all(cnn)
-    results_display_info = ResultsDisplayInfo(
+    # snapshots written after this are from newer data than this render
+    started = time.time()
+    fingerprint = data_fingerprint(cnn, RESULT_SOURCES)
+
+    def store(html: str) -> None:
+        result_cache.put(env_short_name, view, fingerprint, html)
+        snapshots.refresh_snapshot(env_short_name, view, html, fingerprint, started)
+
+    cached = result_cache.get(env_short_name, view, fingerprint)
+
+    if cached is not None:
+        # rendered from the same data, refreshing the snapshot lets the next
+        # requests skip the database again
+        snapshots.refresh_snapshot(
+            env_short_name, view, cached, fingerprint, started
+        )
+
+    def render() -> Union[str, Iterator[str]]:
+        if cached is not None:
+            return cached
+
+        return capture_stream(stream_all_results(cnn, env_full_name), store)
+
+    return conditional_response(view, fingerprint, render)
+
+
+@all_results.route("/export.csv")
+def export_csv() -> Union[str, Response]:
+    """
+    Every scored entry as CSV, written row by row from the database cursor.
+
+    The upload headers come first, so the file can be uploaded again.
+    """
+    env_short_name = request.args.get("comp_env")
+    # checked by must_have_valid_compenv
+    assert env_short_name is not None
+    messages: List[str] = []
+    db_config = db_config_for_env_shortname(env_short_name, messages)
+
+    try:
+        cnn = get_db_connection(db_config)
+    except Exception as e:
+        messages.append(f"Error connecting to database: {e}")
+        return message_log(messages)
+
+    response = conditional_response(
+        "export_csv",
+        data_fingerprint(cnn, RESULT_SOURCES),
+        lambda: stream_with_context(iter_csv(score_entries.iter_all(cnn))),
+        mimetype="text/csv",
+    )
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename={env_short_name}-results.csv"
+    )
+    return response
+
+
+def results_display_info(
+    entries: Union[List[ScoreEntry], CountedIterable[ScoreEntry]]
+) -> ResultsDisplayInfo:
+    return ResultsDisplayInfo(
         category_heading="Full Results List",
         category_blurb=None,
         show_entry_count=True,
@@ -52,8 +136,24 @@ def show() -> str:
         entries=entries,
     )
 
+
+def render_all_results(cnn: MySQLConnection, env_full_name: str) -> str:
     return render_template(
         f"all_results.html",
         env_full_name=env_full_name,
-        results_display_info=results_display_info,
+        results_display_info=results_display_info(score_entries.load_all(cnn)),
+    )
+
+
+def stream_all_results(cnn: MySQLConnection, env_full_name: str) -> Iterator[str]:
+    """
+    Streams the page, rows are rendered as they are read from the database
+    """
+    entry_count = score_entries.count_all(cnn)
+    entries = CountedIterable(score_entries.iter_all(cnn), entry_count)
+
+    return stream_template(
+        f"all_results.html",
+        env_full_name=env_full_name,
+        results_display_info=results_display_info(entries),
     )
@@ -8,6 +8,7 @@ from mysql.connector import MySQLConnection
 from src.controllers.helpers import (backup_and_clear_scores,
                                      db_config_for_env_shortname,
                                      get_db_connection, message_log)
+from src import result_cache, snapshots
 from src.email import EmailReason, send_audit_email
 from src.utils import must_be_authorized
 
@@ -52,6 +53,9 @@ def show_form() -> str:
 
         messages.append("Connected to DB.")
         backup_and_clear_scores(cnn, env_short_name, messages)
+        cnn.commit()
+        result_cache.invalidate(env_short_name)
+        snapshots.remove_snapshots(env_short_name)
 
         send_audit_email(
             reason=EmailReason.ClearTable,
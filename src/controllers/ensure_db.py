@@ -1,5 +1,12 @@
 from typing import Any, Generator, List, Optional, Union
-from flask import Blueprint, Response, current_app, request, url_for
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    request,
+    stream_with_context,
+    url_for,
+)
 from mysql.connector import MySQLConnection
 
 from src.controllers.helpers import db_config_for_env_shortname, get_db_connection
@@ -94,4 +101,6 @@ def show() -> Union[str, Response]:
         for m in messages:
             yield (display_message(m))
 
-    return current_app.response_class(stream_process_csv(), mimetype="text/html")
+    return current_app.response_class(
+        stream_with_context(stream_process_csv()), mimetype="text/html"
+    )
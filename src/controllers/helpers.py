@@ -1,9 +1,10 @@
 from pathlib import Path
-from flask import current_app, render_template
+from typing import Callable, Generator, Iterator, List, Optional, Union
+from flask import Response, current_app, g, make_response, render_template, request
 from mysql.connector import MySQLConnection
 from src.datadefs import DBConfig
-from src.db import (create_connection, execute_backup_query,
-                    execute_clear_query, extract_db_config)
+from src.db import execute_backup_query, execute_clear_query, load_db_config
+from src.db_pool import ConnectionPool, get_pool
 from src.utils import determine_config, save_backup
 
 
@@ -19,15 +20,88 @@ def do_backup(cnn: MySQLConnection, env_short_name: str) -> Path:
     backup_path = save_backup(backup_res, env_short_name)
     return backup_path
 
+def get_db_pool(db_config: DBConfig) -> ConnectionPool:
+    return get_pool(
+        db_config,
+        size=current_app.config["DB_POOL_SIZE"],
+        idle_timeout=current_app.config["DB_POOL_IDLE_TIMEOUT"],
+        checkout_timeout=current_app.config["DB_POOL_CHECKOUT_TIMEOUT"],
+    )
+
+
 def get_db_connection(db_config: DBConfig) -> MySQLConnection:
-    return create_connection(db_config)
+    """
+    Checks out a pooled connection for the current request.
+
+    It is returned to the pool by `release_db_connections` when the app
+    context is torn down, so streamed responses must use `stream_with_context`.
+    """
+    pool = get_db_pool(db_config)
+    cnn = pool.checkout()
+    g.setdefault("pooled_connections", []).append((pool, cnn))
+    return cnn
+
+
+def release_db_connections(exc: Optional[BaseException] = None) -> None:
+    for pool, cnn in g.pop("pooled_connections", []):
+        pool.release(cnn)
 
 def db_config_for_env_shortname(env_short_name: str, messages: list[str]) -> DBConfig:
     env_full_name = [x[1] for x in current_app.config["BCOME_ENV_CHOICES"] if x[0] == env_short_name][0]
     messages.append(f"Selected {env_full_name}")
     config_file = determine_config(env_short_name)
     messages.append(f"Loading config from {config_file}")
-    return extract_db_config(config_file)
+    return load_db_config(config_file)
+
+
+def result_etag(view: str, fingerprint: str) -> str:
+    return f"{view}-{fingerprint}"
+
+
+def conditional_response(
+    view: str,
+    fingerprint: str,
+    render: Callable[[], Union[str, Iterator[str]]],
+    mimetype: str = "text/html",
+) -> Response:
+    """
+    Answers with 304 Not Modified if the client already holds this version of
+    the page, otherwise with the page from `render`, which may be streamed.
+
+    `render` is only called when a body is needed, so the 304 path never loads
+    entries or renders templates.
+    """
+    etag = result_etag(view, fingerprint)
+
+    if request.if_none_match.contains_weak(etag):
+        response = make_response("", 304)
+    else:
+        response = make_response(render())
+        response.mimetype = mimetype
+
+    response.set_etag(etag)
+    # pages sit behind a login, and must be revalidated on every refresh
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def capture_stream(
+    chunks: Iterator[str], on_complete: Callable[[str], None]
+) -> Generator[str, None, None]:
+    """
+    Passes a streamed page through, handing the whole page to `on_complete`
+    once the last chunk is sent.
+
+    Nothing is captured if the client disconnects part way through.
+    """
+    parts: List[str] = []
+
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+
+    on_complete("".join(parts))
 
 
 def message_log(messages: list[str]) -> str:
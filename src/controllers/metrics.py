@@ -0,0 +1,57 @@
+from typing import Any, Dict, List
+from flask import Blueprint, current_app, render_template
+from flask_wtf import FlaskForm  # type: ignore
+from wtforms import RadioField  # type: ignore
+from wtforms.validators import DataRequired  # type: ignore
+
+from src import metadata_cache, result_cache, snapshots
+from src.controllers.helpers import message_log
+from src.db_pool import all_pool_metrics
+from src.section_loader import section_stats
+from src.utils import must_be_authorized
+
+metrics = Blueprint("metrics", __name__, template_folder="templates")
+
+
+class PurgeCacheForm(FlaskForm):
+    environment = RadioField(
+        "Environment",
+        validators=[DataRequired()],
+    )
+
+
+@metrics.before_request
+@must_be_authorized
+def before_request() -> None:
+    """Protect all of the admin endpoints."""
+    pass
+
+
+@metrics.route("")
+def show() -> Dict[str, Any]:
+    return {
+        "db_pools": [m.to_dict() for m in all_pool_metrics()],
+        "result_cache": result_cache.stats().to_dict(),
+        "metadata_cache": metadata_cache.stats().to_dict(),
+        "report_sections": [s.to_dict() for s in section_stats()],
+    }
+
+
+@metrics.route("/purge", methods=["GET", "POST"])
+def purge_cache() -> str:
+    form = PurgeCacheForm()
+    form.environment.choices = current_app.config["BCOME_ENV_CHOICES"]
+
+    if form.validate_on_submit():
+        env_short_name = form.environment.data
+        messages: List[str] = []
+
+        removed = metadata_cache.purge(env_short_name)
+        messages.append(f"Removed {removed} cached metadata entries")
+        removed = result_cache.invalidate(env_short_name)
+        messages.append(f"Removed {removed} cached results pages")
+        snapshots.remove_snapshots(env_short_name)
+        messages.append("Removed pre-rendered results pages")
+        return message_log(messages)
+
+    return render_template(f"purge_cache_form.html", form=form)
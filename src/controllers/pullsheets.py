@@ -1,7 +1,10 @@
-from typing import List, Optional
-from flask import Blueprint, current_app, render_template, request
+from typing import List, Optional, Union
+from flask import Blueprint, Response, current_app, render_template, request
 
-from src.controllers.helpers import db_config_for_env_shortname, get_db_connection, message_log
+from src.controllers.helpers import conditional_response, db_config_for_env_shortname, get_db_connection, message_log
+from src import metadata_cache
+from src.metadata_cache import EnvMetadata
+from src.models.data_version import PULLSHEET_SOURCES, data_fingerprint
 from src.models.pullsheets import get_data
 from src.utils import must_have_valid_compenv, topt_or_authorized
 from mysql.connector import MySQLConnection
@@ -17,7 +20,7 @@ def before_request() -> None:
 
 
 @pullsheets.route("")
-def show() -> str:
+def show() -> Union[str, Response]:
     env_short_name = request.args.get('comp_env')
     env_full_name = [x[1] for x in current_app.config["BCOME_ENV_CHOICES"] if x[0] == env_short_name][0]
 
@@ -31,5 +34,10 @@ def show() -> str:
         messages.append(f"Error connecting to database: {e}")
         return message_log(messages)
 
-    tables = get_data(cnn)
-    return render_template(f"pullsheets.html", env_full_name=env_full_name, tables=tables)
+    fingerprint = metadata_cache.versioned(data_fingerprint(cnn, PULLSHEET_SOURCES))
+
+    def render() -> str:
+        tables = get_data(cnn, EnvMetadata(cnn, env_short_name, fingerprint))
+        return render_template(f"pullsheets.html", env_full_name=env_full_name, tables=tables)
+
+    return conditional_response("pullsheets", fingerprint, render)
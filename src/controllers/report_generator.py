@@ -1,21 +1,36 @@
-from copy import deepcopy
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
-from flask import Blueprint, current_app, render_template, request
+import time
+from typing import Any, Dict, Iterator, List, Optional, Union
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    render_template,
+    request,
+    stream_template,
+)
 
-from src import constants
+from src import metadata_cache, result_cache, snapshots
 from src.controllers.helpers import (
+    capture_stream,
+    conditional_response,
     db_config_for_env_shortname,
     get_db_connection,
+    get_db_pool,
     message_log,
 )
-from src.datadefs import CountbackStatus, ResultsDisplayInfo, ScoreEntry
+from src.datadefs import ScoreEntry
 from src.models import score_entries
 from src.models import special_best_data
 from src.models import staff
-from src.models.contest_info import ContestInfo, get_contest_info
-from src.models.sponsors import Sponsor, get_sponsors
-from src.models.staff import StaffSummary
+from src.models.data_version import REPORT_SOURCES, data_fingerprint
+from src.db_pool import ConnectionPool
+from src.metadata_cache import EnvMetadata
+from src.report_model import (
+    CATEGORIES_COMBOS,
+    ClubOfShowCandidate,
+    build_report_model,
+)
+from src.section_loader import SectionLoader, load_sections
 from src.utils import must_have_valid_compenv, topt_or_authorized
 from mysql.connector import MySQLConnection
 
@@ -30,66 +45,26 @@ def before_request() -> None:
     pass
 
 
-@dataclass
-class CategoryNameCodeCombo:
-    category_name: str
-    category_code: str
-
-
-@dataclass(order=False)
-class ClubOfShowCandidate:
-    name: str
-    firsts_count: int = 0
-    seconds_count: int = 0
-    thirds_count: int = 0
-    member_scores: list[float] = field(default_factory=list)
-    member_average_score: float = 0
-    entry_count: int = 0
-
-    def score(self) -> int:
-        return self.firsts_count * 3 + self.seconds_count * 2 + self.thirds_count * 1
-
-    def __lt__(s, o):
-        if not isinstance(o, s.__class__):
-            return False
-
-        self_score = s.score()
-        other_score = o.score()
-
-        if not self_score == other_score:
-            return self_score < other_score
-
-        self_member_average_score = s.member_average_score
-        other_member_average_score = o.member_average_score
-
-        if not self_member_average_score == other_member_average_score:
-            return self_member_average_score < other_member_average_score
-
-        self_entry_count = s.entry_count
-        other_entry_count = o.entry_count
-
-        return self_entry_count > other_entry_count
-
-    def __gt__(s, o):
-        return not s < o
-
-
-CATEGORIES_COMBOS = [
-    CategoryNameCodeCombo("Porter", "10"),
-    CategoryNameCodeCombo("Stout", "11"),
-    CategoryNameCodeCombo("Strong Stout", "12"),
-]
-
-
 @report_generator.route("")
-def show() -> str:
+def show() -> Union[str, Response]:
     env_short_name = request.args.get("comp_env")
+    # checked by must_have_valid_compenv
+    assert env_short_name is not None
     presentation_mode = request.args.get("presentation_mode", "False") == "True"
 
     env_full_name = [
         x[1] for x in current_app.config["BCOME_ENV_CHOICES"] if x[0] == env_short_name
     ][0]
 
+    view = snapshots.report_view(presentation_mode)
+    snapshot = snapshots.read_snapshot(
+        env_short_name, view, current_app.config["SNAPSHOT_MAX_AGE"]
+    )
+
+    if snapshot is not None:
+        html = snapshot.html
+        return conditional_response(view, snapshot.fingerprint, lambda: html)
+
     messages: List[str] = []
     db_config = db_config_for_env_shortname(env_short_name, messages)
     cnn: Optional[MySQLConnection] = None
@@ -100,155 +75,132 @@ def show() -> str:
         messages.append(f"Error connecting to database: {e}")
         return message_log(messages)
 
-    contest_info: Optional[ContestInfo] = None
-    staff_summary: Optional[StaffSummary] = None
-    sponsors: Optional[List[Sponsor]] = None
-
-    if not presentation_mode:
-        contest_info = get_contest_info(cnn)
-        staff_summary = staff.get_summary(cnn)
-        sponsors = get_sponsors(cnn)
-
-    entries: list[ScoreEntry] = score_entries.load_all(cnn)
-
-    for ent in entries:
-        if ent.brewer.club is None:
-            continue
+    # snapshots written after this are from newer data than this render
+    started = time.time()
+    fingerprint = metadata_cache.versioned(data_fingerprint(cnn, REPORT_SOURCES))
+    pool = get_db_pool(db_config)
 
-        stripped_club = ent.brewer.club.strip()
-        if len(stripped_club) == 0:
-            ent.brewer.club = None
+    def store(html: str) -> None:
+        result_cache.put(env_short_name, view, fingerprint, html)
+        snapshots.refresh_snapshot(env_short_name, view, html, fingerprint, started)
 
-        if stripped_club.lower() == "none":
-            ent.brewer.club = None
+    cached = result_cache.get(env_short_name, view, fingerprint)
 
-    entries_belonging_to_a_club = [e for e in entries if e.brewer.club is not None]
-    club_of_show_dict: Dict[str, ClubOfShowCandidate] = dict()
-
-    for entry_belonging_to_a_club in entries_belonging_to_a_club:
-        club_name = entry_belonging_to_a_club.brewer.club
-
-        if club_name not in club_of_show_dict:
-            club_of_show_dict[club_name] = ClubOfShowCandidate(name=club_name)
-
-        match entry_belonging_to_a_club.score_place:
-            case 1:
-                club_of_show_dict[club_name].firsts_count += 1
-            case 2:
-                club_of_show_dict[club_name].seconds_count += 1
-            case 3:
-                club_of_show_dict[club_name].thirds_count += 1
-
-        club_of_show_dict[club_name].entry_count += 1
-        club_of_show_dict[club_name].member_scores.append(
-            entry_belonging_to_a_club.total_score
+    if cached is not None:
+        # rendered from the same data, refreshing the snapshot lets the next
+        # requests skip the database again
+        snapshots.refresh_snapshot(
+            env_short_name, view, cached, fingerprint, started
         )
 
-    for x in club_of_show_dict.values():
-        if len(x.member_scores) == 0:
-            continue
+    def render() -> Union[str, Iterator[str]]:
+        if cached is not None:
+            return cached
+
+        return capture_stream(
+            stream_report(
+                cnn,
+                env_short_name,
+                env_full_name,
+                presentation_mode,
+                pool,
+                fingerprint,
+            ),
+            store,
+        )
 
-        x.member_average_score = sum(x.member_scores) / len(x.member_scores)
+    return conditional_response(view, fingerprint, render)
+
+
+def report_context(
+    cnn: MySQLConnection,
+    env_short_name: str,
+    env_full_name: str,
+    presentation_mode: bool,
+    pool: Optional[ConnectionPool] = None,
+    data_version: str = "",
+) -> Dict[str, Any]:
+    """
+    Loads the report's independent sections, in parallel when `pool` has
+    free connections, and builds the template context. Contest info and
+    sponsors come from the metadata cache, for the `data_version` the page
+    is rendered for.
+    """
+    sections: Dict[str, SectionLoader] = {
+        "entries": score_entries.load_all,
+        "special_bests": special_best_data.get_all_by_sbi_name,
+    }
 
-    club_of_show_list = sorted(club_of_show_dict.values(), reverse=True)
+    if not presentation_mode:
+        sections["contest_info"] = lambda c: EnvMetadata(
+            c, env_short_name, data_version
+        ).contest_info()
+        sections["staff_summary"] = staff.get_summary
+        sections["sponsors"] = lambda c: EnvMetadata(
+            c, env_short_name, data_version
+        ).sponsors()
+
+    loaded = load_sections(
+        cnn, pool, sections, current_app.config["REPORT_SECTION_WORKERS"]
+    )
+    current_app.logger.info(
+        "Loaded report sections: "
+        + ", ".join(
+            f"{t.name} {t.seconds * 1000:.0f}ms{'' if t.parallel else ' (inline)'}"
+            for t in loaded.timings
+        )
+    )
 
-    best_novice = []
-    sbd_novice = special_best_data.get_by_sbi_name(cnn, constants.BEST_NOVICE)
+    entries: list[ScoreEntry] = loaded.values["entries"]
+    special_best_eids: Dict[str, int] = {
+        name: sbd.eid for name, sbd in loaded.values["special_bests"].items()
+    }
 
-    if sbd_novice is not None:
-        best_novice = [e for e in entries if e.entry_id == sbd_novice.eid]
+    report_model = build_report_model(entries, special_best_eids, presentation_mode)
 
-    brewer_of_show = []
-    sbd_brewer_of_show = special_best_data.get_by_sbi_name(
-        cnn, constants.BREWER_OF_SHOW
+    return dict(
+        env_full_name=env_full_name,
+        club_of_show_list=report_model.club_of_show_list,
+        placegetter_display_infos=report_model.placegetter_display_infos,
+        all_results_display_infos=report_model.all_results_display_infos,
+        presentation_mode=presentation_mode,
+        staff_summary=loaded.values.get("staff_summary"),
+        contest_info=loaded.values.get("contest_info"),
+        sponsors=loaded.values.get("sponsors"),
     )
 
-    if sbd_brewer_of_show is not None:
-        brewer_of_show = [e for e in entries if e.entry_id == sbd_brewer_of_show.eid]
-
-    placegetter_display_infos: List[ResultsDisplayInfo] = [
-        ResultsDisplayInfo(
-            category_heading=constants.BREWER_OF_SHOW,
-            category_blurb="Brewer of Show will be awarded to the highest scoring beer in the competition.",
-            show_entry_count=False,
-            show_place_column=False,
-            show_countback=presentation_mode,
-            show_entry_id=False,
-            show_judging_table=False,
-            entries=brewer_of_show,
-        ),
-        ResultsDisplayInfo(
-            category_heading=constants.BEST_NOVICE,
-            category_blurb="The Best Novice Trophy is awarded to the highest score by a Victorian brewer who has not placed in a VicBrew accredited competition.",
-            show_entry_count=False,
-            show_place_column=False,
-            show_countback=False,
-            show_entry_id=False,
-            show_judging_table=False,
-            entries=best_novice,
-        ),
-    ]
-
-    all_results_display_infos: List[ResultsDisplayInfo] = []
-
-    for cc in CATEGORIES_COMBOS:
-        placegetter_entries = sorted(
-            [
-                deepcopy(x)
-                for x in entries
-                if x.category == cc.category_code and x.score_place is not None
-            ],
-            reverse=True,
-        )
 
-        placegetter_entry_ids = [p.entry_id for p in placegetter_entries]
-
-        for placegetter in placegetter_entries:
-            if placegetter.countback_status is None:
-                continue
-
-            kept_countback_status: Set[CountbackStatus] = set()
-            for cbs in placegetter.countback_status:
-                if cbs.conflict_entry_id in placegetter_entry_ids:
-                    kept_countback_status.add(cbs)
-            placegetter.countback_status = kept_countback_status
-
-        placegetter_display_infos.append(
-            ResultsDisplayInfo(
-                category_heading=cc.category_name,
-                category_blurb=None,
-                show_entry_count=False,
-                show_place_column=True,
-                show_countback=presentation_mode,
-                show_entry_id=presentation_mode,
-                show_judging_table=False,
-                entries=placegetter_entries,
-            )
-        )
+def render_report(
+    cnn: MySQLConnection,
+    env_short_name: str,
+    env_full_name: str,
+    presentation_mode: bool,
+    pool: Optional[ConnectionPool] = None,
+    data_version: str = "",
+) -> str:
+    return render_template(
+        f"report_generator.html",
+        **report_context(
+            cnn, env_short_name, env_full_name, presentation_mode, pool, data_version
+        ),
+    )
 
-        all_results_display_infos.append(
-            ResultsDisplayInfo(
-                category_heading=cc.category_name,
-                category_blurb=None,
-                show_entry_count=True,
-                show_place_column=False,
-                show_countback=presentation_mode,
-                show_entry_id=presentation_mode,
-                show_judging_table=False,
-                entries=sorted(
-                    [e for e in entries if e.category == cc.category_code], reverse=True
-                ),
-            )
-        )
 
-    return render_template(
+def stream_report(
+    cnn: MySQLConnection,
+    env_short_name: str,
+    env_full_name: str,
+    presentation_mode: bool,
+    pool: Optional[ConnectionPool] = None,
+    data_version: str = "",
+) -> Iterator[str]:
+    """
+    Streams the report, each category's full results are ranked as the
+    template reaches them
+    """
+    return stream_template(
         f"report_generator.html",
-        env_full_name=env_full_name,
-        club_of_show_list=club_of_show_list,
-        placegetter_display_infos=placegetter_display_infos,
-        all_results_display_infos=all_results_display_infos,
-        presentation_mode=presentation_mode,
-        staff_summary=staff_summary,
-        contest_info=contest_info,
-        sponsors=sponsors,
+        **report_context(
+            cnn, env_short_name, env_full_name, presentation_mode, pool, data_version
+        ),
     )
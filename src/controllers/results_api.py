@@ -0,0 +1,179 @@
+from typing import Dict, Iterator, List, Optional, Union
+from flask import Blueprint, Response, abort, request, stream_with_context
+
+from src import constants
+from src.controllers.helpers import (
+    conditional_response,
+    db_config_for_env_shortname,
+    get_db_connection,
+)
+from src.models import score_entries
+from src.models import special_best_data
+from src.models.data_version import RESULT_SOURCES, data_fingerprint
+from src.report_model import club_of_show_standings, normalise_clubs
+from src.results_json import club_to_dict, dumps, parse_fields, score_to_dict
+from src.utils import must_have_valid_compenv, topt_or_authorized
+from mysql.connector import MySQLConnection
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+JSON_MIMETYPE = "application/json"
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+results_api = Blueprint("results_api", __name__)
+
+
+@results_api.before_request
+@topt_or_authorized
+@must_have_valid_compenv
+def before_request() -> None:
+    """Protect all of the admin endpoints."""
+    pass
+
+
+def connect() -> MySQLConnection:
+    env_short_name = request.args.get("comp_env")
+    # checked by must_have_valid_compenv
+    assert env_short_name is not None
+    messages: List[str] = []
+    db_config = db_config_for_env_shortname(env_short_name, messages)
+
+    try:
+        return get_db_connection(db_config)
+    except Exception as e:
+        abort(503, f"Error connecting to database: {e}")
+
+
+def int_arg(
+    name: str, default: Optional[int], minimum: int, maximum: Optional[int] = None
+) -> Optional[int]:
+    value = request.args.get(name)
+
+    if value is None:
+        return default
+
+    try:
+        parsed = int(value)
+    except ValueError:
+        abort(400, f"{name} must be a whole number")
+
+    if parsed < minimum:
+        abort(400, f"{name} must be at least {minimum}")
+
+    if maximum is not None and parsed > maximum:
+        abort(400, f"{name} must be at most {maximum}")
+
+    return parsed
+
+
+def requested_fields() -> List[str]:
+    try:
+        return parse_fields(request.args.get("fields"))
+    except ValueError as e:
+        abort(400, str(e))
+
+
+@results_api.route("/scores")
+def scores() -> Response:
+    """
+    Scores in highest-score-first order.
+
+    `fields` picks the keys of each score, `placed=True` limits to place
+    getters. JSON responses are paged with `offset` and `limit`,
+    `format=ndjson` streams one score per line and is only limited if
+    `limit` is given.
+    """
+    fields = requested_fields()
+    placed_only = request.args.get("placed", "False") == "True"
+    ndjson = request.args.get("format", "json") == "ndjson"
+    offset = int_arg("offset", 0, 0) or 0
+    limit = int_arg("limit", None if ndjson else DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+
+    cnn = connect()
+    fingerprint = data_fingerprint(cnn, RESULT_SOURCES)
+
+    def render() -> Union[str, Iterator[str]]:
+        if ndjson:
+            return stream_with_context(
+                f"{dumps(score_to_dict(e, fields))}\n"
+                for e in score_entries.iter_all(
+                    cnn, placed_only, limit=limit, offset=offset
+                )
+            )
+
+        total = score_entries.count_all(cnn, placed_only)
+        page = [
+            score_to_dict(e, fields)
+            for e in score_entries.iter_all(cnn, placed_only, limit=limit, offset=offset)
+        ]
+        return dumps({"total": total, "offset": offset, "limit": limit, "scores": page})
+
+    return conditional_response(
+        "api_scores",
+        fingerprint,
+        render,
+        mimetype=NDJSON_MIMETYPE if ndjson else JSON_MIMETYPE,
+    )
+
+
+@results_api.route("/clubs")
+def clubs() -> Response:
+    """
+    Club of show standings, in the same order as the report
+    """
+    cnn = connect()
+    fingerprint = data_fingerprint(cnn, RESULT_SOURCES)
+
+    def render() -> str:
+        entries = score_entries.load_all(cnn)
+        normalise_clubs(entries)
+        standings = club_of_show_standings(entries)
+        return dumps(
+            {"clubs": [club_to_dict(c, i + 1) for i, c in enumerate(standings)]}
+        )
+
+    return conditional_response("api_clubs", fingerprint, render, JSON_MIMETYPE)
+
+
+@results_api.route("/special_bests")
+def special_bests() -> Response:
+    """
+    Special best winners, Brewer of Show and Best Novice are always listed
+    and `entry` is null until they are set
+    """
+    fields = requested_fields()
+    cnn = connect()
+    fingerprint = data_fingerprint(cnn, RESULT_SOURCES)
+
+    def render() -> str:
+        winner_eids: Dict[str, int] = {
+            name: sbd.eid
+            for name, sbd in special_best_data.get_all_by_sbi_name(cnn).items()
+        }
+        names = [constants.BREWER_OF_SHOW, constants.BEST_NOVICE]
+        names += sorted(n for n in winner_eids if n not in names)
+
+        winners = {
+            e.entry_id: e
+            for e in score_entries.iter_all(cnn, entry_ids=set(winner_eids.values()))
+        }
+
+        return dumps(
+            {
+                "special_bests": [
+                    {
+                        "name": name,
+                        "entry": (
+                            score_to_dict(winners[winner_eids[name]], fields)
+                            if winner_eids.get(name) in winners
+                            else None
+                        ),
+                    }
+                    for name in names
+                ]
+            }
+        )
+
+    return conditional_response(
+        "api_special_bests", fingerprint, render, JSON_MIMETYPE
+    )
@@ -1,15 +1,17 @@
-from dataclasses import dataclass
-from typing import Any, Generator, List, Optional, Union
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 from flask import (
     Blueprint,
-    Response,
     abort,
+    copy_current_request_context,
     current_app,
     g,
+    redirect,
     render_template,
     request,
     url_for,
 )
+from flask.typing import ResponseReturnValue
 from flask_wtf import FlaskForm  # type: ignore
 from flask_wtf.file import (
     FileAllowed,
@@ -17,56 +19,46 @@ from flask_wtf.file import (
     FileRequired,
     FileSize,
 )
-from wtforms import BooleanField, RadioField  # type: ignore
+from wtforms import BooleanField, RadioField, StringField  # type: ignore
 from wtforms.validators import DataRequired  # type: ignore
 from mysql.connector import MySQLConnection
 
+from src import metadata_cache, result_cache, snapshots
+from src.controllers.all_results import render_all_results
 from src.controllers.helpers import (
     backup_and_clear_scores,
     db_config_for_env_shortname,
+    do_backup,
     get_db_connection,
 )
-from src.csv_validate import (
-    REQUIRED_HEADERS,
-    validate_headers,
-    is_csv,
-    try_decode_stream,
-)
-from src.datadefs import ScoreEntry
+from src.controllers.report_generator import render_report
+from src.datadefs import DBConfig, ScoreEntry, ScoreWriteMode
 from src.email import EmailReason, send_audit_email
-from src.models.brewers import get_brewer_dict
+from src.jobs import Job, JobLog, get_runner
+from src.metadata_cache import EnvMetadata
+from src.models.brewers import get_brewer_dict_for_ids
+from src.models.data_version import REPORT_SOURCES, RESULT_SOURCES, data_fingerprint
+from src.models import judging_scores
 from src.models.judging_scores import check_create_westgate_fields
 from src.models.special_best_data import set_special_best_winner
-from src.place_getter import determine_place_getters
-from src.score_process import load_entries_from_csv, prepare_entries, save_entries
-from src.utils import must_be_authorized, save_upload
-
-
-MESSAGES_HEADER = """
-<!DOCTYPE html>
-<html lang="en">
-    <head>
-        <!-- Required meta tags -->
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1, shrink-to-fit=no">
-        <link 
-            rel="stylesheet"
-            href="{bootstrap_css}"
-        >
-        <title>Score Upload System - Upload processing results</title>
-    </head>
-<body>
-    <div class="container">
-        <h1>Message Log</h1>
-"""
-
-MESSAGES_FOOTER = """
-    <p><a href="{homepage_path}" >Back to home</a></p>
-    </div>
-    <script src="{bootstrap_js}"></script> 
-</body>
-</html>
-"""
+from src.place_getter import determine_place_getters, group_by_category
+from src.report_model import CATEGORIES_COMBOS
+from src.score_diff import apply_diff, diff_scores
+from src.score_process import prepare_entries, save_entries, swap_in_entries
+from src.table_upload import (
+    diff_table_scope,
+    load_table_scope,
+    table_ids_for_numbers,
+)
+from src.upload_ingest import ingest_upload
+from src.utils import (
+    format_error_message,
+    must_be_authorized,
+    save_upload,
+    upload_spool_path,
+)
+
+UPLOAD_JOB_KIND = "upload_scores"
 
 
 @dataclass
@@ -76,11 +68,90 @@ class DeterminePlaceGetterReq:
     category_name: str
 
 
+CATEGORY_NAMES = {cc.category_code: cc.category_name for cc in CATEGORIES_COMBOS}
+
+
+def category_display_name(category: str) -> str:
+    return CATEGORY_NAMES.get(category, f"Category {category}")
+
+
+def category_sort_key(category: str) -> str:
+    return category.zfill(4)
+
+
+def write_result_snapshots(
+    cnn: MySQLConnection, env_short_name: str, env_full_name: str, messages: list[str]
+) -> None:
+    """
+    Pre-renders the results pages so they can be served without hitting the database
+    """
+    try:
+        snapshots.write_snapshot(
+            env_short_name,
+            snapshots.ALL_RESULTS_VIEW,
+            render_all_results(cnn, env_full_name),
+            data_fingerprint(cnn, RESULT_SOURCES),
+        )
+        report_fingerprint = metadata_cache.versioned(
+            data_fingerprint(cnn, REPORT_SOURCES)
+        )
+
+        for presentation_mode in (False, True):
+            snapshots.write_snapshot(
+                env_short_name,
+                snapshots.report_view(presentation_mode),
+                render_report(
+                    cnn,
+                    env_short_name,
+                    env_full_name,
+                    presentation_mode,
+                    data_version=report_fingerprint,
+                ),
+                report_fingerprint,
+            )
+    except Exception as e:
+        snapshots.remove_snapshots(env_short_name)
+        messages.append(f"Unable to pre-render results pages: {e}")
+        return
+
+    messages.append("Pre-rendered results pages")
+
+
 upload_scores = Blueprint("upload_scores", __name__, template_folder="templates")
 
 
-def display_message(message: str) -> str:
-    return f"<p>{message}</p>"
+@dataclass
+class UploadJob:
+    env_short_name: str
+    env_full_name: str
+    db_config: DBConfig
+    entries: List[ScoreEntry]
+    user_name: str
+    user_email: str
+    save_chunk_size: int
+    all_results_link: str
+    write_mode: ScoreWriteMode = ScoreWriteMode.SWAP
+    # judging table numbers, only their scores are replaced when given
+    table_numbers: List[int] = field(default_factory=list)
+
+
+PLACES_NOTE = "Place getters are set automatically, count-backs that need the judges recalled and Best Novice must still be set in BCOE&M."
+
+# what confirming an upload does, by write mode
+CONFIRM_DESCRIPTIONS: Dict[ScoreWriteMode, str] = {
+    ScoreWriteMode.SWAP: "All existing scores will be backed up, then replaced with the uploaded scores in one step.",
+    ScoreWriteMode.DIFF: "Existing scores will be backed up, then scores that differ from the upload are changed, new scores added and scores missing from the file removed.",
+    ScoreWriteMode.CLEAR_AND_INSERT: "All existing scores will be backed up and cleared, results are empty until the uploaded scores are inserted.",
+}
+# table uploads always write only the changes
+TABLES_CONFIRM_DESCRIPTION = "Existing scores will be backed up, then only scores on the given judging tables are replaced and places recalculated for their categories, other scores are kept."
+
+
+def confirm_description(write_mode: ScoreWriteMode, for_tables: bool) -> str:
+    if for_tables:
+        return f"{TABLES_CONFIRM_DESCRIPTION} {PLACES_NOTE}"
+
+    return f"{CONFIRM_DESCRIPTIONS[write_mode]} {PLACES_NOTE}"
 
 
 class UploadScoreForm(FlaskForm):
@@ -96,13 +167,69 @@ class UploadScoreForm(FlaskForm):
             FileAllowed(["csv"]),
         ],
     )
+    write_mode = RadioField(
+        "Replace scores by",
+        choices=[
+            (
+                ScoreWriteMode.SWAP.value,
+                "Loading a copy and swapping it in, results stay readable throughout",
+            ),
+            (
+                ScoreWriteMode.DIFF.value,
+                "Writing only the scores that changed, quickest for re-uploads after small corrections",
+            ),
+            (
+                ScoreWriteMode.CLEAR_AND_INSERT.value,
+                "Clearing then inserting, for databases that don't allow CREATE / RENAME TABLE",
+            ),
+        ],
+        default=ScoreWriteMode.SWAP.value,
+        validators=[DataRequired()],
+    )
+    judging_tables = StringField(
+        "Judging tables",
+        description="Only replace the scores for these table numbers, e.g. 1, 4, 5. Leave blank to replace every score. Scores for other tables in the file are ignored.",
+    )
     confirm = BooleanField(
         "Confirm",
-        description="All existing scores will be cleared and you will have to login to BCOE&M to manually set place-getters.",
+        # replaced as the write mode and tables change, see render_form
+        description=confirm_description(ScoreWriteMode.SWAP, False),
         validators=[DataRequired()],
     )
 
 
+def render_form(form: UploadScoreForm) -> str:
+    """
+    Renders the form with the confirm text for the chosen write mode and
+    tables, and the texts for the other choices so the page can switch them
+    """
+    try:
+        write_mode = ScoreWriteMode(form.write_mode.data)
+    except ValueError:
+        write_mode = ScoreWriteMode.SWAP
+
+    for_tables = len((form.judging_tables.data or "").strip()) > 0
+    form.confirm.description = confirm_description(write_mode, for_tables)
+    return render_template(
+        f"upload_scores_form.html",
+        form=form,
+        confirm_descriptions={
+            mode.value: confirm_description(mode, False) for mode in ScoreWriteMode
+        },
+        tables_confirm_description=confirm_description(write_mode, True),
+    )
+
+
+def parse_table_numbers(value: Optional[str]) -> List[int]:
+    if value is None or len(value.strip()) == 0:
+        return []
+
+    try:
+        return sorted({int(n) for n in value.replace(" ", "").split(",") if n != ""})
+    except ValueError:
+        raise ValueError("Enter judging table numbers separated by commas")
+
+
 @upload_scores.before_request
 @must_be_authorized
 def before_request() -> None:
@@ -110,226 +237,375 @@ def before_request() -> None:
     pass
 
 
-@upload_scores.route("/", methods=["GET", "POST"])
-def show_form() -> Union[str, Response]:
-    form = UploadScoreForm()
-    form.environment.choices = current_app.config["BCOME_ENV_CHOICES"]
+def save_scores(cnn: MySQLConnection, job: UploadJob, messages: list[str]) -> bool:
+    """
+    Replaces the saved scores with the job's entries using its write mode
+    """
+    chunk_size = job.save_chunk_size
+
+    if job.write_mode == ScoreWriteMode.CLEAR_AND_INSERT:
+        return save_entries(cnn, job.entries, messages, chunk_size=chunk_size)
+
+    if job.write_mode == ScoreWriteMode.DIFF:
+        diff = diff_scores(judging_scores.load_all(cnn), job.entries)
+        messages.append(f"Score changes: {diff.summary()}")
+        return apply_diff(cnn, diff, messages, chunk_size=chunk_size)
+
+    return swap_in_entries(cnn, job.entries, messages, chunk_size=chunk_size)
+
+
+def flush_messages(messages: list[str], log: JobLog) -> None:
+    for m in messages:
+        log(m)
+    messages.clear()
+
+
+def load_brewers(
+    cnn: MySQLConnection, entries: List[ScoreEntry], messages: list[str]
+) -> bool:
+    """
+    Sets the brewer on each entry, returns False if any entry's brewer can't
+    be found
+    """
+    brewer_ids = [e.brewer_id for e in entries if e.brewer_id is not None]
+    brewer_dict = get_brewer_dict_for_ids(cnn, brewer_ids)
+    missing_entry_ids: List[int] = []
+
+    for e in entries:
+        brewer = None if e.brewer_id is None else brewer_dict.get(e.brewer_id)
+
+        if brewer is None:
+            missing_entry_ids.append(e.entry_id)
+        else:
+            e.brewer = brewer
+
+    if len(missing_entry_ids) > 0:
+        format_error_message(
+            f"Cannot find brewers for the following entries: {missing_entry_ids}",
+            messages,
+        )
+        return False
+
+    return True
+
+
+def set_places(
+    cnn: MySQLConnection,
+    bos_candidates: List[ScoreEntry],
+    category_index: Dict[str, List[ScoreEntry]],
+    messages: list[str],
+) -> None:
+    """
+    Places Brewer of Show from `bos_candidates` and the top three of each category
+    """
+    dpgrs: List[DeterminePlaceGetterReq] = [
+        DeterminePlaceGetterReq(
+            category=None,
+            category_name="Brewer of Show",
+            required_places=1,
+        ),
+    ]
+    dpgrs.extend(
+        DeterminePlaceGetterReq(
+            category=category,
+            category_name=category_display_name(category),
+            required_places=3,
+        )
+        for category in sorted(category_index, key=category_sort_key)
+    )
 
-    if form.validate_on_submit():
-        ok = True
-        d = form.csv_file.data
-        t_io = try_decode_stream(d.stream.read())
+    for dpgr in dpgrs:
+        if dpgr.category is None:
+            dpgr_res = determine_place_getters(
+                bos_candidates,
+                dpgr.required_places,
+            )
+        else:
+            dpgr_res = determine_place_getters(
+                category_index[dpgr.category],
+                dpgr.required_places,
+            )
 
-        if t_io is None:
-            form.csv_file.errors.append("Binary files not supported!")
-            ok = False
+        if dpgr_res.success:
+            messages.append(f"Set places for {dpgr.category_name}")
+            if dpgr.category_name == "Brewer of Show":
+                set_special_best_winner(
+                    cnn, dpgr_res.place_getters[0], "Brewer of Show", messages
+                )
+        else:
+            messages.append(
+                f"Unable to set places for {dpgr.category_name}, unable to resolve count-back, must recall the judges"
+            )
 
-        if t_io and not is_csv(t_io):
-            form.csv_file.errors.append("Does not appear to be a CSV")
-            ok = False
 
-        if not ok:
-            return render_template(f"upload_scores_form.html", form=form)
+def place_and_save_all(
+    cnn: MySQLConnection, job: UploadJob, log: JobLog, messages: list[str]
+) -> Optional[int]:
+    """
+    Places every entry and replaces all scores, returns how many were saved
+    """
+    entries = job.entries
+    log(f"Determining place getters...")
+    log(f"{len(entries)} entries")
 
-        vhr = validate_headers(t_io)
-        if not vhr.ok:
-            form.csv_file.errors.append(f"Missing required headers: {vhr.missing}")
-            return render_template(f"upload_scores_form.html", form=form)
+    log("Loading brewer list...")
 
-        homepage_path = url_for("homepage.show")
+    if not load_brewers(cnn, entries, messages):
+        return None
 
-        user_name = g.user_name
-        user_email = g.user_email
-        bootstrap_css = url_for("static", filename="css/bootstrap.min.css")
-        bootstrap_js = url_for("static", filename="js/bootstrap.min.js")
+    set_places(cnn, entries, group_by_category(entries), messages)
 
-        messages: List[str] = [MESSAGES_HEADER.format(bootstrap_css=bootstrap_css)]
-        env_short_name = form.environment.data
-        all_res_link = url_for("all_results.show", comp_env=env_short_name)
-        env_full_name = [
-            x[1]
-            for x in current_app.config["BCOME_ENV_CHOICES"]
-            if x[0] == env_short_name
-        ][0]
-        db_config = db_config_for_env_shortname(env_short_name, messages)
-        remote_addr = request.remote_addr
+    flush_messages(messages, log)
+    log(f"Saving scores to database, please standby...")
 
-        def stream_process_csv() -> Generator[str, Any, None]:
-            for m in messages:
-                yield (display_message(m))
-            messages.clear()
+    if not save_scores(cnn, job, messages):
+        return None
 
-            if t_io is None:
-                abort(500, "Expected a stream")
+    return len(entries)
 
-            filename = save_upload(
-                t_io, user_name, user_email, env_short_name, remote_addr
-            )
-            yield (display_message(f"Saved upload to {filename}"))
-
-            entries: List[ScoreEntry] = []
-
-            try:
-                entries = load_entries_from_csv(t_io)
-            except Exception as e:
-                yield (f"Error loading CSV: {e}")
-                yield (
-                    MESSAGES_FOOTER.format(
-                        homepage_path=homepage_path, bootstrap_js=bootstrap_js
-                    )
-                )
-                return
 
-            yield (display_message(f"Loaded entries from CSV"))
+def place_and_save_tables(
+    cnn: MySQLConnection, job: UploadJob, log: JobLog, messages: list[str]
+) -> Optional[int]:
+    """
+    Replaces the scores on the job's judging tables.
 
-            cnn: Optional[MySQLConnection] = None
+    Only the categories with scores on those tables are re-placed. Brewer of
+    Show is decided between the uploaded entries and the best saved scores
+    from other tables. Returns how many uploaded scores were saved.
+    """
+    table_styles = EnvMetadata(cnn, job.env_short_name).table_styles()
+    table_ids, unknown = table_ids_for_numbers(table_styles, job.table_numbers)
 
-            try:
-                cnn = get_db_connection(db_config)
-            except Exception as e:
-                yield (f"Error connecting to database: {e}")
-                yield (
-                    MESSAGES_FOOTER.format(
-                        homepage_path=homepage_path, bootstrap_js=bootstrap_js
-                    )
-                )
-                return
+    if len(unknown) > 0:
+        format_error_message(f"No judging tables numbered: {unknown}", messages)
+        return None
 
-            yield (display_message("Connected to DB."))
-            yield (display_message(f"Starting data validation..."))
+    scope = load_table_scope(cnn, job.entries, table_ids)
+    log(
+        f"Replacing scores for tables {', '.join(str(n) for n in job.table_numbers)}: {len(scope.entries)} entries"
+    )
+    ignored = len(job.entries) - len(scope.entries)
+    if ignored > 0:
+        log(f"Ignoring {ignored} entries judged at other tables")
 
-            data_valid = prepare_entries(cnn, entries, messages)
-            for m in messages:
-                yield (display_message(m))
-            messages.clear()
+    log(f"Determining place getters for {len(scope.categories)} categories...")
 
-            if not data_valid:
-                yield (
-                    MESSAGES_FOOTER.format(
-                        homepage_path=homepage_path, bootstrap_js=bootstrap_js
-                    )
-                )
-                return
-
-            yield (display_message("Data validation succeeded"))
-            yield (display_message("Starting backup..."))
-            backup_and_clear_scores(cnn, env_short_name, messages)
-            for m in messages:
-                yield (display_message(m))
-            messages.clear()
-
-            yield (display_message("Checking database state..."))
-
-            db_ok = check_create_westgate_fields(cnn, messages)
-            for m in messages:
-                yield (display_message(m))
-            messages.clear()
-
-            if not db_ok:
-                yield (
-                    MESSAGES_FOOTER.format(
-                        homepage_path=homepage_path, bootstrap_js=bootstrap_js
-                    )
-                )
-                return
+    log("Loading brewer list...")
 
-            yield (display_message(f"Sorting entries and determining place getters..."))
-            yield (display_message(f"{len(entries)} entries"))
-            entries.sort(reverse=True)
+    if not load_brewers(cnn, scope.entries, messages):
+        return None
 
-            yield (display_message("Loading brewer list..."))
-            brewer_dict = get_brewer_dict(cnn)
+    category_entries = scope.category_entries()
 
-            for e in entries:
-                brewer = brewer_dict[e.brewer_id]
-                e.brewer = brewer
+    for e in category_entries:
+        e.score_place = None
+        e.countback_status = set()
 
-            dpgrs: List[DeterminePlaceGetterReq] = [
-                DeterminePlaceGetterReq(
-                    category=None,
-                    category_name="Brewer of Show",
-                    required_places=1,
-                ),
-                DeterminePlaceGetterReq(
-                    category="10",
-                    category_name="Porter",
-                    required_places=3,
-                ),
-                DeterminePlaceGetterReq(
-                    category="11",
-                    category_name="Stout",
-                    required_places=3,
-                ),
-                DeterminePlaceGetterReq(
-                    category="12",
-                    category_name="Strong Stout",
-                    required_places=3,
-                ),
-            ]
-
-            for dpgr in dpgrs:
-                if dpgr.category is None:
-                    dpgr_res = determine_place_getters(
-                        entries,
-                        dpgr.required_places,
-                    )
-                else:
-                    dpgr_res = determine_place_getters(
-                        [x for x in entries if x.category == dpgr.category],
-                        dpgr.required_places,
-                    )
-
-                if dpgr_res.success:
-                    messages.append(f"Set places for {dpgr.category_name}")
-                    if dpgr.category_name == "Brewer of Show":
-                        set_special_best_winner(
-                            cnn, dpgr_res.place_getters[0], "Brewer of Show", messages
-                        )
-                else:
-                    messages.append(
-                        f"Unable to set places for {dpgr.category_name}, unable to resolve count-back, must recall the judges"
-                    )
-
-            for m in messages:
-                yield (display_message(m))
-            messages.clear()
-
-            yield (display_message(f"Saving scores to database, please standby..."))
-            save_entries(cnn, entries)
-            messages.append(f"{len(entries)} scores saved to the database!")
-            messages.append(f"<a href={all_res_link}>View all results here!</a>")
-            messages.append("-" * 20)
-            messages.append("IMPORTANT!")
-            messages.append("You *MUST* go back to BCOE&M and do the following:")
-            messages.append("")
-            messages.append("1. manually resolve any place-setters mentioned above")
-            messages.append(
-                "2. identify and set the best novice (using the all results link above + notnovice spreadsheet), use judging number with leading zeros to set: https://comps.westgatebrewers.org/index.php?section=admin&go=special_best_data"
-            )
-            messages.append("3. publish results")
-            messages.append("")
-            messages.append(
-                "**Admin score reports will not work until place-getters are set**"
-            )
-            messages.append("-" * 20)
-            messages.append("")
-            messages.append("You may now close this tab")
-            messages.append(
-                MESSAGES_FOOTER.format(
-                    homepage_path=homepage_path, bootstrap_js=bootstrap_js
-                )
-            )
+    set_places(
+        cnn, scope.bos_candidates, group_by_category(category_entries), messages
+    )
 
-            send_audit_email(
-                reason=EmailReason.UploadScores,
-                env_full_name=env_full_name,
-                user_name=user_name,
-                user_email=user_email,
-            )
+    flush_messages(messages, log)
+    log(f"Saving scores to database, please standby...")
+    diff = diff_table_scope(cnn, scope)
+    messages.append(f"Score changes: {diff.summary()}")
+
+    if not apply_diff(cnn, diff, messages, chunk_size=job.save_chunk_size):
+        return None
+
+    return len(scope.entries)
+
+
+def process_upload(job: UploadJob, log: JobLog) -> bool:
+    """
+    Validates the entries, replaces the scores and sets place getters,
+    returns whether the scores were saved
+    """
+    messages: List[str] = []
+
+    def flush() -> None:
+        flush_messages(messages, log)
+
+    entries = job.entries
+    env_short_name = job.env_short_name
+    log(f"Loaded entries from CSV")
+
+    try:
+        cnn = get_db_connection(job.db_config)
+    except Exception as e:
+        log(f"Error connecting to database: {e}")
+        return False
+
+    log("Connected to DB.")
+    log(f"Starting data validation...")
+
+    data_valid = prepare_entries(
+        cnn, entries, messages, EnvMetadata(cnn, env_short_name)
+    )
+    flush()
+
+    if not data_valid:
+        return False
+
+    log("Data validation succeeded")
+    log("Starting backup...")
+
+    if job.write_mode == ScoreWriteMode.CLEAR_AND_INSERT:
+        backup_and_clear_scores(cnn, env_short_name, messages)
+    else:
+        messages.append(f"Written backup to: {do_backup(cnn, env_short_name)}")
+
+    flush()
+
+    log("Checking database state...")
 
-            for m in messages:
-                yield (display_message(m))
+    db_ok = check_create_westgate_fields(cnn, messages)
+    flush()
 
-        return current_app.response_class(stream_process_csv(), mimetype="text/html")
+    if not db_ok:
+        return False
+
+    if len(job.table_numbers) > 0:
+        saved_count = place_and_save_tables(cnn, job, log, messages)
+    else:
+        saved_count = place_and_save_all(cnn, job, log, messages)
+
+    flush()
+
+    if saved_count is None:
+        return False
+
+    result_cache.invalidate(env_short_name)
+    messages.append(f"{saved_count} scores saved to the database!")
+    write_result_snapshots(cnn, env_short_name, job.env_full_name, messages)
+    messages.append(f"<a href={job.all_results_link}>View all results here!</a>")
+    messages.append("-" * 20)
+    messages.append("IMPORTANT!")
+    messages.append("You *MUST* go back to BCOE&M and do the following:")
+    messages.append("")
+    messages.append("1. manually resolve any place-setters mentioned above")
+    messages.append(
+        "2. identify and set the best novice (using the all results link above + notnovice spreadsheet), use judging number with leading zeros to set: https://comps.westgatebrewers.org/index.php?section=admin&go=special_best_data"
+    )
+    messages.append("3. publish results")
+    messages.append("")
+    messages.append("**Admin score reports will not work until place-getters are set**")
+    messages.append("-" * 20)
+    messages.append("")
+    messages.append("You may now close this tab")
+
+    send_audit_email(
+        reason=EmailReason.UploadScores,
+        env_full_name=job.env_full_name,
+        user_name=job.user_name,
+        user_email=job.user_email,
+    )
+
+    flush()
+    return True
+
+
+@upload_scores.route("/", methods=["GET", "POST"])
+def show_form() -> ResponseReturnValue:
+    form = UploadScoreForm()
+    form.environment.choices = current_app.config["BCOME_ENV_CHOICES"]
+
+    if form.validate_on_submit():
+        try:
+            table_numbers = parse_table_numbers(form.judging_tables.data)
+        except ValueError as e:
+            form.judging_tables.errors.append(str(e))
+            return render_form(form)
+
+        d = form.csv_file.data
+        ingest = ingest_upload(d.stream, upload_spool_path(form.environment.data))
+
+        if not ingest.ok:
+            form.csv_file.errors.extend(ingest.errors)
+            return render_form(form)
+
+        if ingest.spool_path is None:
+            abort(500, "Expected a spooled upload")
+
+        messages: List[str] = []
+        env_short_name = form.environment.data
+        env_full_name = [
+            x[1]
+            for x in current_app.config["BCOME_ENV_CHOICES"]
+            if x[0] == env_short_name
+        ][0]
+        db_config = db_config_for_env_shortname(env_short_name, messages)
 
-    return render_template(f"upload_scores_form.html", form=form)
+        filename = save_upload(
+            ingest.spool_path, g.user_name, g.user_email, request.remote_addr
+        )
+        messages.append(f"Saved upload to {filename}")
+
+        upload = UploadJob(
+            env_short_name=env_short_name,
+            env_full_name=env_full_name,
+            db_config=db_config,
+            entries=ingest.entries,
+            user_name=g.user_name,
+            user_email=g.user_email,
+            save_chunk_size=current_app.config["SCORE_SAVE_CHUNK_SIZE"],
+            all_results_link=url_for("all_results.show", comp_env=env_short_name),
+            # a table upload only writes the scores that changed
+            write_mode=(
+                ScoreWriteMode.DIFF
+                if len(table_numbers) > 0
+                else ScoreWriteMode(form.write_mode.data)
+            ),
+            table_numbers=table_numbers,
+        )
+
+        # runs on a job thread with a copy of this request, so it can render
+        # the results pages and check out pooled connections
+        @copy_current_request_context
+        def run(log: JobLog) -> bool:
+            return process_upload(upload, log)
+
+        job = get_runner().submit(
+            env_short_name, UPLOAD_JOB_KIND, run, g.user_email, messages
+        )
+        return redirect(url_for("upload_scores.show_job", job_id=job.id), code=303)
+
+    return render_form(form)
+
+
+def get_job_or_404(job_id: str) -> Job:
+    job = get_runner().store.get(job_id)
+
+    if job is None or job.kind != UPLOAD_JOB_KIND:
+        abort(404, "No such upload")
+
+    return job
+
+
+@upload_scores.route("/jobs/<job_id>")
+def show_job(job_id: str) -> str:
+    job = get_job_or_404(job_id)
+    messages = get_runner().store.messages(job.id)
+    return render_template("upload_job.html", job=job, messages=messages)
+
+
+@upload_scores.route("/jobs/<job_id>/progress")
+def job_progress(job_id: str) -> Dict[str, Any]:
+    """
+    The job's status and its message log from line `after` onwards, poll with
+    the returned `next` to follow the log
+    """
+    try:
+        after = max(int(request.args.get("after", 0)), 0)
+    except ValueError:
+        abort(400, "after must be a whole number")
+
+    job = get_job_or_404(job_id)
+    messages = get_runner().store.messages(job.id, after)
+
+    return {
+        "job": job.to_dict(),
+        "messages": messages,
+        "next": after + len(messages),
+    }
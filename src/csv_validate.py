@@ -1,9 +1,7 @@
 from copy import deepcopy
 import csv
 from dataclasses import asdict, dataclass, field
-from io import StringIO
-import io
-from typing import Optional, TextIO, Union
+from typing import Optional, Sequence, Union
 
 REQUIRED_HEADERS = [
     "Entry Number",
@@ -28,38 +26,24 @@ class HeaderValidateResponse:
         return asdict(self)
 
 
-def try_decode_stream(b: bytes) -> Optional[StringIO]:
-    t_io = None
-    try:
-        t_io = io.StringIO(b.decode())
-    except UnicodeDecodeError:
-        pass
-
-    return t_io
-
-
-def validate_headers(data: TextIO) -> HeaderValidateResponse:
-    dr = csv.DictReader(data)
-    data.seek(0)
+def validate_fieldnames(fieldnames: Optional[Sequence[str]]) -> HeaderValidateResponse:
     required_headers = deepcopy(REQUIRED_HEADERS)
 
-    if dr.fieldnames is None:
+    if fieldnames is None:
         return HeaderValidateResponse(ok=False, missing=required_headers)
 
-    [required_headers.remove(x) for x in dr.fieldnames if x in required_headers]
+    [required_headers.remove(x) for x in fieldnames if x in required_headers]
 
     return HeaderValidateResponse(
         ok=len(required_headers) == 0, missing=required_headers
     )
 
 
-def is_csv(data: TextIO) -> bool:
+def looks_like_csv(sample: str) -> bool:
     dialect = None
     try:
-        dialect = csv.Sniffer().sniff(data.read(1024))
+        dialect = csv.Sniffer().sniff(sample)
     except Exception as e:
         pass
-    finally:
-        data.seek(0)
 
     return dialect is not None
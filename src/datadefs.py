@@ -1,7 +1,19 @@
 from __future__ import annotations
 from dataclasses import asdict, dataclass, field
 from enum import Enum, auto
-from typing import List, Optional, Set, Union
+from typing import (
+    Any,
+    FrozenSet,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+    Union,
+)
 from urllib.parse import quote
 
 from src.models.brew_entries import BrewEntry
@@ -18,7 +30,7 @@ PHPKEY_DBCONFIG_MAP = {
 }
 
 
-@dataclass
+@dataclass(frozen=True)
 class DBConfig:
     user: str
     password: str
@@ -52,6 +64,15 @@ class AutoName(Enum):
         return name
 
 
+class ScoreWriteMode(AutoName):
+    # load a staging copy of the scores table, then swap it in
+    SWAP = auto()
+    # empty the scores table, then insert into it
+    CLEAR_AND_INSERT = auto()
+    # write only the scores that differ from those already saved
+    DIFF = auto()
+
+
 class CountbackStatus(AutoName):
     OVERALL_IMPRESSION = auto()
     FLAVOUR = auto()
@@ -86,6 +107,30 @@ class CountbackStatusRec:
         return f"CountbackStatusRec(status='{self.status.value}' conflict_entry_id={self.conflict_entry_id})"
 
 
+T = TypeVar("T")
+
+
+class CountedIterable(Generic[T]):
+    """
+    Single-pass iterable with a length known up front.
+
+    Lets templates show `entries | length` before the entries themselves
+    are produced, e.g. while they are still streaming from the database.
+    """
+
+    __slots__ = ("_items", "_count")
+
+    def __init__(self, items: Iterable[T], count: int) -> None:
+        self._items = items
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+
 @dataclass
 class ResultsDisplayInfo:
     category_heading: str
@@ -95,7 +140,9 @@ class ResultsDisplayInfo:
     show_countback: bool
     show_entry_id: bool
     show_judging_table: bool
-    entries: List[ScoreEntry]
+    entries: Union[
+        Sequence[Union[ScoreEntry, ScopedScoreEntry]], CountedIterable[ScoreEntry]
+    ]
 
 @dataclass(order=False)
 class ScoreEntry:
@@ -138,47 +185,28 @@ class ScoreEntry:
     def __post_init__(self) -> None:
         self.style_key = make_cat_subcat_key(self.category, self.sub_category)
 
-    def __lt__(s, o):
-        if not isinstance(o, s.__class__):
-            return False
-
-        if s.total_score != o.total_score:
-            return s.total_score < o.total_score
-
-        if s.overall != o.overall:
-            s.countback_status.add(
-                CountbackStatusRec(CountbackStatus.OVERALL_IMPRESSION, o.entry_id)
-            )
-            o.countback_status.add(
-                CountbackStatusRec(CountbackStatus.OVERALL_IMPRESSION, s.entry_id)
-            )
-            return s.overall < o.overall
-
-        if s.flavour != o.flavour:
-            s.countback_status.add(
-                CountbackStatusRec(CountbackStatus.FLAVOUR, o.entry_id)
-            )
-            o.countback_status.add(
-                CountbackStatusRec(CountbackStatus.FLAVOUR, s.entry_id)
-            )
-            return s.flavour < o.flavour
-
-        if s.score_spread != o.score_spread:
-            s.countback_status.add(
-                CountbackStatusRec(CountbackStatus.SMALLEST_SCORE_SPREAD, o.entry_id)
-            )
-            o.countback_status.add(
-                CountbackStatusRec(CountbackStatus.SMALLEST_SCORE_SPREAD, s.entry_id)
-            )
-            return s.score_spread < o.score_spread
-
-        s.countback_status.add(
-            CountbackStatusRec(CountbackStatus.RECALL_JUDGES, o.entry_id)
-        )
-        o.countback_status.add(
-            CountbackStatusRec(CountbackStatus.RECALL_JUDGES, s.entry_id)
-        )
-        return False
-
-    def __gt__(s, o):
-        return not s < o
+
+class ScopedScoreEntry:
+    """
+    Read-only view of a ScoreEntry with its countback status narrowed,
+    e.g. to the other place getters in the same category.
+
+    Everything else is read from the wrapped entry, so nothing is copied.
+    """
+
+    __slots__ = ("entry", "countback_status")
+
+    def __init__(
+        self, entry: ScoreEntry, countback_status: FrozenSet[CountbackStatusRec]
+    ) -> None:
+        self.entry = entry
+        self.countback_status = countback_status
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.entry, name)
+
+    def countback_status_db_repr(self) -> Optional[str]:
+        if len(self.countback_status) == 0:
+            return None
+
+        return ", ".join([x.to_db_str() for x in self.countback_status])
@@ -1,4 +1,6 @@
-from typing import Dict, Union
+import os
+import threading
+from typing import Dict, Tuple, Union
 
 import mysql.connector  # type: ignore
 from mysql.connector import MySQLConnection
@@ -68,6 +70,44 @@ def extract_db_config(fp: str) -> DBConfig:
     return DBConfig(**memo)  # type: ignore
 
 
+# (inode, device, mtime in ns, size) of a config file when it was parsed
+ConfigStamp = Tuple[int, int, int, int]
+
+_db_config_cache: Dict[str, Tuple[ConfigStamp, DBConfig]] = {}
+_db_config_cache_lock = threading.Lock()
+
+
+def load_db_config(fp: str) -> DBConfig:
+    """Returns the DBConfig for a BCOE&M config file, only re-parsing it when it changes
+
+    The cache is keyed on the resolved path and checked against the file's
+    inode, mtime and size, so editing or replacing the file is picked up on the
+    next call at the cost of one stat().
+
+    Args:
+        fp (str): path to the BCOE&M config.php
+
+    Returns:
+        DBConfig: parsed config, shared between callers
+    """
+    key = os.path.realpath(fp)
+    st = os.stat(key)
+    stamp: ConfigStamp = (st.st_ino, st.st_dev, st.st_mtime_ns, st.st_size)
+
+    with _db_config_cache_lock:
+        cached = _db_config_cache.get(key)
+
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    db_config = extract_db_config(key)
+
+    with _db_config_cache_lock:
+        _db_config_cache[key] = (stamp, db_config)
+
+    return db_config
+
+
 def create_connection(db_config: DBConfig) -> MySQLConnection:
     return mysql.connector.connect(**db_config.to_dict())
 
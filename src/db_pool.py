@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from mysql.connector import MySQLConnection
+
+from src.datadefs import DBConfig
+from src.db import create_connection
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_IDLE_TIMEOUT = 60.0
+DEFAULT_CHECKOUT_TIMEOUT = 10.0
+
+
+class PoolExhaustedError(Exception):
+    pass
+
+
+@dataclass
+class PoolMetrics:
+    host: str
+    database: str
+    size: int
+    idle: int
+    checked_out: int
+    created: int = 0
+    reused: int = 0
+    discarded: int = 0
+    waits: int = 0
+    timeouts: int = 0
+
+    def to_dict(self) -> dict[str, Union[str, int]]:
+        return asdict(self)
+
+
+class ConnectionPool:
+    """
+    Bounded pool of MySQL connections for one database.
+
+    At most `size` connections are checked out at once, further checkouts wait
+    up to `checkout_timeout` seconds. Idle connections older than
+    `idle_timeout` seconds are closed instead of being reused, which keeps us
+    under the server's `wait_timeout` on shared hosting.
+    """
+
+    def __init__(
+        self,
+        db_config: DBConfig,
+        size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        checkout_timeout: float = DEFAULT_CHECKOUT_TIMEOUT,
+        connect: Callable[[DBConfig], MySQLConnection] = create_connection,
+    ) -> None:
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1, got {size}")
+
+        self.db_config = db_config
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self._connect = connect
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        # (connection, time it was returned), most recently returned on the right
+        self._idle: Deque[Tuple[MySQLConnection, float]] = deque()
+        self._metrics = PoolMetrics(
+            host=db_config.host,
+            database=db_config.database,
+            size=size,
+            idle=0,
+            checked_out=0,
+        )
+
+    def checkout(self) -> MySQLConnection:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._metrics.waits += 1
+
+            if not self._slots.acquire(timeout=self.checkout_timeout):
+                with self._lock:
+                    self._metrics.timeouts += 1
+                raise PoolExhaustedError(
+                    f"No free connection to {self.db_config.database} after {self.checkout_timeout}s"
+                )
+
+        return self._open_slot()
+
+    def try_checkout(self) -> Optional[MySQLConnection]:
+        """
+        Checks out a connection only if one is free right now, otherwise returns None
+        """
+        if not self._slots.acquire(blocking=False):
+            return None
+
+        return self._open_slot()
+
+    def _open_slot(self) -> MySQLConnection:
+        """
+        Fills a slot that has just been acquired with an idle or new connection
+        """
+        try:
+            cnn = self._take_idle()
+
+            if cnn is None:
+                cnn = self._connect(self.db_config)
+                with self._lock:
+                    self._metrics.created += 1
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._metrics.checked_out += 1
+
+        return cnn
+
+    def release(self, cnn: MySQLConnection) -> None:
+        """
+        Returns a connection to the pool.
+
+        Any open transaction is rolled back so the next user does not read from
+        a stale snapshot. Connections that fail to roll back are dropped.
+        """
+        try:
+            cnn.rollback()
+        except Exception:
+            self._close(cnn)
+        else:
+            with self._lock:
+                self._idle.append((cnn, time.monotonic()))
+        finally:
+            with self._lock:
+                self._metrics.checked_out -= 1
+            self._slots.release()
+
+    def close_idle(self) -> None:
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+
+        for cnn, _ in idle:
+            self._close(cnn)
+
+    def metrics(self) -> PoolMetrics:
+        with self._lock:
+            self._metrics.idle = len(self._idle)
+            return PoolMetrics(**asdict(self._metrics))
+
+    def _take_idle(self) -> Union[MySQLConnection, None]:
+        expired: List[MySQLConnection] = []
+        cnn = None
+        now = time.monotonic()
+
+        with self._lock:
+            while len(self._idle) > 0 and now - self._idle[0][1] > self.idle_timeout:
+                expired.append(self._idle.popleft()[0])
+
+            if len(self._idle) > 0:
+                cnn = self._idle.pop()[0]
+                self._metrics.reused += 1
+
+        for e in expired:
+            self._close(e)
+
+        return cnn
+
+    def _close(self, cnn: MySQLConnection) -> None:
+        with self._lock:
+            self._metrics.discarded += 1
+
+        try:
+            cnn.close()
+        except Exception:
+            pass
+
+
+_pools: Dict[DBConfig, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(
+    db_config: DBConfig,
+    size: int = DEFAULT_POOL_SIZE,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    checkout_timeout: float = DEFAULT_CHECKOUT_TIMEOUT,
+) -> ConnectionPool:
+    """
+    Returns the pool for `db_config`, creating it on first use
+    """
+    with _pools_lock:
+        pool = _pools.get(db_config)
+
+        if pool is None:
+            pool = ConnectionPool(db_config, size, idle_timeout, checkout_timeout)
+            _pools[db_config] = pool
+
+        return pool
+
+
+def all_pool_metrics() -> List[PoolMetrics]:
+    with _pools_lock:
+        pools = list(_pools.values())
+
+    return [p.metrics() for p in pools]
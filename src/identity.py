@@ -0,0 +1,105 @@
+import hashlib
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, MutableMapping, Optional, Protocol
+
+from flask_dance.contrib.google import google
+
+DEFAULT_TTL = 300.0
+SESSION_KEY = "identity"
+
+
+@dataclass
+class Identity:
+    email: str
+    name: str
+
+
+@dataclass
+class CachedIdentity:
+    email: str
+    name: str
+    # ties the identity to the OAuth token it was verified with
+    token_hash: str
+    expires_at: float
+
+
+class UserInfoProvider(Protocol):
+    def token(self) -> Optional[Dict[str, Any]]:
+        ...
+
+    def userinfo(self) -> Dict[str, Any]:
+        ...
+
+
+class GoogleUserInfo:
+    """
+    Looks up the signed in user with Google, raises TokenExpiredError if the
+    OAuth token has expired
+    """
+
+    def token(self) -> Optional[Dict[str, Any]]:
+        return google.token
+
+    def userinfo(self) -> Dict[str, Any]:
+        resp = google.get("/oauth2/v1/userinfo")
+        assert resp.ok, resp.text
+        return resp.json()
+
+
+def token_hash(token: Optional[Dict[str, Any]]) -> str:
+    access_token = "" if token is None else str(token.get("access_token", ""))
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
+def resolve_identity(
+    session: MutableMapping[str, Any],
+    provider: UserInfoProvider,
+    ttl: float = DEFAULT_TTL,
+    clock: Callable[[], float] = time.time,
+) -> Identity:
+    """
+    Returns the signed in user, asking the provider only when the identity
+    kept in `session` is missing, older than `ttl` seconds, or was verified
+    with a different token, e.g. after a refresh or a new login.
+
+    An expired token is never trusted from the session, so the provider gets
+    the chance to reject it.
+    """
+    now = clock()
+    token = provider.token()
+    current_hash = token_hash(token)
+    token_expired = (
+        token is not None
+        and token.get("expires_at") is not None
+        and float(token["expires_at"]) <= now
+    )
+
+    cached = session.get(SESSION_KEY)
+
+    if cached is not None and not token_expired:
+        try:
+            identity = CachedIdentity(**cached)
+        except TypeError:
+            identity = None
+
+        if (
+            identity is not None
+            and identity.token_hash == current_hash
+            and identity.expires_at > now
+        ):
+            return Identity(email=identity.email, name=identity.name)
+
+    info = provider.userinfo()
+    email = info["email"].lower()
+    name = info["name"]
+    session[SESSION_KEY] = asdict(
+        CachedIdentity(
+            email=email,
+            name=name,
+            # the lookup may have refreshed the token
+            token_hash=token_hash(provider.token()),
+            expires_at=now + ttl,
+        )
+    )
+    return Identity(email=email, name=name)
@@ -0,0 +1,481 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from enum import auto
+from pathlib import Path
+from typing import (
+    Callable,
+    Collection,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from src.datadefs import AutoName
+
+DEFAULT_WORKERS = 2
+DEFAULT_RETENTION_DAYS = 30
+JOBS_DB_PATH = Path("data/jobs.sqlite").resolve()
+
+# how often a process records that its jobs are alive, and retries jobs
+# waiting on another process
+HEARTBEAT_INTERVAL = 5.0
+# a queued or running job without a heartbeat for this long belongs to a
+# process that has stopped
+STALE_AFTER = 60.0
+
+SECONDS_PER_DAY = 86400
+
+CREATE_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    env TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    user_email TEXT,
+    created REAL NOT NULL,
+    finished REAL,
+    owner_pid INTEGER,
+    heartbeat REAL
+);
+CREATE TABLE IF NOT EXISTS job_messages (
+    job_id TEXT NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+# job stores created before jobs had an owner
+MIGRATE_COLUMNS = {"owner_pid": "INTEGER", "heartbeat": "REAL"}
+
+JOB_COLUMNS_SQL = "id, env, kind, status, user_email, created, finished, owner_pid, heartbeat"
+
+# starts a queued job if it is the oldest unfinished job for its environment
+# and none is running, in any process. SQLite runs one write at a time, so at
+# most one process can claim an environment.
+CLAIM_SQL = """
+UPDATE jobs SET status = :running, heartbeat = :now
+WHERE id = :id
+AND status = :queued
+AND NOT EXISTS (
+    SELECT 1 FROM jobs o
+    WHERE o.env = jobs.env
+    AND o.id != jobs.id
+    AND (
+        o.status = :running
+        OR (o.status = :queued AND (o.created < jobs.created OR (o.created = jobs.created AND o.id < jobs.id)))
+    )
+)
+"""
+
+
+class JobStatus(AutoName):
+    QUEUED = auto()
+    RUNNING = auto()
+    SUCCEEDED = auto()
+    FAILED = auto()
+    # the process stopped while the job was queued or running
+    INTERRUPTED = auto()
+
+
+FINISHED_STATUSES = {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.INTERRUPTED}
+
+
+@dataclass
+class Job:
+    id: str
+    env: str
+    kind: str
+    status: JobStatus
+    user_email: Optional[str]
+    created: float
+    finished: Optional[float] = None
+    # pid of the process that runs the job
+    owner_pid: Optional[int] = None
+    # last time the owning process was seen alive
+    heartbeat: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> Dict[str, Union[str, float, bool, None]]:
+        memo = asdict(self)
+        memo["status"] = self.status.value
+        memo["is_finished"] = self.is_finished
+        return memo
+
+
+# appends one line to the job's message log
+JobLog = Callable[[str], None]
+# runs the job, returns whether it succeeded
+JobFn = Callable[[JobLog], bool]
+
+
+class JobStore:
+    """
+    Jobs and their message logs, kept in SQLite so progress can be read from
+    any worker and survives a restart
+    """
+
+    def __init__(self, path: Path = JOBS_DB_PATH) -> None:
+        self.path = path
+
+        with self._connect() as db:
+            db.executescript(CREATE_TABLES_SQL)
+            columns = {row[1] for row in db.execute("PRAGMA table_info(jobs)")}
+
+            for name, column_type in MIGRATE_COLUMNS.items():
+                if name not in columns:
+                    db.execute(f"ALTER TABLE jobs ADD COLUMN {name} {column_type}")
+
+    def _connect(self) -> "closing[sqlite3.Connection]":
+        # a connection per call, sqlite connections can't be shared between threads
+        db = sqlite3.connect(self.path, timeout=10)
+        db.execute("PRAGMA foreign_keys = ON")
+        return closing(db)
+
+    def create(self, env: str, kind: str, user_email: Optional[str]) -> Job:
+        """
+        Queues a job owned by this process
+        """
+        now = time.time()
+        job = Job(
+            id=uuid.uuid4().hex,
+            env=env,
+            kind=kind,
+            status=JobStatus.QUEUED,
+            user_email=user_email,
+            created=now,
+            owner_pid=os.getpid(),
+            heartbeat=now,
+        )
+
+        with self._connect() as db, db:
+            db.execute(
+                f"INSERT INTO jobs ({JOB_COLUMNS_SQL}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id,
+                    job.env,
+                    job.kind,
+                    job.status.value,
+                    user_email,
+                    job.created,
+                    None,
+                    job.owner_pid,
+                    job.heartbeat,
+                ),
+            )
+
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._connect() as db:
+            row = db.execute(
+                f"SELECT {JOB_COLUMNS_SQL} FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return Job(
+            id=row[0],
+            env=row[1],
+            kind=row[2],
+            status=JobStatus(row[3]),
+            user_email=row[4],
+            created=row[5],
+            finished=row[6],
+            owner_pid=row[7],
+            heartbeat=row[8],
+        )
+
+    def set_status(self, job_id: str, status: JobStatus) -> None:
+        finished = time.time() if status in FINISHED_STATUSES else None
+
+        with self._connect() as db, db:
+            db.execute(
+                "UPDATE jobs SET status = ?, finished = ? WHERE id = ?",
+                (status.value, finished, job_id),
+            )
+
+    def append(self, job_id: str, message: str) -> None:
+        with self._connect() as db, db:
+            db.execute(
+                """
+INSERT INTO job_messages (job_id, seq, message)
+SELECT ?, COALESCE(MAX(seq) + 1, 0), ? FROM job_messages WHERE job_id = ?
+""",
+                (job_id, message, job_id),
+            )
+
+    def messages(self, job_id: str, after: int = 0) -> List[str]:
+        """
+        The job's message log, skipping the first `after` lines
+        """
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT message FROM job_messages WHERE job_id = ? AND seq >= ? ORDER BY seq",
+                (job_id, after),
+            ).fetchall()
+
+        return [r[0] for r in rows]
+
+    def claim(self, job_id: str) -> bool:
+        """
+        Marks a queued job running if no earlier job for its environment is
+        unfinished, returns whether it was claimed
+        """
+        with self._connect() as db, db:
+            return (
+                db.execute(
+                    CLAIM_SQL,
+                    {
+                        "id": job_id,
+                        "now": time.time(),
+                        "queued": JobStatus.QUEUED.value,
+                        "running": JobStatus.RUNNING.value,
+                    },
+                ).rowcount
+                == 1
+            )
+
+    def heartbeat(self, job_ids: Collection[str]) -> None:
+        """
+        Records that the process running these jobs is still alive
+        """
+        if not job_ids:
+            return
+
+        with self._connect() as db, db:
+            db.execute(
+                f"UPDATE jobs SET heartbeat = ? WHERE id IN ({', '.join('?' * len(job_ids))})",
+                (time.time(), *job_ids),
+            )
+
+    def interrupt_stale(self, stale_after: float = STALE_AFTER) -> int:
+        """
+        Marks queued or running jobs as interrupted when the process that owns
+        them has not sent a heartbeat for `stale_after` seconds
+        """
+        now = time.time()
+
+        with self._connect() as db, db:
+            return db.execute(
+                """
+UPDATE jobs SET status = ?, finished = ?
+WHERE status IN (?, ?)
+AND COALESCE(heartbeat, created) < ?
+""",
+                (
+                    JobStatus.INTERRUPTED.value,
+                    now,
+                    JobStatus.QUEUED.value,
+                    JobStatus.RUNNING.value,
+                    now - stale_after,
+                ),
+            ).rowcount
+
+    def cleanup(self, retain_days: int = DEFAULT_RETENTION_DAYS) -> int:
+        threshold = time.time() - (retain_days * SECONDS_PER_DAY)
+
+        with self._connect() as db, db:
+            return db.execute(
+                "DELETE FROM jobs WHERE finished IS NOT NULL AND finished < ?",
+                (threshold,),
+            ).rowcount
+
+
+class JobRunner:
+    """
+    Runs jobs on a thread pool, recording progress in a JobStore.
+
+    Jobs for the same environment run one after another in the order they were
+    submitted, even when they were submitted to different processes sharing
+    the store. Jobs for different environments run at the same time.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        max_workers: int = DEFAULT_WORKERS,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL,
+        stale_after: float = STALE_AFTER,
+    ) -> None:
+        self.store = store
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="job"
+        )
+        self._lock = threading.Condition()
+        # environments with a job running in this process
+        self._busy_envs: Set[str] = set()
+        self._pending: Dict[str, Deque[Tuple[str, JobFn]]] = {}
+        self._running: Set[str] = set()
+        self._stopped = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+
+    def submit(
+        self,
+        env: str,
+        kind: str,
+        fn: JobFn,
+        user_email: Optional[str] = None,
+        messages: Sequence[str] = (),
+    ) -> Job:
+        """
+        Queues `fn` and returns straight away, `messages` start the job's log
+        """
+        job = self.store.create(env, kind, user_email)
+
+        for message in messages:
+            self.store.append(job.id, message)
+
+        with self._lock:
+            self._start_heartbeat()
+            self._pending.setdefault(env, deque()).append((job.id, fn))
+
+            if not self._start_next(env):
+                self.store.append(
+                    job.id, "Waiting for an earlier job on this environment to finish..."
+                )
+
+        return job
+
+    def _start_heartbeat(self) -> None:
+        # started with the first job rather than in __init__, so a runner
+        # configured before the server forks its workers gets a live thread
+        if self._heartbeat_thread is None or not self._heartbeat_thread.is_alive():
+            self._heartbeat_thread = threading.Thread(
+                target=self._heartbeat, name="job-heartbeat", daemon=True
+            )
+            self._heartbeat_thread.start()
+
+    def _heartbeat(self) -> None:
+        """
+        Keeps this process's jobs from looking stale, interrupts jobs left by
+        stopped processes and retries jobs waiting on another process
+        """
+        while not self._stopped.wait(self.heartbeat_interval):
+            with self._lock:
+                job_ids = list(self._running) + [
+                    job_id for pending in self._pending.values() for job_id, _ in pending
+                ]
+
+            self.store.heartbeat(job_ids)
+            self.store.interrupt_stale(self.stale_after)
+
+            with self._lock:
+                for env in list(self._pending):
+                    self._start_next(env)
+
+    def _start_next(self, env: str) -> bool:
+        """
+        Starts the next queued job for `env` if the store lets this process
+        claim it, returns whether a job started. Must hold the lock.
+        """
+        pending = self._pending.get(env)
+
+        if env in self._busy_envs or not pending:
+            return False
+
+        job_id, fn = pending[0]
+        job = self.store.get(job_id)
+
+        if job is None or job.is_finished:
+            # interrupted while waiting, e.g. the heartbeat fell behind
+            pending.popleft()
+            self._forget(env)
+            return self._start_next(env)
+
+        if not self.store.claim(job_id):
+            return False
+
+        pending.popleft()
+        self._busy_envs.add(env)
+        self._running.add(job_id)
+        self._executor.submit(self._run, env, job_id, fn)
+        return True
+
+    def _forget(self, env: str) -> None:
+        if not self._pending.get(env):
+            self._pending.pop(env, None)
+            self._lock.notify_all()
+
+    def _run(self, env: str, job_id: str, fn: JobFn) -> None:
+        try:
+            ok = False
+
+            try:
+                ok = fn(lambda message: self.store.append(job_id, message))
+            except Exception as e:
+                self.store.append(job_id, f"Job failed: {e}")
+
+            self.store.set_status(
+                job_id, JobStatus.SUCCEEDED if ok else JobStatus.FAILED
+            )
+        finally:
+            with self._lock:
+                self._running.discard(job_id)
+                self._busy_envs.discard(env)
+                self._forget(env)
+                self._lock.notify_all()
+                self._start_next(env)
+
+    def shutdown(self) -> None:
+        """
+        Waits for running and queued jobs to finish, then stops the workers
+        """
+        with self._lock:
+            self._lock.wait_for(
+                lambda: len(self._busy_envs) == 0 and len(self._pending) == 0
+            )
+
+        self._stopped.set()
+        self._executor.shutdown(wait=True)
+
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def configure(
+    max_workers: int = DEFAULT_WORKERS,
+    path: Path = JOBS_DB_PATH,
+    retain_days: int = DEFAULT_RETENTION_DAYS,
+) -> JobRunner:
+    """
+    Opens the job store and starts the runner, jobs left unfinished by a
+    process that has stopped are marked interrupted
+    """
+    global _runner
+
+    store = JobStore(path)
+    store.interrupt_stale()
+    store.cleanup(retain_days)
+
+    with _runner_lock:
+        _runner = JobRunner(store, max_workers)
+        return _runner
+
+
+def get_runner() -> JobRunner:
+    with _runner_lock:
+        if _runner is None:
+            raise RuntimeError("Job runner has not been configured")
+
+        return _runner
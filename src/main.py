@@ -9,9 +9,13 @@ from src.controllers.pad_upload_filenames import pad_upload_filenames
 from src.controllers.pullsheets import pullsheets
 from src.controllers.all_results import all_results
 from src.controllers.report_generator import report_generator
+from src.controllers.results_api import results_api
 from src.controllers.ensure_db import ensure_db
 from src.controllers import dir_listing
+from src.controllers.helpers import release_db_connections
+from src.controllers.metrics import metrics
 
+from src import jobs, metadata_cache, result_cache
 from src.logging import setup_logger
 from src.utils import BACKUP_PATH, UPLOAD_PATH, ensure_paths_exist
 
@@ -27,6 +31,20 @@ app.config["BYPASS_OAUTH"] = os.environ.get("BYPASS_OAUTH", "false") == "true"
 app.config["TOPT_ENABLED"] = os.environ.get("TOPT_ENABLED", "false") == "true"
 app.config["TOPT_SECRET"] = os.environ.get("TOPT_SECRET", None)
 app.config["TOPT_VALID_MINUTES"] = int(os.environ.get("TOPT_VALID_MINUTES", 1))
+app.config["SCORE_SAVE_CHUNK_SIZE"] = int(os.environ.get("SCORE_SAVE_CHUNK_SIZE", 500))
+app.config["DB_POOL_SIZE"] = int(os.environ.get("DB_POOL_SIZE", 5))
+app.config["DB_POOL_IDLE_TIMEOUT"] = float(os.environ.get("DB_POOL_IDLE_TIMEOUT", 60))
+app.config["DB_POOL_CHECKOUT_TIMEOUT"] = float(
+    os.environ.get("DB_POOL_CHECKOUT_TIMEOUT", 10)
+)
+app.config["RESULT_CACHE_SIZE"] = int(os.environ.get("RESULT_CACHE_SIZE", 32))
+app.config["RESULT_CACHE_TTL"] = float(os.environ.get("RESULT_CACHE_TTL", 300))
+app.config["METADATA_CACHE_SIZE"] = int(os.environ.get("METADATA_CACHE_SIZE", 64))
+app.config["METADATA_CACHE_TTL"] = float(os.environ.get("METADATA_CACHE_TTL", 300))
+app.config["SNAPSHOT_MAX_AGE"] = float(os.environ.get("SNAPSHOT_MAX_AGE", 60))
+app.config["IDENTITY_CACHE_TTL"] = float(os.environ.get("IDENTITY_CACHE_TTL", 300))
+app.config["REPORT_SECTION_WORKERS"] = int(os.environ.get("REPORT_SECTION_WORKERS", 4))
+app.config["JOB_WORKERS"] = int(os.environ.get("JOB_WORKERS", 2))
 bcome_env_choices = []
 
 if app.config["BCOME_TEST_CONF"] is not None:
@@ -79,9 +97,21 @@ app.register_blueprint(all_results, url_prefix="/all_results")
 
 app.register_blueprint(report_generator, url_prefix="/report_generator")
 
+app.register_blueprint(results_api, url_prefix="/api/results")
+
 app.register_blueprint(ensure_db, url_prefix="/ensure_db")
 
+app.register_blueprint(metrics, url_prefix="/metrics")
+
+app.teardown_appcontext(release_db_connections)
+
+result_cache.configure(app.config["RESULT_CACHE_SIZE"], app.config["RESULT_CACHE_TTL"])
+metadata_cache.configure(
+    app.config["METADATA_CACHE_SIZE"], app.config["METADATA_CACHE_TTL"]
+)
+
 if app.debug:
     pprint(app.url_map)
 
 ensure_paths_exist()
+jobs.configure(app.config["JOB_WORKERS"])
@@ -0,0 +1,110 @@
+import threading
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from mysql.connector import MySQLConnection
+
+from src.cache import CacheStats, TTLCache
+from src.models.contest_info import ContestInfo, get_contest_info
+from src.models.judging_tables import TableStyles, load_table_styles
+from src.models.sponsors import Sponsor, get_sponsors
+from src.models.styles import StyleCatalogue, load_style_catalogue
+
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_TTL = 300.0
+
+T = TypeVar("T")
+
+# (env short name, data version, dataset name) -> loaded value, treat values
+# as read-only
+MetadataKey = Tuple[str, str, str]
+
+_cache: TTLCache[MetadataKey, Any] = TTLCache(
+    "metadata", DEFAULT_MAX_ENTRIES, DEFAULT_TTL
+)
+# bumped on every manual purge, see `generation`
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def configure(max_entries: int, ttl: float) -> None:
+    _cache.configure(max_entries, ttl)
+
+
+def generation() -> int:
+    """
+    Counts manual purges.
+
+    Pages built from cached metadata fold this into their cache keys and
+    ETags, so they are rebuilt after a purge rather than served from before it.
+    """
+    with _generation_lock:
+        return _generation
+
+
+def versioned(fingerprint: str) -> str:
+    """
+    Extends a data fingerprint for a page that also shows cached metadata
+    """
+    return f"{fingerprint}.{generation()}"
+
+
+def purge(env_short_name: Optional[str] = None) -> int:
+    """
+    Drops cached metadata for an environment, or for every environment,
+    returns how many entries were removed
+    """
+    global _generation
+
+    with _generation_lock:
+        _generation += 1
+
+    return _cache.invalidate(
+        lambda key: env_short_name is None or key[0] == env_short_name
+    )
+
+
+def stats() -> CacheStats:
+    return _cache.stats()
+
+
+class EnvMetadata:
+    """
+    Slow-changing competition data for one environment, loaded through the
+    metadata cache.
+
+    With no `env_short_name` every lookup goes straight to the database.
+
+    Values are cached per `data_version`. A page whose fingerprint covers the
+    metadata tables passes that fingerprint, so once they change it loads
+    fresh values instead of ones cached before the change.
+    """
+
+    def __init__(
+        self,
+        cnn: MySQLConnection,
+        env_short_name: Optional[str],
+        data_version: str = "",
+    ) -> None:
+        self.cnn = cnn
+        self.env_short_name = env_short_name
+        self.data_version = data_version
+
+    def _get(self, name: str, loader: Callable[[MySQLConnection], T]) -> T:
+        if self.env_short_name is None:
+            return loader(self.cnn)
+
+        return _cache.get_or_set(
+            (self.env_short_name, self.data_version, name), lambda: loader(self.cnn)
+        )
+
+    def contest_info(self) -> ContestInfo:
+        return self._get("contest_info", get_contest_info)
+
+    def sponsors(self) -> List[Sponsor]:
+        return self._get("sponsors", get_sponsors)
+
+    def table_styles(self) -> List[TableStyles]:
+        return self._get("table_styles", load_table_styles)
+
+    def style_catalogue(self) -> StyleCatalogue:
+        return self._get("style_catalogue", load_style_catalogue)
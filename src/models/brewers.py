@@ -1,8 +1,10 @@
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from mysql.connector import MySQLConnection
 from mysql.connector.cursor import MySQLCursor
 
+from src.batched_query import select_in_chunks
+
 
 @dataclass
 class Brewer:
@@ -59,6 +61,33 @@ def get_brewer_dict(cnn: MySQLConnection) -> Dict[int, Brewer]:
     return memo
 
 
+def get_brewer_dict_for_ids(
+    cnn: MySQLConnection, brewer_ids: Iterable[int]
+) -> Dict[int, Brewer]:
+    """
+    Returns brewers keyed on id, only loading the requested ids
+    """
+    sql = """
+SELECT id, uid, brewerFirstName, brewerLastName, brewerClubs
+FROM `brewer`
+WHERE id IN ({keys});
+    """
+    memo = {}
+
+    for id, uid, brewerFirstName, brewerLastName, brewerClubs in select_in_chunks(
+        cnn, sql, brewer_ids
+    ):
+        memo[id] = Brewer(
+            id=id,
+            uid=uid,
+            last_name=brewerLastName,
+            first_name=brewerFirstName,
+            club=brewerClubs,
+        )
+
+    return memo
+
+
 def get_brewer_uid_dict(cnn: MySQLConnection) -> Dict[int, Brewer]:
     memo = {}
     brewers = get_brewers(cnn)
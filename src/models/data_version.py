@@ -0,0 +1,93 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import List
+from mysql.connector import MySQLConnection
+from mysql.connector.cursor import MySQLCursor
+
+# `brewing` and `brewer` hold every entry and account ever made, so only the
+# rows a page shows are fingerprinted. Each query returns a row count and a
+# checksum of the shown columns, so in-place edits are still detected.
+SCORED_ROWS_SQL = """
+SELECT COUNT(*), COALESCE(BIT_XOR(CRC32(CONCAT_WS('|',
+    b.id, b.brewName, b.brewStyle, b.brewCategory, b.brewSubCategory,
+    br.id, br.uid, br.brewerFirstName, br.brewerLastName, br.brewerClubs
+))), 0)
+FROM judging_scores j
+INNER JOIN brewing b ON b.id = j.eid
+INNER JOIN brewer br ON br.id = j.bid
+"""
+
+STAFF_ROWS_SQL = """
+SELECT COUNT(*), COALESCE(BIT_XOR(CRC32(CONCAT_WS('|',
+    br.id, br.uid, br.brewerFirstName, br.brewerLastName, br.brewerClubs
+))), 0)
+FROM staff s
+INNER JOIN brewer br ON br.uid = s.uid
+"""
+
+RECEIVED_ROWS_SQL = """
+SELECT COUNT(*), COALESCE(BIT_XOR(CRC32(CONCAT_WS('|',
+    id, brewStyle, brewCategorySort, brewSubCategory, brewInfo, brewABV, brewPouring, brewPossAllergens
+))), 0)
+FROM brewing
+WHERE brewPaid = 1
+AND brewReceived = 1
+"""
+
+
+@dataclass
+class DataSources:
+    """
+    What a page reads: small tables that are checksummed whole, and queries
+    fingerprinting just the shown rows of large ones
+    """
+
+    tables: List[str]
+    row_queries: List[str] = field(default_factory=list)
+
+    def __add__(self, other: "DataSources") -> "DataSources":
+        return DataSources(
+            tables=self.tables + other.tables,
+            row_queries=self.row_queries + other.row_queries,
+        )
+
+
+# what changes what the results pages show
+RESULT_SOURCES = DataSources(
+    tables=["judging_scores", "special_best_data", "judging_tables"],
+    row_queries=[SCORED_ROWS_SQL],
+)
+# the full report also shows contest details, sponsors and staff
+REPORT_SOURCES = RESULT_SOURCES + DataSources(
+    tables=["special_best_info", "contest_info", "sponsors", "staff"],
+    row_queries=[STAFF_ROWS_SQL],
+)
+PULLSHEET_SOURCES = DataSources(
+    tables=["judging_tables", "styles"],
+    row_queries=[RECEIVED_ROWS_SQL],
+)
+
+
+def data_fingerprint(cnn: MySQLConnection, sources: DataSources) -> str:
+    """
+    Returns a short fingerprint that changes whenever anything `sources` covers changes.
+
+    Uses `CHECKSUM TABLE` for the tables, so in-place edits made from the
+    BCOE&M admin (e.g. setting place getters) are detected too, not just
+    inserts and deletes. Table names must be trusted, they are not escaped.
+    """
+    cursor: MySQLCursor = cnn.cursor()
+    parts: List[str] = []
+
+    if sources.tables:
+        cursor.execute(f"CHECKSUM TABLE {', '.join(sources.tables)};")
+        parts += [f"{table}:{checksum}" for table, checksum in cursor.fetchall()]
+
+    for i, sql in enumerate(sources.row_queries):
+        cursor.execute(sql)
+        row = cursor.fetchone()
+        # an aggregate always returns a row
+        assert row is not None
+        parts.append(f"rows{i}:{row[0]!s}:{row[1]!s}")
+
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:16]
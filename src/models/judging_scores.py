@@ -1,8 +1,9 @@
 from dataclasses import dataclass
-from typing import List, Optional, Set
+from typing import Collection, List, Optional, Set
 from mysql.connector import MySQLConnection
 from mysql.connector.cursor import MySQLCursor
 
+from src.batched_query import placeholders
 from src.datadefs import CountbackStatusRec
 
 
@@ -65,14 +66,58 @@ class JudgingScore:
     score_type: int = 1  # 'scoreType'
     score_place: Optional[int] = None  # stored as NULLABLE VarChar[3]
 
-def load_all(cnn: MySQLConnection) -> List[JudgingScore]:
-    sql = """
+def parse_countback(wg_countback: Optional[str]) -> Optional[Set[CountbackStatusRec]]:
+    """
+    Parses 'ENUM vs 123, ENUM vs 456' as stored in wg_countback
+    """
+    if wg_countback is None:
+        return None
+
+    return {CountbackStatusRec.from_db_str(c.strip()) for c in wg_countback.split(",")}
+
+
+JUDGING_SCORE_COLUMNS_SQL = """
 SELECT id, eid, bid, scoreTable, scoreEntry, scorePlace, scoreType, wg_aroma, wg_appearance, wg_flavour, wg_body, wg_overall, wg_score_spread, wg_countback
 FROM judging_scores
+"""
+
+
+def load_all(cnn: MySQLConnection) -> List[JudgingScore]:
+    sql = JUDGING_SCORE_COLUMNS_SQL + """
 ORDER BY scoreEntry DESC, cast(scorePlace as unsigned) ASC
 """
     cursor: MySQLCursor = cnn.cursor()
     cursor.execute(sql)
+    return _scores_from_rows(cursor)
+
+
+def load_scoped(
+    cnn: MySQLConnection, score_tables: Collection[int], entry_ids: Collection[int]
+) -> List[JudgingScore]:
+    """
+    Loads the scores on `score_tables` along with those for `entry_ids`
+    """
+    clauses: List[str] = []
+    params: List[int] = []
+
+    if len(score_tables) > 0:
+        clauses.append(f"scoreTable IN ({placeholders(len(score_tables))})")
+        params.extend(score_tables)
+
+    if len(entry_ids) > 0:
+        clauses.append(f"eid IN ({placeholders(len(entry_ids))})")
+        params.extend(entry_ids)
+
+    if len(clauses) == 0:
+        return []
+
+    sql = JUDGING_SCORE_COLUMNS_SQL + "WHERE " + " OR ".join(clauses)
+    cursor: MySQLCursor = cnn.cursor()
+    cursor.execute(sql, tuple(params))
+    return _scores_from_rows(cursor)
+
+
+def _scores_from_rows(cursor: MySQLCursor) -> List[JudgingScore]:
     memo = []
 
     for (
@@ -95,12 +140,7 @@ ORDER BY scoreEntry DESC, cast(scorePlace as unsigned) ASC
         if scorePlace is not None:
             score_place = int(scorePlace)
 
-        countback_status = None
-
-        if wg_countback is not None:
-            countback_status = set()
-            for c in wg_countback.split(","):
-                countback_status.add(CountbackStatusRec.from_db_str(c.strip()))
+        countback_status = parse_countback(wg_countback)
 
         memo.append(JudgingScore(
             id=id,
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from mysql.connector import MySQLConnection
 from mysql.connector.cursor import MySQLCursor
 
@@ -10,6 +10,18 @@ class JudgingTable:
     name: str
     number: int
 
+@dataclass(frozen=True)
+class TableStyles:
+    id: int  # db ID
+    name: str  # raw tableName
+    number: int
+    style_ids: Tuple[int, ...]
+
+
+def display_name(table_name: str) -> str:
+    return table_name.strip().lower().replace("table", "").title()
+
+
 def load_all(cnn: MySQLConnection) -> List[JudgingTable]:
     sql = """
 SELECT id, tableName, tableNumber
@@ -21,8 +33,9 @@ ORDER BY tableNumber ASC
     memo = []
 
     for id, tableName, tableNumber in cursor:
-        name = tableName.strip().lower().replace("table", "").title()
-        memo.append(JudgingTable(id=id, name=name, number=tableNumber))
+        memo.append(
+            JudgingTable(id=id, name=display_name(tableName), number=tableNumber)
+        )
 
     return memo
 
@@ -35,3 +48,23 @@ def get_judging_table_dict(cnn: MySQLConnection) -> Dict[int, JudgingTable]:
         memo[brew.id] = brew
 
     return memo
+
+
+def load_table_styles(cnn: MySQLConnection) -> List[TableStyles]:
+    """
+    Loads every judging table with the style ids allocated to it, in table number order
+    """
+    sql = """
+SELECT id, tableName, tableStyles, tableNumber
+FROM judging_tables
+ORDER BY tableNumber ASC;
+"""
+    cursor: MySQLCursor = cnn.cursor()
+    cursor.execute(sql)
+    memo = []
+
+    for id, tableName, tableStyles, tableNumber in cursor:
+        style_ids = tuple(int(s_id.strip()) for s_id in tableStyles.split(","))
+        memo.append(TableStyles(id=id, name=tableName, number=tableNumber, style_ids=style_ids))
+
+    return memo
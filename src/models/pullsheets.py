@@ -1,10 +1,13 @@
 
 from dataclasses import dataclass
 import json
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from mysql.connector import MySQLConnection
 from mysql.connector.cursor import MySQLCursor
 
+from src.batched_query import select_in_chunks
+from src.metadata_cache import EnvMetadata
+
 @dataclass
 class Entry:
     entry_number: int
@@ -27,55 +30,39 @@ class StyleRec:
     brewstyle_group: str
     brewstyle_num: str
 
-def _get_judging_tables(cnn: MySQLConnection) -> List[JudgingTable]:
+def _load_style_records(cnn: MySQLConnection, style_ids: Iterable[int]) -> Dict[int, StyleRec]:
+    # brewStyleGroup = two digit string, aligns to brewing.brewCategorySort
+    # brewStyleNum = two digit string, aligns to brewing.brewSubCategory
     sql = """
-SELECT id, tableName, tableStyles, tableNumber
-FROM judging_tables
-ORDER BY tableNumber ASC;
-"""
-    cursor: MySQLCursor = cnn.cursor()
-    cursor.execute(sql)
-    memo = []
-    
-    for (_id, tableName, tableStyles, _tableNumber)  in cursor:
-        style_ids = [int(s_id.strip()) for s_id in tableStyles.split(",")]
-        memo.append(JudgingTable(tableName, style_ids, []))
-    
-    return memo
-
-def _load_style_records(cnn: MySQLConnection, style_ids: List[int], s_recs: Dict[int, StyleRec]):
-    for style_id in style_ids:
-        if style_id in s_recs:
-            continue
-        
-        # brewStyleGroup = two digit string, aligns to brewing.brewCategorySort
-        # brewStyleNum = two digit string, aligns to brewing.brewSubCategory
-        sql = """
 SELECT id, brewStyleGroup, brewStyleNum
 FROM `styles`
-WHERE id = %s;
+WHERE id IN ({keys});
 """
-        cursor: MySQLCursor = cnn.cursor()
-        cursor.execute(sql, (style_id,))
-        _, brewstyle_group, brewstyle_num = cursor.fetchone()
+    s_recs: Dict[int, StyleRec] = {}
+
+    for style_id, brewstyle_group, brewstyle_num in select_in_chunks(cnn, sql, style_ids):
         s_recs[style_id] = StyleRec(brewstyle_group, brewstyle_num)
 
+    return s_recs
 
-def _get_judging_entries_for_style(cnn: MySQLConnection, brew_category_sort: str, brew_subcategory: str) -> List[Entry]:
+
+def _get_judging_entries_for_styles(cnn: MySQLConnection, s_recs: Iterable[StyleRec]) -> Dict[Tuple[str, str], List[Entry]]:
+    """
+    Loads paid & received entries for all of the given styles, keyed on
+    (brewCategorySort, brewSubCategory)
+    """
     sql = """
 SELECT id, brewStyle, brewCategorySort, brewSubCategory, brewInfo, brewABV, brewPouring, brewPossAllergens, brewPaid, brewReceived
 FROM brewing
-WHERE brewCategorySort = %s
-AND brewSubCategory = %s
+WHERE (brewCategorySort, brewSubCategory) IN ({keys})
 AND brewPaid = 1
 AND brewReceived = 1
 ORDER BY id ASC;
 """
-    cursor: MySQLCursor = cnn.cursor()
-    cursor.execute(sql, (brew_category_sort, brew_subcategory))
-    memo = []
+    style_keys = [(s_rec.brewstyle_group, s_rec.brewstyle_num) for s_rec in s_recs]
+    memo: Dict[Tuple[str, str], List[Entry]] = {}
     
-    for (id, brewStyle, _brewCategorySort, _brewSubCategory, brewInfo, brewABV, brewPouring, brewPossAllergens, _brewPaid, _brewReceived)  in cursor:
+    for (id, brewStyle, brewCategorySort, brewSubCategory, brewInfo, brewABV, brewPouring, brewPossAllergens, _brewPaid, _brewReceived) in select_in_chunks(cnn, sql, style_keys):
         # brewPouring is an optional compound field, with each of the following also optional
         # .pouring is pouring speed
         # .pouring_rouse is rouse yeast
@@ -100,24 +87,42 @@ ORDER BY id ASC;
             pouring_speed=pouring_speed,
             rouse_yeast=rouse_yeast
         )
-        memo.append(entry)
+        memo.setdefault((brewCategorySort, brewSubCategory), []).append(entry)
+
     return memo
 
-def _get_judging_entries(cnn: MySQLConnection, table: JudgingTable, s_recs: Dict[int, StyleRec]) -> List[JudgingTable]:
+def _get_judging_entries(table: JudgingTable, s_recs: Dict[int, StyleRec], entries_by_style: Dict[Tuple[str, str], List[Entry]]) -> List[Entry]:
     memo: List[Entry] = []
     for style_id in table.style_ids:
         s_rec = s_recs[style_id]
-        memo.extend(_get_judging_entries_for_style(cnn, s_rec.brewstyle_group, s_rec.brewstyle_num))
+        memo.extend(entries_by_style.get((s_rec.brewstyle_group, s_rec.brewstyle_num), []))
     
     memo.sort(key=lambda e: e.entry_number)
     return memo
 
-def get_data(cnn: MySQLConnection) -> List[JudgingTable]:
-    tables = _get_judging_tables(cnn)
-    style_id_brewstyle_group_num_map: Dict[int, StyleRec] = {}
+def get_data(cnn: MySQLConnection, metadata: Optional[EnvMetadata] = None) -> List[JudgingTable]:
+    """
+    Builds pullsheets from the judging tables and style catalogue in
+    `metadata`, plus one query for the paid & received entries of those
+    styles. Styles outside the active catalogue are looked up directly.
+    """
+    metadata = metadata or EnvMetadata(cnn, None)
+    tables = [
+        JudgingTable(t.name, list(t.style_ids), []) for t in metadata.table_styles()
+    ]
+    style_ids = {style_id for table in tables for style_id in table.style_ids}
+    groups_by_id = metadata.style_catalogue().groups_by_id
+    style_id_brewstyle_group_num_map = {
+        style_id: StyleRec(*groups_by_id[style_id])
+        for style_id in style_ids
+        if style_id in groups_by_id
+    }
+    style_id_brewstyle_group_num_map.update(
+        _load_style_records(cnn, style_ids - style_id_brewstyle_group_num_map.keys())
+    )
+    entries_by_style = _get_judging_entries_for_styles(cnn, style_id_brewstyle_group_num_map.values())
 
     for table in tables:
-        _load_style_records(cnn, table.style_ids, style_id_brewstyle_group_num_map)
-        table.entries = _get_judging_entries(cnn, table, style_id_brewstyle_group_num_map)
+        table.entries = _get_judging_entries(table, style_id_brewstyle_group_num_map, entries_by_style)
 
     return tables
@@ -1,47 +1,216 @@
-from typing import List
+from typing import Any, Collection, Dict, Iterator, List, Optional, Tuple
 from mysql.connector import MySQLConnection
+from mysql.connector.cursor import MySQLCursor
 
+from src.batched_query import placeholders
 from src.datadefs import ScoreEntry
-from src.models import brew_entries, brewers, judging_scores, judging_tables
+from src.models import judging_tables
+from src.models.brew_entries import BrewEntry
+from src.models.brewers import Brewer
+from src.models.judging_scores import parse_countback
+from src.models.judging_tables import JudgingTable
+
+SCORE_JOINS_SQL = """
+FROM judging_scores j
+INNER JOIN brewing b ON b.id = j.eid
+INNER JOIN brewer br ON br.id = j.bid
+INNER JOIN judging_tables t ON t.id = j.scoreTable
+"""
+
+SCORE_COLUMNS_SQL = """
+SELECT
+    j.eid, j.bid, j.scoreTable, j.scoreEntry, j.scorePlace, j.scoreType,
+    j.wg_aroma, j.wg_appearance, j.wg_flavour, j.wg_body, j.wg_overall, j.wg_score_spread, j.wg_countback,
+    b.brewName, b.brewStyle, b.brewCategory, b.brewSubCategory,
+    br.uid, br.brewerFirstName, br.brewerLastName, br.brewerClubs,
+    t.tableName, t.tableNumber
+"""
+
+# eid breaks ties so pages of the API don't overlap or skip scores
+SCORE_ORDER_SQL = """
+ORDER BY j.scoreEntry DESC, cast(j.scorePlace as unsigned) ASC, j.eid ASC
+"""
+
+LOAD_ALL_SQL = SCORE_COLUMNS_SQL + SCORE_JOINS_SQL + SCORE_ORDER_SQL
+
+COUNT_ALL_SQL = "SELECT COUNT(*)" + SCORE_JOINS_SQL
+
+
+def _in_clause(
+    column: str, values: Optional[Collection[Any]], clauses: List[str], params: List[Any]
+) -> None:
+    if values is None:
+        return
+
+    if len(values) == 0:
+        clauses.append("FALSE")
+        return
+
+    clauses.append(f"{column} IN ({placeholders(len(values))})")
+    params.extend(values)
+
+
+def _where(
+    placed_only: bool,
+    entry_ids: Optional[Collection[int]],
+    categories: Optional[Collection[str]] = None,
+    score_tables: Optional[Collection[int]] = None,
+    exclude_tables: Optional[Collection[int]] = None,
+) -> Tuple[str, List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+
+    if placed_only:
+        clauses.append("j.scorePlace IS NOT NULL")
+
+    _in_clause("j.eid", entry_ids, clauses, params)
+    _in_clause("b.brewCategory", categories, clauses, params)
+    _in_clause("j.scoreTable", score_tables, clauses, params)
+
+    if exclude_tables is not None and len(exclude_tables) > 0:
+        clauses.append(f"j.scoreTable NOT IN ({placeholders(len(exclude_tables))})")
+        params.extend(exclude_tables)
+
+    if len(clauses) == 0:
+        return "", params
+
+    return "WHERE " + " AND ".join(clauses), params
+
 
 def load_all(cnn: MySQLConnection) -> List[ScoreEntry]:
-    judging_score_recs = judging_scores.load_all(cnn)
-
-    judging_table_dict = judging_tables.get_judging_table_dict(cnn)
-    brewer_dict = brewers.get_brewer_dict(cnn)
-    brew_entries_dict = brew_entries.get_brew_entries_dict(cnn)
-    memo: List[ScoreEntry] = []
-
-    for js_rec in judging_score_recs:
-        brew_entry = brew_entries_dict[js_rec.entry_id]
-        judging_table = judging_table_dict[js_rec.score_table]
-
-        memo.append(
-            ScoreEntry(
-                entry_id=js_rec.entry_id,
-                category=brew_entry.category,
-                sub_category=brew_entry.subcategory,
-                total_score=js_rec.total_score,
-                aroma=js_rec.aroma,
-                appearance=js_rec.appearance,
-                flavour=js_rec.flavour,
-                body=js_rec.body,
-                overall=js_rec.overall,
-                score_spread=js_rec.score_spread,
-                brewer_id=js_rec.brewer_id,
-                style_id=None,  # allocated to judging tables
-                score_table=js_rec.score_table,
-                score_type=js_rec.score_type,
-                # calculated score place as an int
-                # maps to 'scorePlace, varchar3 in database
-                score_place=js_rec.score_place,
-                # used to store & display countback status
-                countback_status=js_rec.countback_status or set(),
-                # Only used for displaying reports
-                brewer=brewer_dict[js_rec.brewer_id],
-                brew_entry=brew_entry,
-                judging_table=judging_table
+    """
+    Loads every score joined to its entry, brewer and judging table in one query.
+
+    Brewer and judging table objects are shared between the entries that
+    reference them.
+    """
+    return list(iter_all(cnn))
+
+
+def count_all(
+    cnn: MySQLConnection,
+    placed_only: bool = False,
+    entry_ids: Optional[Collection[int]] = None,
+) -> int:
+    """
+    Counts the scores `iter_all` will yield, ignoring `limit` and `offset`
+    """
+    where, params = _where(placed_only, entry_ids)
+    cursor: MySQLCursor = cnn.cursor()
+    cursor.execute(COUNT_ALL_SQL + where, tuple(params))
+    (count,) = cursor.fetchone()
+    return count
+
+
+def iter_all(
+    cnn: MySQLConnection,
+    placed_only: bool = False,
+    entry_ids: Optional[Collection[int]] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    categories: Optional[Collection[str]] = None,
+    score_tables: Optional[Collection[int]] = None,
+    exclude_tables: Optional[Collection[int]] = None,
+) -> Iterator[ScoreEntry]:
+    """
+    Yields scores as they are read off the connection, see `load_all`.
+
+    Optionally restricted to place getters, `entry_ids`, `categories` or
+    `score_tables`, or to scores not on `exclude_tables`, and paged with
+    `limit` and `offset` in the usual highest-score-first order.
+
+    The cursor is unbuffered so the connection is busy until the generator
+    is exhausted, don't run other queries on it in the meantime.
+    """
+    where, params = _where(
+        placed_only, entry_ids, categories, score_tables, exclude_tables
+    )
+    sql = SCORE_COLUMNS_SQL + SCORE_JOINS_SQL + where + SCORE_ORDER_SQL
+
+    if limit is not None:
+        sql += "LIMIT %s OFFSET %s\n"
+        params.extend([limit, offset])
+
+    cursor: MySQLCursor = cnn.cursor()
+    cursor.execute(sql, tuple(params))
+    brewer_dict: Dict[int, Brewer] = {}
+    judging_table_dict: Dict[int, JudgingTable] = {}
+
+    for (
+        eid,
+        bid,
+        scoreTable,
+        scoreEntry,
+        scorePlace,
+        scoreType,
+        wg_aroma,
+        wg_appearance,
+        wg_flavour,
+        wg_body,
+        wg_overall,
+        wg_score_spread,
+        wg_countback,
+        brewName,
+        brewStyle,
+        brewCategory,
+        brewSubCategory,
+        uid,
+        brewerFirstName,
+        brewerLastName,
+        brewerClubs,
+        tableName,
+        tableNumber,
+    ) in cursor:
+        brewer = brewer_dict.get(bid)
+        if brewer is None:
+            brewer = Brewer(
+                id=bid,
+                uid=uid,
+                last_name=brewerLastName,
+                first_name=brewerFirstName,
+                club=brewerClubs,
             )
+            brewer_dict[bid] = brewer
+
+        judging_table = judging_table_dict.get(scoreTable)
+        if judging_table is None:
+            judging_table = JudgingTable(
+                id=scoreTable,
+                name=judging_tables.display_name(tableName),
+                number=tableNumber,
+            )
+            judging_table_dict[scoreTable] = judging_table
+
+        brew_entry = BrewEntry(
+            id=eid,
+            name=brewName,
+            style=brewStyle,
+            category=brewCategory,
+            subcategory=brewSubCategory,
         )
 
-    return memo
+        yield ScoreEntry(
+            entry_id=eid,
+            category=brew_entry.category,
+            sub_category=brew_entry.subcategory,
+            total_score=scoreEntry,
+            aroma=wg_aroma,
+            appearance=wg_appearance,
+            flavour=wg_flavour,
+            body=wg_body,
+            overall=wg_overall,
+            score_spread=wg_score_spread,
+            brewer_id=bid,
+            style_id=None,  # allocated to judging tables
+            score_table=scoreTable,
+            score_type=scoreType,
+            # calculated score place as an int
+            # maps to 'scorePlace, varchar3 in database
+            score_place=None if scorePlace is None else int(scorePlace),
+            # used to store & display countback status
+            countback_status=parse_countback(wg_countback) or set(),
+            # Only used for displaying reports
+            brewer=brewer,
+            brew_entry=brew_entry,
+            judging_table=judging_table,
+        )
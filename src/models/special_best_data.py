@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional
 from mysql.connector import MySQLConnection
 from mysql.connector.cursor import MySQLCursor
 
@@ -63,3 +63,28 @@ WHERE sid = %s;
         return None
 
     return SpecialBestData(id=rec[0], sid=rec[1], bid=rec[2], eid=rec[3], sbd_place=rec[4])
+
+
+def get_all_by_sbi_name(cnn: MySQLConnection) -> Dict[str, SpecialBestData]:
+    """
+    Returns the winner of every special best award that has one, keyed by
+    special_best_info name, in a single query
+    """
+    sql = """
+SELECT i.sbi_name, d.id, d.sid, d.bid, d.eid, d.sbd_place
+FROM special_best_info i
+INNER JOIN special_best_data d ON d.sid = i.id
+ORDER BY d.sbd_place ASC, d.id ASC;
+"""
+    cursor: MySQLCursor = cnn.cursor()
+    cursor.execute(sql)
+    memo: Dict[str, SpecialBestData] = {}
+
+    for sbi_name, id, sid, bid, eid, sbd_place in cursor.fetchall():
+        # first row per award wins, as with get_by_sbi_name
+        if sbi_name in memo:
+            continue
+
+        memo[sbi_name] = SpecialBestData(id=id, sid=sid, bid=bid, eid=eid, sbd_place=sbd_place)
+
+    return memo
@@ -1,9 +1,8 @@
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import List, Optional
 from mysql.connector import MySQLConnection
 from mysql.connector.cursor import MySQLCursor
 
-from src.models import brewers
 from src.models.brewers import Brewer
 
 
@@ -27,22 +26,39 @@ class StaffSummary:
 
 
 def get_staff(cnn: MySQLConnection, with_brewers=True) -> List[Staff]:
-    brewers_by_uid: Dict[int, Brewer] = dict()
-
-    if with_brewers:
-        brewers_by_uid = brewers.get_brewer_uid_dict(cnn)
-
     sql = """
-SELECT id, uid, staff_judge, staff_steward, staff_organizer, staff_staff
-FROM staff
-ORDER BY id ASC;
+SELECT s.id, s.uid, s.staff_judge, s.staff_steward, s.staff_organizer, s.staff_staff,
+    br.id, br.brewerFirstName, br.brewerLastName, br.brewerClubs
+FROM staff s
+LEFT JOIN brewer br ON br.uid = s.uid
+ORDER BY s.id ASC;
     """
     cursor: MySQLCursor = cnn.cursor()
     cursor.execute(sql)
     memo = []
 
-    for id, uid, judge, steward, organizer, staff in cursor:
-        brewer = brewers_by_uid.get(uid, None)
+    for (
+        id,
+        uid,
+        judge,
+        steward,
+        organizer,
+        staff,
+        brewer_id,
+        brewerFirstName,
+        brewerLastName,
+        brewerClubs,
+    ) in cursor:
+        brewer: Optional[Brewer] = None
+
+        if with_brewers and brewer_id is not None:
+            brewer = Brewer(
+                id=brewer_id,
+                uid=uid,
+                last_name=brewerLastName,
+                first_name=brewerFirstName,
+                club=brewerClubs,
+            )
 
         memo.append(
             Staff(
@@ -59,27 +75,53 @@ ORDER BY id ASC;
     return memo
 
 
-def get_summary(cnn) -> StaffSummary:
-    staff = get_staff(cnn, with_brewers=True)
+def get_summary(cnn: MySQLConnection) -> StaffSummary:
+    """
+    Returns staff with brewer records, each role list sorted by last name.
+
+    Only the brewers linked to staff are read, and the database does the sort.
+    """
+    sql = """
+SELECT s.staff_judge, s.staff_steward, s.staff_organizer, s.staff_staff,
+    br.id, br.uid, br.brewerFirstName, br.brewerLastName, br.brewerClubs
+FROM staff s
+INNER JOIN brewer br ON br.uid = s.uid
+ORDER BY br.brewerLastName ASC, s.id ASC;
+    """
+    cursor: MySQLCursor = cnn.cursor()
+    cursor.execute(sql)
     judges: List[Brewer] = list()
     stewards: List[Brewer] = list()
     organizers: List[Brewer] = list()
     staffs: List[Brewer] = list()
 
-    for staff_member in staff:
-        if staff_member.staff:
-            staffs.append(staff_member.brewer)
-        if staff_member.judge:
-            judges.append(staff_member.brewer)
-        if staff_member.organizer:
-            organizers.append(staff_member.brewer)
-        if staff_member.steward:
-            stewards.append(staff_member.brewer)
-
-    judges.sort()
-    stewards.sort()
-    organizers.sort()
-    staffs.sort()
+    for (
+        judge,
+        steward,
+        organizer,
+        staff,
+        id,
+        uid,
+        brewerFirstName,
+        brewerLastName,
+        brewerClubs,
+    ) in cursor:
+        brewer = Brewer(
+            id=id,
+            uid=uid,
+            last_name=brewerLastName,
+            first_name=brewerFirstName,
+            club=brewerClubs,
+        )
+
+        if staff:
+            staffs.append(brewer)
+        if judge:
+            judges.append(brewer)
+        if organizer:
+            organizers.append(brewer)
+        if steward:
+            stewards.append(brewer)
 
     return StaffSummary(
         judges=judges, stewards=stewards, organizers=organizers, staffs=staffs
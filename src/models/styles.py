@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from typing import Dict, Tuple
+from mysql.connector import MySQLConnection
+from mysql.connector.cursor import MySQLCursor
+
+from src.datadefs import make_cat_subcat_key
+
+
+@dataclass
+class StyleCatalogue:
+    style_set: str
+    # style id -> (brewStyleGroup, brewStyleNum)
+    groups_by_id: Dict[int, Tuple[str, str]]
+    # make_cat_subcat_key(brewStyleGroup, brewStyleNum) -> style id
+    ids_by_key: Dict[str, int]
+
+
+def get_prefs_style_set(cnn: MySQLConnection) -> str:
+    sql = "SELECT prefsStyleSet FROM preferences LIMIT 1;"
+    cursor: MySQLCursor = cnn.cursor()
+    cursor.execute(sql)
+    return cursor.fetchone()[0]
+
+
+def load_style_catalogue(cnn: MySQLConnection) -> StyleCatalogue:
+    """
+    Loads the active styles of the competition's style set
+    """
+    style_set = get_prefs_style_set(cnn)
+    sql = """
+SELECT id, brewStyleGroup, brewStyleNum
+FROM styles
+WHERE brewStyleVersion = %s
+AND brewStyleActive = 'Y'
+ORDER BY id ASC;
+"""
+    cursor: MySQLCursor = cnn.cursor()
+    cursor.execute(sql, (style_set,))
+    groups_by_id: Dict[int, Tuple[str, str]] = {}
+    ids_by_key: Dict[str, int] = {}
+
+    for id, brewStyleGroup, brewStyleNum in cursor:
+        groups_by_id[id] = (brewStyleGroup, brewStyleNum)
+        ids_by_key[make_cat_subcat_key(brewStyleGroup, brewStyleNum)] = id
+
+    return StyleCatalogue(
+        style_set=style_set, groups_by_id=groups_by_id, ids_by_key=ids_by_key
+    )
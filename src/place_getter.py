@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List
 from src.datadefs import CountbackStatus, ScoreEntry
+from src.ranking import annotate_tied_countbacks, iter_ranked
 
 
 @dataclass
@@ -9,41 +10,64 @@ class PlaceGetterResult:
     place_getters: List[ScoreEntry]
 
 
+def group_by_category(entries: List[ScoreEntry]) -> Dict[str, List[ScoreEntry]]:
+    memo: Dict[str, List[ScoreEntry]] = {}
+
+    for entry in entries:
+        memo.setdefault(entry.category, []).append(entry)
+
+    return memo
+
+
 def determine_place_getters(
     candidates: List[ScoreEntry], required_places: int
 ) -> PlaceGetterResult:
+    """
+    Sets `score_place` on the top `required_places` candidates.
+
+    Only the leading candidates are put in rank order, `candidates` itself is
+    left in the order it was given.
+
+    Only countbacks between `candidates` are checked, records left on an entry
+    by ranking it against other entries (e.g. for Brewer of Show) don't stop
+    it being placed.
+    """
     success = True
     place_getters: List[ScoreEntry] = []
 
-    candidates.sort(reverse=True)
-
-    for i, cur_candidate in enumerate(candidates):
-        if len(place_getters) >= required_places:
-            break
+    countbacks = annotate_tied_countbacks(candidates)
+    ranked = iter_ranked(candidates)
+    cur_candidate = next(ranked, None)
+    i = 0
 
-        next_candidate = None
-        if len(candidates) > i + 1:
-            next_candidate = candidates[i + 1]
+    while cur_candidate is not None and len(place_getters) < required_places:
+        next_candidate = next(ranked, None)
+        place = i + 1
+        candidate = cur_candidate
+        cur_candidate = next_candidate
+        i += 1
 
         if next_candidate is None:
-            cur_candidate.score_place = i + 1
-            place_getters.append(cur_candidate)
+            candidate.score_place = place
+            place_getters.append(candidate)
             continue
 
-        if len(cur_candidate.countback_status) == 0:
-            cur_candidate.score_place = i + 1
-            place_getters.append(cur_candidate)
+        candidate_countbacks = countbacks.get(candidate.entry_id, set())
+
+        if len(candidate_countbacks) == 0:
+            candidate.score_place = place
+            place_getters.append(candidate)
             continue
 
         interesting_conflicts = [
             x
-            for x in cur_candidate.countback_status
+            for x in candidate_countbacks
             if x.status == CountbackStatus.RECALL_JUDGES
         ]
 
         if len(interesting_conflicts) == 0:
-            cur_candidate.score_place = i + 1
-            place_getters.append(cur_candidate)
+            candidate.score_place = place
+            place_getters.append(candidate)
             continue
 
         next_candidate_id = next_candidate.entry_id
@@ -53,7 +77,8 @@ def determine_place_getters(
 
         if conflict:
             success = False
-            cur_candidate.score_place = i + 1
-            place_getters.append(cur_candidate)
+            candidate.score_place = place
+            place_getters.append(candidate)
 
     return PlaceGetterResult(success, place_getters)
+
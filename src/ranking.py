@@ -0,0 +1,122 @@
+import heapq
+from collections import defaultdict
+from typing import Dict, Iterator, List, Set, Tuple
+
+from src.datadefs import CountbackStatus, CountbackStatusRec, ScoreEntry
+
+RankKey = Tuple[float, float, float, float]
+# countback status records by entry id
+Countbacks = Dict[int, Set[CountbackStatusRec]]
+
+
+def rank_key(entry: ScoreEntry) -> RankKey:
+    """
+    Sort key for placing entries, higher is better.
+
+    Ties on total score are broken by overall impression, then flavour,
+    then the smallest score spread.
+    """
+    return (entry.total_score, entry.overall, entry.flavour, -entry.score_spread)
+
+
+def countback_reason(a: ScoreEntry, b: ScoreEntry) -> CountbackStatus:
+    """
+    Returns why two entries with the same total score were separated
+    """
+    if a.overall != b.overall:
+        return CountbackStatus.OVERALL_IMPRESSION
+
+    if a.flavour != b.flavour:
+        return CountbackStatus.FLAVOUR
+
+    if a.score_spread != b.score_spread:
+        return CountbackStatus.SMALLEST_SCORE_SPREAD
+
+    return CountbackStatus.RECALL_JUDGES
+
+
+def annotate_countbacks(ranked: List[ScoreEntry]) -> None:
+    """
+    Adds countback status records to neighbouring entries that share a total score.
+
+    `ranked` must already be in rank order. Existing records are kept, so ranking
+    the same entries again (e.g. overall, then per category) is idempotent.
+    """
+    for cur, nxt in zip(ranked, ranked[1:]):
+        if cur.total_score != nxt.total_score:
+            continue
+
+        reason = countback_reason(cur, nxt)
+        cur.countback_status.add(CountbackStatusRec(reason, nxt.entry_id))
+        nxt.countback_status.add(CountbackStatusRec(reason, cur.entry_id))
+
+
+def rank_entries(entries: List[ScoreEntry]) -> None:
+    """
+    Sorts entries in place, best first, and records countback reasons for ties
+    """
+    entries.sort(key=rank_key, reverse=True)
+    annotate_countbacks(entries)
+
+
+def tied_countbacks(entries: List[ScoreEntry]) -> Countbacks:
+    """
+    Works out countback reasons between `entries` only, without sorting the
+    whole list or touching the entries' existing records.
+
+    Countbacks only happen between entries with the same total score, so only
+    the (small) groups of tied entries are ranked.
+    """
+    ties: Dict[float, List[ScoreEntry]] = defaultdict(list)
+    memo: Countbacks = defaultdict(set)
+
+    for entry in entries:
+        ties[entry.total_score].append(entry)
+
+    for tied in ties.values():
+        if len(tied) < 2:
+            continue
+
+        tied.sort(key=rank_key, reverse=True)
+
+        for cur, nxt in zip(tied, tied[1:]):
+            reason = countback_reason(cur, nxt)
+            memo[cur.entry_id].add(CountbackStatusRec(reason, nxt.entry_id))
+            memo[nxt.entry_id].add(CountbackStatusRec(reason, cur.entry_id))
+
+    return memo
+
+
+def annotate_tied_countbacks(entries: List[ScoreEntry]) -> Countbacks:
+    """
+    Records countback reasons without sorting `entries`, gives the same result
+    as `rank_entries` without reordering them.
+
+    Returns the records found between `entries`, existing records on the
+    entries (e.g. from ranking them against other entries) are not included.
+    """
+    countbacks = tied_countbacks(entries)
+
+    for entry in entries:
+        entry.countback_status |= countbacks.get(entry.entry_id, set())
+
+    return countbacks
+
+
+def iter_ranked(entries: List[ScoreEntry]) -> Iterator[ScoreEntry]:
+    """
+    Yields entries best first, lazily.
+
+    Builds a heap in linear time, so taking the first k entries costs
+    O(n + k log n) rather than a full sort. Equal keys keep their input order.
+    """
+    heap = [
+        (-total, -overall, -flavour, neg_spread, i)
+        for i, (total, overall, flavour, neg_spread) in enumerate(
+            rank_key(e) for e in entries
+        )
+    ]
+    heapq.heapify(heap)
+
+    while heap:
+        yield entries[heapq.heappop(heap)[-1]]
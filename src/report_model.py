@@ -0,0 +1,250 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from src import constants
+from src.datadefs import (
+    CountedIterable,
+    ResultsDisplayInfo,
+    ScopedScoreEntry,
+    ScoreEntry,
+)
+from src.place_getter import group_by_category
+from src.ranking import rank_key
+
+
+@dataclass
+class CategoryNameCodeCombo:
+    category_name: str
+    category_code: str
+
+
+@dataclass(order=False)
+class ClubOfShowCandidate:
+    name: str
+    firsts_count: int = 0
+    seconds_count: int = 0
+    thirds_count: int = 0
+    member_scores: list[float] = field(default_factory=list)
+    member_average_score: float = 0
+    entry_count: int = 0
+
+    def score(self) -> int:
+        return self.firsts_count * 3 + self.seconds_count * 2 + self.thirds_count * 1
+
+    def __lt__(s, o):
+        if not isinstance(o, s.__class__):
+            return False
+
+        self_score = s.score()
+        other_score = o.score()
+
+        if not self_score == other_score:
+            return self_score < other_score
+
+        self_member_average_score = s.member_average_score
+        other_member_average_score = o.member_average_score
+
+        if not self_member_average_score == other_member_average_score:
+            return self_member_average_score < other_member_average_score
+
+        self_entry_count = s.entry_count
+        other_entry_count = o.entry_count
+
+        return self_entry_count > other_entry_count
+
+    def __gt__(s, o):
+        return not s < o
+
+
+CATEGORIES_COMBOS = [
+    CategoryNameCodeCombo("Porter", "10"),
+    CategoryNameCodeCombo("Stout", "11"),
+    CategoryNameCodeCombo("Strong Stout", "12"),
+]
+
+
+@dataclass
+class ReportModel:
+    club_of_show_list: List[ClubOfShowCandidate]
+    placegetter_display_infos: List[ResultsDisplayInfo]
+    all_results_display_infos: List[ResultsDisplayInfo]
+
+
+def normalised_club(club: Optional[str]) -> Optional[str]:
+    """
+    Treats blank and 'none' clubs as no club
+    """
+    if club is None:
+        return None
+
+    stripped_club = club.strip()
+    if len(stripped_club) == 0 or stripped_club.lower() == "none":
+        return None
+
+    return club
+
+
+def normalise_clubs(entries: List[ScoreEntry]) -> None:
+    """
+    Treats blank and 'none' clubs as no club, in place
+    """
+    for ent in entries:
+        if ent.brewer is None:
+            continue
+
+        ent.brewer.club = normalised_club(ent.brewer.club)
+
+
+def club_of_show_standings(entries: List[ScoreEntry]) -> List[ClubOfShowCandidate]:
+    club_of_show_dict: Dict[str, ClubOfShowCandidate] = dict()
+
+    for entry in entries:
+        if entry.brewer is None or entry.brewer.club is None:
+            continue
+
+        club_name = entry.brewer.club
+
+        if club_name not in club_of_show_dict:
+            club_of_show_dict[club_name] = ClubOfShowCandidate(name=club_name)
+
+        match entry.score_place:
+            case 1:
+                club_of_show_dict[club_name].firsts_count += 1
+            case 2:
+                club_of_show_dict[club_name].seconds_count += 1
+            case 3:
+                club_of_show_dict[club_name].thirds_count += 1
+
+        club_of_show_dict[club_name].entry_count += 1
+        club_of_show_dict[club_name].member_scores.append(entry.total_score)
+
+    for x in club_of_show_dict.values():
+        if len(x.member_scores) == 0:
+            continue
+
+        x.member_average_score = sum(x.member_scores) / len(x.member_scores)
+
+    return sorted(club_of_show_dict.values(), reverse=True)
+
+
+def scope_countbacks(placegetters: List[ScoreEntry]) -> List[ScopedScoreEntry]:
+    """
+    Wraps place getters so they only show countbacks against each other
+    """
+    placegetter_entry_ids = {p.entry_id for p in placegetters}
+
+    return [
+        ScopedScoreEntry(
+            p,
+            frozenset(
+                cbs
+                for cbs in p.countback_status
+                if cbs.conflict_entry_id in placegetter_entry_ids
+            ),
+        )
+        for p in placegetters
+    ]
+
+
+def iter_ranked_category(entries: List[ScoreEntry]) -> Iterator[ScoreEntry]:
+    """
+    Ranks a category when iteration starts rather than when it is called
+    """
+    yield from sorted(entries, key=rank_key, reverse=True)
+
+
+def build_report_model(
+    entries: List[ScoreEntry],
+    special_best_eids: Dict[str, int],
+    presentation_mode: bool,
+) -> ReportModel:
+    """
+    Builds the report sections from loaded score entries.
+
+    `special_best_eids` maps special best names (e.g. constants.BREWER_OF_SHOW)
+    to the winning entry id. Entries are grouped by category once, and place
+    getter sections hold lightweight ScopedScoreEntry views rather than copies.
+    Full category results are single-pass iterables that are only ranked when
+    rendered, so a streamed report can send earlier sections first.
+    """
+    normalise_clubs(entries)
+    club_of_show_list = club_of_show_standings(entries)
+
+    wanted_eids = set(special_best_eids.values())
+    entries_by_id = {e.entry_id: e for e in entries if e.entry_id in wanted_eids}
+
+    def special_best_winners(name: str) -> List[ScoreEntry]:
+        eid = special_best_eids.get(name)
+
+        if eid is None or eid not in entries_by_id:
+            return []
+
+        return [entries_by_id[eid]]
+
+    placegetter_display_infos: List[ResultsDisplayInfo] = [
+        ResultsDisplayInfo(
+            category_heading=constants.BREWER_OF_SHOW,
+            category_blurb="Brewer of Show will be awarded to the highest scoring beer in the competition.",
+            show_entry_count=False,
+            show_place_column=False,
+            show_countback=presentation_mode,
+            show_entry_id=False,
+            show_judging_table=False,
+            entries=special_best_winners(constants.BREWER_OF_SHOW),
+        ),
+        ResultsDisplayInfo(
+            category_heading=constants.BEST_NOVICE,
+            category_blurb="The Best Novice Trophy is awarded to the highest score by a Victorian brewer who has not placed in a VicBrew accredited competition.",
+            show_entry_count=False,
+            show_place_column=False,
+            show_countback=False,
+            show_entry_id=False,
+            show_judging_table=False,
+            entries=special_best_winners(constants.BEST_NOVICE),
+        ),
+    ]
+
+    all_results_display_infos: List[ResultsDisplayInfo] = []
+    entries_by_category = group_by_category(entries)
+
+    for cc in CATEGORIES_COMBOS:
+        category_entries = entries_by_category.get(cc.category_code, [])
+        placegetter_entries = sorted(
+            (e for e in category_entries if e.score_place is not None),
+            key=rank_key,
+            reverse=True,
+        )
+
+        placegetter_display_infos.append(
+            ResultsDisplayInfo(
+                category_heading=cc.category_name,
+                category_blurb=None,
+                show_entry_count=False,
+                show_place_column=True,
+                show_countback=presentation_mode,
+                show_entry_id=presentation_mode,
+                show_judging_table=False,
+                entries=scope_countbacks(placegetter_entries),
+            )
+        )
+
+        all_results_display_infos.append(
+            ResultsDisplayInfo(
+                category_heading=cc.category_name,
+                category_blurb=None,
+                show_entry_count=True,
+                show_place_column=False,
+                show_countback=presentation_mode,
+                show_entry_id=presentation_mode,
+                show_judging_table=False,
+                entries=CountedIterable(
+                    iter_ranked_category(category_entries), len(category_entries)
+                ),
+            )
+        )
+
+    return ReportModel(
+        club_of_show_list=club_of_show_list,
+        placegetter_display_infos=placegetter_display_infos,
+        all_results_display_infos=all_results_display_infos,
+    )
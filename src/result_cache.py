@@ -0,0 +1,36 @@
+from typing import Optional, Tuple
+
+from src.cache import CacheStats, TTLCache
+
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_TTL = 300.0
+
+# (env short name, view name, data fingerprint) -> rendered page
+ResultCacheKey = Tuple[str, str, str]
+
+_cache: TTLCache[ResultCacheKey, str] = TTLCache(
+    "results", DEFAULT_MAX_ENTRIES, DEFAULT_TTL
+)
+
+
+def configure(max_entries: int, ttl: float) -> None:
+    _cache.configure(max_entries, ttl)
+
+
+def get(env_short_name: str, view: str, fingerprint: str) -> Optional[str]:
+    return _cache.get((env_short_name, view, fingerprint))
+
+
+def put(env_short_name: str, view: str, fingerprint: str, html: str) -> None:
+    _cache.set((env_short_name, view, fingerprint), html)
+
+
+def invalidate(env_short_name: str) -> int:
+    """
+    Drops every cached page for an environment, call after scores change
+    """
+    return _cache.invalidate(lambda key: key[0] == env_short_name)
+
+
+def stats() -> CacheStats:
+    return _cache.stats()
@@ -0,0 +1,64 @@
+import csv
+from typing import Iterable, Iterator, List
+
+from src.csv_validate import REQUIRED_HEADERS
+from src.datadefs import ScoreEntry
+from src.report_model import normalised_club
+
+# the upload headers come first so an export can be uploaded again as is
+EXPORT_HEADERS = REQUIRED_HEADERS + [
+    "Place",
+    "Countback",
+    "Brewer",
+    "Club",
+    "Entry Name",
+    "Style",
+    "Judging Table",
+]
+
+
+class _PassThrough:
+    """
+    File-like object whose write hands back what was written, lets csv.writer
+    format one row at a time without buffering
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_row(entry: ScoreEntry) -> List[object]:
+    brewer = entry.brewer
+    brew_entry = entry.brew_entry
+
+    return [
+        entry.entry_id,
+        entry.category,
+        entry.sub_category,
+        entry.total_score,
+        entry.appearance,
+        entry.body,
+        entry.aroma,
+        entry.overall,
+        entry.flavour,
+        entry.score_spread,
+        entry.score_place,
+        # wg_countback format, so it parses with parse_countback
+        ", ".join(sorted(cb.to_db_str() for cb in entry.countback_status)),
+        None if brewer is None else f"{brewer.first_name} {brewer.last_name}",
+        None if brewer is None else normalised_club(brewer.club),
+        None if brew_entry is None else brew_entry.name,
+        None if brew_entry is None else brew_entry.style,
+        None if entry.judging_table is None else entry.judging_table.name,
+    ]
+
+
+def iter_csv(entries: Iterable[ScoreEntry]) -> Iterator[str]:
+    """
+    Yields the export as CSV, one line per entry after the header
+    """
+    writer = csv.writer(_PassThrough())
+    yield writer.writerow(EXPORT_HEADERS)
+
+    for entry in entries:
+        yield writer.writerow(export_row(entry))
@@ -0,0 +1,91 @@
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from src.datadefs import ScoreEntry
+from src.report_model import ClubOfShowCandidate, normalised_club
+
+ScoreField = Callable[[ScoreEntry], Any]
+
+
+def _brewer_name(e: ScoreEntry) -> Optional[str]:
+    if e.brewer is None:
+        return None
+
+    return f"{e.brewer.first_name} {e.brewer.last_name}"
+
+
+SCORE_FIELDS: Dict[str, ScoreField] = {
+    "entry_id": lambda e: e.entry_id,
+    "category": lambda e: e.category,
+    "sub_category": lambda e: e.sub_category,
+    "total_score": lambda e: e.total_score,
+    "place": lambda e: e.score_place,
+    # same "<status> vs <entry id>" strings as stored in wg_countback
+    "countback": lambda e: sorted(cb.to_db_str() for cb in e.countback_status),
+    "brewer": _brewer_name,
+    "club": lambda e: None if e.brewer is None else normalised_club(e.brewer.club),
+    "entry_name": lambda e: None if e.brew_entry is None else e.brew_entry.name,
+    "style": lambda e: None if e.brew_entry is None else e.brew_entry.style,
+    "judging_table": lambda e: None if e.judging_table is None else e.judging_table.name,
+    "aroma": lambda e: e.aroma,
+    "appearance": lambda e: e.appearance,
+    "flavour": lambda e: e.flavour,
+    "body": lambda e: e.body,
+    "overall": lambda e: e.overall,
+    "score_spread": lambda e: e.score_spread,
+}
+
+DEFAULT_SCORE_FIELDS = [
+    "entry_id",
+    "category",
+    "sub_category",
+    "total_score",
+    "place",
+    "countback",
+    "brewer",
+    "club",
+    "entry_name",
+    "style",
+]
+
+
+def parse_fields(value: Optional[str]) -> List[str]:
+    """
+    Parses a comma separated `fields` param, raises ValueError on unknown fields
+    """
+    if value is None or len(value.strip()) == 0:
+        return DEFAULT_SCORE_FIELDS
+
+    fields = [f.strip() for f in value.split(",") if len(f.strip()) > 0]
+    unknown = [f for f in fields if f not in SCORE_FIELDS]
+
+    if len(unknown) > 0:
+        raise ValueError(
+            f"Unknown fields: {unknown}, choose from {list(SCORE_FIELDS.keys())}"
+        )
+
+    return fields
+
+
+def score_to_dict(entry: ScoreEntry, fields: List[str]) -> Dict[str, Any]:
+    return {f: SCORE_FIELDS[f](entry) for f in fields}
+
+
+def club_to_dict(club: ClubOfShowCandidate, place: int) -> Dict[str, Any]:
+    return {
+        "place": place,
+        "club": club.name,
+        "firsts": club.firsts_count,
+        "seconds": club.seconds_count,
+        "thirds": club.thirds_count,
+        "score": club.score(),
+        "average_score": round(club.member_average_score, 2),
+        "entry_count": club.entry_count,
+    }
+
+
+def dumps(obj: Any) -> str:
+    """
+    Compact JSON, no whitespace between tokens
+    """
+    return json.dumps(obj, separators=(",", ":"))
@@ -0,0 +1,156 @@
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import mysql.connector  # type: ignore
+from mysql.connector import MySQLConnection
+from mysql.connector.cursor import MySQLCursor
+
+from src.batched_query import chunked, placeholders
+from src.datadefs import ScoreEntry
+from src.models.judging_scores import JudgingScore
+from src.score_process import DEFAULT_SAVE_CHUNK_SIZE, INSERT_SCORE_SQL, score_entry_row
+from src.utils import format_error_message
+
+# wg_* scores are single precision FLOAT columns and read back slightly off
+SCORE_TOLERANCE = 0.001
+
+# keyed on the primary key so a chunk of updates is one multi-row statement
+UPDATE_SCORE_SQL = """
+INSERT INTO judging_scores (id, eid, bid, scoreTable, scoreEntry, scorePlace, scoreType, wg_aroma, wg_appearance, wg_flavour, wg_body, wg_overall, wg_score_spread, wg_countback)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    eid = VALUES(eid),
+    bid = VALUES(bid),
+    scoreTable = VALUES(scoreTable),
+    scoreEntry = VALUES(scoreEntry),
+    scorePlace = VALUES(scorePlace),
+    scoreType = VALUES(scoreType),
+    wg_aroma = VALUES(wg_aroma),
+    wg_appearance = VALUES(wg_appearance),
+    wg_flavour = VALUES(wg_flavour),
+    wg_body = VALUES(wg_body),
+    wg_overall = VALUES(wg_overall),
+    wg_score_spread = VALUES(wg_score_spread),
+    wg_countback = VALUES(wg_countback)
+"""
+
+DELETE_SCORES_SQL = """
+DELETE FROM judging_scores
+WHERE id IN ({keys})
+"""
+
+
+@dataclass
+class ScoreDiff:
+    inserts: List[ScoreEntry] = field(default_factory=list)
+    # (judging_scores.id, new score)
+    updates: List[Tuple[int, ScoreEntry]] = field(default_factory=list)
+    # judging_scores.id
+    deletes: List[int] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def changes(self) -> int:
+        return len(self.inserts) + len(self.updates) + len(self.deletes)
+
+    def summary(self) -> str:
+        return f"{len(self.inserts)} new, {len(self.updates)} changed, {len(self.deletes)} removed, {self.unchanged} unchanged"
+
+
+def _same_score(a: Optional[float], b: Optional[float]) -> bool:
+    if a is None or b is None:
+        return a is b
+
+    return math.isclose(a, b, abs_tol=SCORE_TOLERANCE)
+
+
+def score_matches(current: JudgingScore, entry: ScoreEntry) -> bool:
+    """
+    Whether saving `entry` would leave `current` as it is
+    """
+    return (
+        current.brewer_id == entry.brewer_id
+        and current.score_table == entry.score_table
+        and current.score_place == entry.score_place
+        and current.score_type == entry.score_type
+        and (current.countback_status or set()) == entry.countback_status
+        and _same_score(current.total_score, entry.total_score)
+        and _same_score(current.aroma, entry.aroma)
+        and _same_score(current.appearance, entry.appearance)
+        and _same_score(current.flavour, entry.flavour)
+        and _same_score(current.body, entry.body)
+        and _same_score(current.overall, entry.overall)
+        and _same_score(current.score_spread, entry.score_spread)
+    )
+
+
+def diff_scores(current: List[JudgingScore], entries: List[ScoreEntry]) -> ScoreDiff:
+    """
+    Works out the writes that turn the `current` scores into `entries`,
+    matching rows on entry id
+    """
+    diff = ScoreDiff()
+    current_by_eid: Dict[int, JudgingScore] = {}
+
+    for score in sorted(current, key=lambda s: s.id):
+        if score.entry_id in current_by_eid:
+            # only one score per entry is kept
+            diff.deletes.append(score.id)
+        else:
+            current_by_eid[score.entry_id] = score
+
+    for entry in entries:
+        saved: Optional[JudgingScore] = current_by_eid.pop(entry.entry_id, None)
+
+        if saved is None:
+            diff.inserts.append(entry)
+        elif score_matches(saved, entry):
+            diff.unchanged += 1
+        else:
+            diff.updates.append((saved.id, entry))
+
+    diff.deletes.extend(s.id for s in current_by_eid.values())
+    diff.deletes.sort()
+    return diff
+
+
+def apply_diff(
+    cnn: MySQLConnection,
+    diff: ScoreDiff,
+    messages: list[str],
+    chunk_size: int = DEFAULT_SAVE_CHUNK_SIZE,
+) -> bool:
+    """
+    Writes a ScoreDiff in chunks of `chunk_size` rows inside a single transaction
+    """
+    cursor: MySQLCursor = cnn.cursor()
+    started = time.perf_counter()
+
+    try:
+        for chunk in chunked(diff.deletes, chunk_size):
+            cursor.execute(
+                DELETE_SCORES_SQL.format(keys=placeholders(len(chunk))), chunk
+            )
+
+        for update_chunk in chunked(diff.updates, chunk_size):
+            cursor.executemany(
+                UPDATE_SCORE_SQL,
+                [(id,) + score_entry_row(e) for id, e in update_chunk],
+            )
+
+        for insert_chunk in chunked(diff.inserts, chunk_size):
+            cursor.executemany(
+                INSERT_SCORE_SQL, [score_entry_row(e) for e in insert_chunk]
+            )
+
+        cnn.commit()
+    except mysql.connector.Error as e:
+        cnn.rollback()
+        format_error_message(f"Error saving score changes, rolled back: {e}", messages)
+        return False
+
+    elapsed = time.perf_counter() - started
+    messages.append(f"Saved {diff.changes} score changes in {elapsed:.2f}s")
+    return True
@@ -1,27 +1,52 @@
 import csv
-from typing import Dict, TextIO
+import time
+from typing import Dict, Iterable, Optional, TextIO, Tuple
+import mysql.connector  # type: ignore
 from mysql.connector import MySQLConnection
 from mysql.connector.cursor import MySQLCursor
 
-from src.datadefs import ScoreEntry, make_cat_subcat_key
+from src.batched_query import chunked, select_in_chunks
+from src.datadefs import ScoreEntry
+from src.metadata_cache import EnvMetadata
 from src.utils import format_error_message
 
+DEFAULT_SAVE_CHUNK_SIZE = 500
+
+SCORES_TABLE = "judging_scores"
+# replacement scores are loaded here, then swapped with SCORES_TABLE
+STAGING_TABLE = "judging_scores_staging"
+# where the replaced scores sit for the moment between swap and drop
+RETIRED_TABLE = "judging_scores_retired"
+
+
+def insert_score_sql(table: str) -> str:
+    return f"""
+INSERT INTO {table} (eid, bid, scoreTable, scoreEntry, scorePlace, scoreType, wg_aroma, wg_appearance, wg_flavour, wg_body, wg_overall, wg_score_spread, wg_countback)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+INSERT_SCORE_SQL = insert_score_sql(SCORES_TABLE)
+
 
 def get_brewer_ids(cnn: MySQLConnection, entries: list[ScoreEntry]) -> None:
     """
-    Retrieves brewer IDs for a list of entries and sets them in place
+    Retrieves brewer IDs for a list of entries and sets them in place.
+
+    Only the entries in the list are looked up, so the cost does not grow with
+    the number of historical rows in `brewing`.
     """
 
     entry_id_brewer_id_map: Dict[int, int] = {}
     sql = """
 SELECT id, brewBrewerID
 FROM brewing
-ORDER BY id ASC;
+WHERE id IN ({keys});
 """
-    cursor: MySQLCursor = cnn.cursor()
-    cursor.execute(sql)
 
-    for id, brewBrewerID in cursor:
+    for id, brewBrewerID in select_in_chunks(
+        cnn, sql, [entry.entry_id for entry in entries]
+    ):
         # 'brewBrewerId' is varchar for some reason, even though it's an int everywhere else
         entry_id_brewer_id_map[id] = int(brewBrewerID)
 
@@ -29,23 +54,21 @@ ORDER BY id ASC;
         entry.brewer_id = entry_id_brewer_id_map.get(entry.entry_id)
 
 
-def get_judging_tables(cnn: MySQLConnection, entries: list[ScoreEntry]) -> None:
+def get_judging_tables(
+    cnn: MySQLConnection,
+    entries: list[ScoreEntry],
+    metadata: Optional[EnvMetadata] = None,
+) -> None:
     """
     Retrieves judging table ids / 'score_table' for list of score entries and
     sets them in place
     """
+    metadata = metadata or EnvMetadata(cnn, None)
     style_id_score_table_map: Dict[int, int] = {}
-    sql = """
-SELECT id, tableStyles
-FROM judging_tables
-ORDER BY id ASC;
-"""
-    cursor: MySQLCursor = cnn.cursor()
-    cursor.execute(sql)
 
-    for id, tableStyles in cursor:
-        for style in tableStyles.split(","):
-            style_id_score_table_map[int(style)] = id
+    for table in sorted(metadata.table_styles(), key=lambda t: t.id):
+        for style_id in table.style_ids:
+            style_id_score_table_map[style_id] = table.id
 
     for entry in entries:
         if entry.style_id is None:
@@ -54,44 +77,36 @@ ORDER BY id ASC;
         entry.score_table = style_id_score_table_map.get(entry.style_id, None)
 
 
-def get_prefs_style_set(cnn: MySQLConnection) -> str:
-    sql = "SELECT prefsStyleSet FROM preferences LIMIT 1;"
-    cursor: MySQLCursor = cnn.cursor()
-    cursor.execute(sql)
-    return cursor.fetchone()[0]
-
-
 def get_style_ids(
-    cnn: MySQLConnection, entries: list[ScoreEntry], messages: list[str]
+    cnn: MySQLConnection,
+    entries: list[ScoreEntry],
+    messages: list[str],
+    metadata: Optional[EnvMetadata] = None,
 ) -> None:
     """
     Retrieves style ids for list of score entries and
     sets them in place
     """
-    prefs_style_set = get_prefs_style_set(cnn)
-    messages.append(f"Using '{prefs_style_set}' style set")
-
-    style_key_style_id_map: Dict[str, int] = {}
-    sql = """
-SELECT id, brewStyleGroup, brewStyleNum
-FROM styles
-WHERE brewStyleVersion = %s
-AND brewStyleActive = 'Y'
-ORDER BY id ASC;
-"""
-    cursor: MySQLCursor = cnn.cursor()
-    cursor.execute(sql, (prefs_style_set,))
-
-    for id, brewStyleGroup, brewStyleNum in cursor:
-        style_key_style_id_map[make_cat_subcat_key(brewStyleGroup, brewStyleNum)] = id
+    metadata = metadata or EnvMetadata(cnn, None)
+    catalogue = metadata.style_catalogue()
+    messages.append(f"Using '{catalogue.style_set}' style set")
 
     for entry in entries:
-        entry.style_id = style_key_style_id_map.get(entry.style_key, None)
+        entry.style_id = catalogue.ids_by_key.get(entry.style_key, None)
 
 
 def prepare_entries(
-    cnn: MySQLConnection, entries: list[ScoreEntry], messages: list[str]
+    cnn: MySQLConnection,
+    entries: list[ScoreEntry],
+    messages: list[str],
+    metadata: Optional[EnvMetadata] = None,
 ) -> bool:
+    """
+    Looks up brewer, style and judging table ids for the entries in place.
+
+    Styles and judging tables come through `metadata` when given, so repeated
+    uploads don't reload them.
+    """
     ok = True
     messages.append("Getting brewer IDs")
     get_brewer_ids(cnn, entries)
@@ -106,7 +121,7 @@ def prepare_entries(
     else:
         messages.append(f"Retrieved brewer ids")
 
-    get_style_ids(cnn, entries, messages)
+    get_style_ids(cnn, entries, messages, metadata)
 
     missing_style_ids = [entry.entry_id for entry in entries if entry.style_id is None]
     if len(missing_style_ids) > 0:
@@ -118,7 +133,7 @@ def prepare_entries(
     else:
         messages.append(f"Retrieved style ids")
 
-    get_judging_tables(cnn, entries)
+    get_judging_tables(cnn, entries, metadata)
 
     missing_judging_table_ids = [
         entry.entry_id for entry in entries if entry.style_id is None
@@ -135,12 +150,10 @@ def prepare_entries(
     return ok
 
 
-def load_entries_from_csv(data: TextIO) -> list[ScoreEntry]:
+def entries_from_rows(rows: Iterable[Dict[str, str]]) -> list[ScoreEntry]:
     memo = []
-    data.seek(0)
-    dr = csv.DictReader(data)
 
-    for r in dr:
+    for r in rows:
         entry_id = r["Entry Number"]
 
         if len(entry_id.strip()) == 0:
@@ -166,31 +179,121 @@ def load_entries_from_csv(data: TextIO) -> list[ScoreEntry]:
     return memo
 
 
-def save_entries(cnn: MySQLConnection, entries: list[ScoreEntry]) -> bool:
-    ok = True
-    sql = """
-INSERT INTO judging_scores (eid, bid, scoreTable, scoreEntry, scorePlace, scoreType, wg_aroma, wg_appearance, wg_flavour, wg_body, wg_overall, wg_score_spread, wg_countback)
-VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-"""
+def load_entries_from_csv(data: TextIO) -> list[ScoreEntry]:
+    data.seek(0)
+    return entries_from_rows(csv.DictReader(data))
+
+
+def score_entry_row(entry: ScoreEntry) -> Tuple:
+    """
+    Returns the values for INSERT_SCORE_SQL for a single score entry
+    """
+    return (
+        entry.entry_id,
+        entry.brewer_id,
+        entry.score_table,
+        entry.total_score,
+        entry.score_place,
+        entry.score_type,
+        entry.aroma,
+        entry.appearance,
+        entry.flavour,
+        entry.body,
+        entry.overall,
+        entry.score_spread,
+        entry.countback_status_db_repr(),
+    )
+
+
+def save_entries(
+    cnn: MySQLConnection,
+    entries: list[ScoreEntry],
+    messages: list[str],
+    chunk_size: int = DEFAULT_SAVE_CHUNK_SIZE,
+    table: str = SCORES_TABLE,
+) -> bool:
+    """
+    Saves score entries in chunks of `chunk_size` rows inside a single transaction.
+
+    mysql-connector rewrites `executemany` on an INSERT into one multi-row INSERT,
+    so each chunk is a single round trip to the server.
+    """
+    cursor: MySQLCursor = cnn.cursor()
+    sql = insert_score_sql(table)
+    started = time.perf_counter()
+
+    try:
+        for chunk in chunked(entries, chunk_size):
+            cursor.executemany(sql, [score_entry_row(e) for e in chunk])
+
+        cnn.commit()
+    except mysql.connector.Error as e:
+        cnn.rollback()
+        format_error_message(f"Error saving scores, rolled back: {e}", messages)
+        return False
+
+    elapsed = time.perf_counter() - started
+    rate = len(entries) / elapsed if elapsed > 0 else float(len(entries))
+    messages.append(
+        f"Saved {len(entries)} scores in {elapsed:.2f}s ({rate:.0f} rows/sec, chunk size {chunk_size})"
+    )
+    return True
+
+
+def drop_staging_table(cnn: MySQLConnection) -> None:
+    try:
+        cnn.cursor().execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+    except mysql.connector.Error:
+        pass
+
+
+def swap_in_entries(
+    cnn: MySQLConnection,
+    entries: list[ScoreEntry],
+    messages: list[str],
+    chunk_size: int = DEFAULT_SAVE_CHUNK_SIZE,
+) -> bool:
+    """
+    Replaces every score with `entries` without readers seeing a partly
+    filled table.
+
+    The entries are bulk loaded into an empty copy of `judging_scores`, which
+    is then swapped in with one RENAME TABLE. MySQL renames both tables
+    atomically, so readers see either the old scores or the new ones and the
+    lock is held only for the rename, however many entries there are. If
+    loading fails the live scores are left untouched.
+    """
     cursor: MySQLCursor = cnn.cursor()
 
-    for entry in entries:
-        data = (
-            entry.entry_id,
-            entry.brewer_id,
-            entry.score_table,
-            entry.total_score,
-            entry.score_place,
-            entry.score_type,
-            entry.aroma,
-            entry.appearance,
-            entry.flavour,
-            entry.body,
-            entry.overall,
-            entry.score_spread,
-            entry.countback_status_db_repr(),
+    try:
+        # left behind if an earlier swap was interrupted
+        cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}, {RETIRED_TABLE}")
+        cursor.execute(f"CREATE TABLE {STAGING_TABLE} LIKE {SCORES_TABLE}")
+    except mysql.connector.Error as e:
+        format_error_message(f"Unable to create staging table: {e}", messages)
+        return False
+
+    if not save_entries(cnn, entries, messages, chunk_size, table=STAGING_TABLE):
+        drop_staging_table(cnn)
+        return False
+
+    started = time.perf_counter()
+
+    try:
+        cursor.execute(
+            f"RENAME TABLE {SCORES_TABLE} TO {RETIRED_TABLE}, {STAGING_TABLE} TO {SCORES_TABLE}"
         )
-        cursor.execute(sql, data)
+    except mysql.connector.Error as e:
+        drop_staging_table(cnn)
+        format_error_message(f"Unable to swap in new scores: {e}", messages)
+        return False
 
-    cnn.commit()
-    return ok
+    messages.append(f"Swapped in new scores in {time.perf_counter() - started:.3f}s")
+
+    try:
+        cursor.execute(f"DROP TABLE {RETIRED_TABLE}")
+    except mysql.connector.Error as e:
+        # the new scores are live, the old table is dropped by the next swap
+        messages.append(f"Warning: unable to drop {RETIRED_TABLE}: {e}")
+
+    return True
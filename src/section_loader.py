@@ -0,0 +1,114 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from mysql.connector import MySQLConnection
+
+from src.db_pool import ConnectionPool
+
+DEFAULT_MAX_WORKERS = 4
+
+SectionLoader = Callable[[MySQLConnection], Any]
+
+
+@dataclass
+class SectionTiming:
+    name: str
+    seconds: float
+    # False when the section ran on the caller's connection
+    parallel: bool
+
+
+@dataclass
+class LoadedSections:
+    values: Dict[str, Any]
+    timings: List[SectionTiming]
+
+
+@dataclass
+class SectionStats:
+    name: str
+    loads: int = 0
+    total_seconds: float = 0
+    max_seconds: float = 0
+
+    def to_dict(self) -> dict[str, Union[str, int, float]]:
+        return asdict(self)
+
+
+_stats: Dict[str, SectionStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _timed(loader: SectionLoader, cnn: MySQLConnection) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    value = loader(cnn)
+    return value, time.perf_counter() - start
+
+
+def _record(timings: List[SectionTiming]) -> None:
+    with _stats_lock:
+        for t in timings:
+            stats = _stats.setdefault(t.name, SectionStats(name=t.name))
+            stats.loads += 1
+            stats.total_seconds += t.seconds
+            stats.max_seconds = max(stats.max_seconds, t.seconds)
+
+
+def load_sections(
+    cnn: MySQLConnection,
+    pool: Optional[ConnectionPool],
+    sections: Dict[str, SectionLoader],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> LoadedSections:
+    """
+    Runs independent section loaders at the same time, each on its own pooled
+    connection, so the total wait is that of the slowest section.
+
+    Extra connections are only taken if they are free right away. Sections
+    that don't get one run one after another on `cnn`, so a busy pool makes
+    the report slower rather than deadlocking requests against each other.
+    List the slowest sections first, they get the extra connections.
+    """
+    extra: List[MySQLConnection] = []
+
+    if pool is not None:
+        while len(extra) < min(len(sections) - 1, max_workers):
+            extra_cnn = pool.try_checkout()
+
+            if extra_cnn is None:
+                break
+
+            extra.append(extra_cnn)
+
+    names = list(sections.keys())
+    values: Dict[str, Any] = {}
+    timings: List[SectionTiming] = []
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(len(extra), 1)) as executor:
+            futures: Dict[str, Future] = {
+                name: executor.submit(_timed, sections[name], extra_cnn)
+                for name, extra_cnn in zip(names, extra)
+            }
+
+            for name in names[len(extra) :]:
+                values[name], seconds = _timed(sections[name], cnn)
+                timings.append(SectionTiming(name, seconds, parallel=False))
+
+            for name, future in futures.items():
+                values[name], seconds = future.result()
+                timings.append(SectionTiming(name, seconds, parallel=True))
+    finally:
+        for extra_cnn in extra:
+            pool.release(extra_cnn)  # type: ignore
+
+    _record(timings)
+    return LoadedSections(values=values, timings=timings)
+
+
+def section_stats() -> List[SectionStats]:
+    with _stats_lock:
+        return [SectionStats(**asdict(s)) for s in _stats.values()]
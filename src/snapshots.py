@@ -0,0 +1,106 @@
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from src.utils import SNAPSHOT_PATH
+
+logger = logging.getLogger(__name__)
+
+ALL_RESULTS_VIEW = "all_results"
+
+# first line of a snapshot file records the data version it was rendered from
+FINGERPRINT_HEADER = "<!-- fingerprint:{} -->\n"
+
+
+@dataclass
+class Snapshot:
+    html: str
+    fingerprint: str
+
+
+def report_view(presentation_mode: bool) -> str:
+    return "report_generator_presentation" if presentation_mode else "report_generator"
+
+
+def snapshot_path(env_short_name: str, view: str) -> Path:
+    return Path(SNAPSHOT_PATH, env_short_name, f"{view}.html")
+
+
+def write_snapshot(
+    env_short_name: str, view: str, html: str, fingerprint: str
+) -> Path:
+    """
+    Atomically replaces the static snapshot of a rendered page
+    """
+    path = snapshot_path(env_short_name, view)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # a temp file per write, threads and processes may write the same view at once
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{view}.", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "w") as fh:
+            fh.write(FINGERPRINT_HEADER.format(fingerprint) + html)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+    return path
+
+
+def refresh_snapshot(
+    env_short_name: str, view: str, html: str, fingerprint: str, started: float
+) -> None:
+    """
+    Writes a snapshot while serving a request that read its data at `started`.
+
+    A snapshot written after `started`, e.g. by an upload that finished while
+    the page rendered, is left alone so older results can't replace it. A
+    failed write is logged rather than failing the request.
+    """
+    path = snapshot_path(env_short_name, view)
+
+    try:
+        if path.exists() and path.stat().st_mtime >= started:
+            return
+
+        write_snapshot(env_short_name, view, html, fingerprint)
+    except OSError as e:
+        logger.warning(f"Unable to write {view} snapshot for {env_short_name}: {e}")
+
+
+def read_snapshot(
+    env_short_name: str, view: str, max_age: float
+) -> Optional[Snapshot]:
+    """
+    Returns the snapshot if it exists and was written less than `max_age` seconds ago
+    """
+    path = snapshot_path(env_short_name, view)
+
+    try:
+        if time.time() - path.stat().st_mtime > max_age:
+            return None
+        header, _, html = path.read_text().partition("\n")
+    except FileNotFoundError:
+        return None
+
+    prefix, suffix = FINGERPRINT_HEADER.rstrip("\n").split("{}")
+
+    if not (header.startswith(prefix) and header.endswith(suffix)):
+        return None
+
+    return Snapshot(html=html, fingerprint=header[len(prefix) : -len(suffix)])
+
+
+def remove_snapshots(env_short_name: str) -> None:
+    env_path = Path(SNAPSHOT_PATH, env_short_name)
+
+    if not env_path.is_dir():
+        return
+
+    for p in env_path.glob("*.html"):
+        p.unlink(missing_ok=True)
@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+from typing import Collection, Dict, List, Set, Tuple
+
+from mysql.connector import MySQLConnection
+
+from src.datadefs import ScoreEntry
+from src.models.judging_scores import load_scoped
+from src.models.judging_tables import TableStyles
+from src.models.score_entries import iter_all
+from src.score_diff import ScoreDiff, diff_scores
+
+# saved scores considered for Brewer of Show alongside the uploaded ones
+BOS_CANDIDATES = 10
+
+
+@dataclass
+class TableScope:
+    table_ids: Set[int]
+    # uploaded entries on the tables
+    entries: List[ScoreEntry]
+    # categories whose places are recalculated
+    categories: Set[str]
+    # saved scores off the tables that are re-placed, by entry id
+    kept: Dict[int, ScoreEntry]
+    bos_candidates: List[ScoreEntry]
+
+    def category_entries(self) -> List[ScoreEntry]:
+        """
+        Every score in the recalculated categories, uploaded and saved
+        """
+        return self.entries + [
+            e for e in self.kept.values() if e.category in self.categories
+        ]
+
+    def scores(self) -> List[ScoreEntry]:
+        """
+        The scores to write back, scores saved on the tables that are not in
+        the upload are removed
+        """
+        return self.entries + list(self.kept.values())
+
+    def entry_ids(self) -> Set[int]:
+        return set(self.kept) | {e.entry_id for e in self.entries}
+
+
+def table_ids_for_numbers(
+    table_styles: List[TableStyles], numbers: Collection[int]
+) -> Tuple[Set[int], List[int]]:
+    """
+    Returns the ids of the judging tables with these numbers, and any numbers
+    that don't match a table
+    """
+    ids_by_number = {int(t.number): t.id for t in table_styles}
+    unknown = sorted(n for n in numbers if n not in ids_by_number)
+    return {ids_by_number[n] for n in numbers if n in ids_by_number}, unknown
+
+
+def load_bos_candidates(
+    cnn: MySQLConnection, exclude_tables: Collection[int], n: int = BOS_CANDIDATES
+) -> List[ScoreEntry]:
+    """
+    Loads the best `n` saved scores off `exclude_tables`.
+
+    Every score tied with the best one is included, so a count-back against
+    it can still be resolved.
+    """
+    while True:
+        top = list(iter_all(cnn, limit=n, exclude_tables=exclude_tables))
+
+        if len(top) < n or top[-1].total_score < top[0].total_score:
+            return top
+
+        n *= 2
+
+
+def load_table_scope(
+    cnn: MySQLConnection, entries: List[ScoreEntry], table_ids: Set[int]
+) -> TableScope:
+    """
+    Loads what is needed to re-place an upload for some judging tables: the
+    saved scores in every category that has a score on the tables, before or
+    after the upload, and the Brewer of Show candidates off the tables
+    """
+    uploaded = [e for e in entries if e.score_table in table_ids]
+    replaced = list(iter_all(cnn, score_tables=table_ids))
+    categories = {e.category for e in uploaded} | {e.category for e in replaced}
+    uploaded_ids = {e.entry_id for e in uploaded}
+
+    kept: Dict[int, ScoreEntry] = {
+        e.entry_id: e
+        for e in iter_all(cnn, categories=categories, exclude_tables=table_ids)
+        if e.entry_id not in uploaded_ids
+    }
+    bos_candidates = list(uploaded)
+
+    for e in load_bos_candidates(cnn, table_ids):
+        if e.entry_id not in uploaded_ids:
+            bos_candidates.append(kept.setdefault(e.entry_id, e))
+
+    return TableScope(
+        table_ids=table_ids,
+        entries=uploaded,
+        categories=categories,
+        kept=kept,
+        bos_candidates=bos_candidates,
+    )
+
+
+def diff_table_scope(cnn: MySQLConnection, scope: TableScope) -> ScoreDiff:
+    """
+    Works out the writes for a table upload.
+
+    Saved rows for every written entry are loaded, not just those on the
+    tables, so an entry whose saved score is on another table (its style was
+    moved) is updated rather than saved twice.
+    """
+    current = load_scoped(cnn, scope.table_ids, scope.entry_ids())
+    return diff_scores(current, scope.scores())
@@ -0,0 +1,123 @@
+import csv
+import io
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional
+
+from src.csv_validate import looks_like_csv, validate_fieldnames
+from src.datadefs import ScoreEntry
+from src.score_process import entries_from_rows
+
+READ_CHUNK_SIZE = 64 * 1024
+SNIFF_SIZE = 1024
+
+
+class IngestError(Exception):
+    pass
+
+
+@dataclass
+class IngestResult:
+    ok: bool = True
+    errors: List[str] = field(default_factory=list)
+    entries: List[ScoreEntry] = field(default_factory=list)
+    spool_path: Optional[Path] = None
+    bytes_read: int = 0
+
+
+class TeeReader(io.RawIOBase):
+    """
+    Raw binary reader that copies every byte it reads from `source` into `sink`
+    """
+
+    def __init__(self, source: BinaryIO, sink: BinaryIO) -> None:
+        self.source = source
+        self.sink = sink
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:  # type: ignore
+        data = self.source.read(len(b))
+        n = len(data)
+        b[:n] = data
+        self.sink.write(data)
+        self.bytes_read += n
+        return n
+
+
+def _read_head(text: io.TextIOBase) -> List[str]:
+    """
+    Reads whole lines until at least SNIFF_SIZE characters are buffered
+    """
+    memo: List[str] = []
+    size = 0
+
+    for line in text:
+        memo.append(line)
+        size += len(line)
+
+        if size >= SNIFF_SIZE:
+            break
+
+    return memo
+
+
+def ingest_upload(stream: BinaryIO, spool_path: Path) -> IngestResult:
+    """
+    Spools an uploaded CSV to `spool_path` while decoding and parsing it.
+
+    The upload is read once, in READ_CHUNK_SIZE blocks: each block is written
+    to disk, decoded as UTF-8 and fed to the CSV reader, so the text is never
+    held in memory. Sniffing and header checks use the first lines of the same
+    pass. On any error the spool file is removed.
+    """
+    res = IngestResult(spool_path=spool_path)
+
+    with open(spool_path, "wb") as sink:
+        tee = TeeReader(stream, sink)
+        text = io.TextIOWrapper(
+            io.BufferedReader(tee, READ_CHUNK_SIZE),
+            encoding="utf-8",
+            errors="strict",
+            newline="",
+        )
+
+        try:
+            res.entries = _parse(text)
+        except IngestError as e:
+            res.errors.append(str(e))
+        except UnicodeDecodeError:
+            res.errors.append("Binary files not supported!")
+
+        res.bytes_read = tee.bytes_read
+
+    if len(res.errors) > 0:
+        res.ok = False
+        res.spool_path = None
+        spool_path.unlink(missing_ok=True)
+
+    return res
+
+
+def _parse(text: io.TextIOWrapper) -> List[ScoreEntry]:
+    head = _read_head(text)
+
+    if not looks_like_csv("".join(head)[:SNIFF_SIZE]):
+        raise IngestError("Does not appear to be a CSV")
+
+    rows: Iterator[str] = chain(head, text)
+    dr = csv.DictReader(rows)
+    vhr = validate_fieldnames(dr.fieldnames)
+
+    if not vhr.ok:
+        raise IngestError(f"Missing required headers: {vhr.missing}")
+
+    try:
+        return entries_from_rows(dr)
+    except UnicodeDecodeError:
+        raise
+    except Exception as e:
+        raise IngestError(f"Error loading CSV: {e}")
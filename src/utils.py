@@ -1,19 +1,21 @@
 from datetime import datetime
-from io import StringIO
 from pathlib import Path
 import time
 from typing import Optional
 from flask import abort, g, redirect, url_for, current_app
 import flask
+from flask.typing import ResponseReturnValue
 from flask_dance.contrib.google import google
 from functools import wraps
 
 import oauthlib
 
 from src import topt
+from src.identity import GoogleUserInfo, resolve_identity
 
 BACKUP_PATH = Path("data/backups").resolve()
 UPLOAD_PATH = Path("data/uploads").resolve()
+SNAPSHOT_PATH = Path("data/snapshots").resolve()
 
 SECONDS_PER_DAY = 86400
 DEFAULT_RETENTION_DAYS = 3 * 365
@@ -44,6 +46,7 @@ def determine_root(env: str) -> Path:
 def ensure_paths_exist() -> None:
     BACKUP_PATH.mkdir(parents=True, exist_ok=True)
     UPLOAD_PATH.mkdir(parents=True, exist_ok=True)
+    SNAPSHOT_PATH.mkdir(parents=True, exist_ok=True)
 
 
 def format_error_message(msg: str, messages: list[str]) -> None:
@@ -72,6 +75,39 @@ def must_have_valid_compenv(f):  # type: ignore
     return decorated
 
 
+def _authorize() -> Optional[ResponseReturnValue]:
+    """
+    Sets `g.user_email` and `g.user_name` for an authorized user, otherwise
+    returns the redirect to log in or aborts
+    """
+    if current_app.config["BYPASS_OAUTH"]:
+        g.user_email = "dev@example.com"
+        g.user_name = "Developer User"
+        return None
+
+    if not google.authorized:
+        return redirect(url_for("google.login"))
+
+    try:
+        identity = resolve_identity(
+            flask.session, GoogleUserInfo(), current_app.config["IDENTITY_CACHE_TTL"]
+        )
+    except oauthlib.oauth2.rfc6749.errors.TokenExpiredError:
+        return redirect(url_for("google.login"))
+
+    authorized = identity.email in current_app.config["AUTHORIZED_USERS"]
+    if not authorized:
+        current_app.logger.error(
+            "access attempt",
+            extra={"user_email": identity.email, "user_name": identity.name},
+        )
+        abort(401)
+
+    g.user_email = identity.email
+    g.user_name = identity.name
+    return None
+
+
 def topt_or_authorized(f):  # type: ignore
     @wraps(f)
     def decorated(*args, **kwargs):  # type: ignore
@@ -92,33 +128,10 @@ def topt_or_authorized(f):  # type: ignore
 
             abort(401, "Link timed out, regenerate from admin section in BCOE&M")
 
-        # FIXME: dedupe code here and in must_be_authorized below which is a straight copy-paste
-        if current_app.config["BYPASS_OAUTH"]:
-            g.user_email = "dev@example.com"
-            g.user_name = "Developer User"
-            return f(*args, **kwargs)
-
-        if not google.authorized:
-            return redirect(url_for("google.login"))
-
-        try:
-            resp = google.get("/oauth2/v1/userinfo")
-        except oauthlib.oauth2.rfc6749.errors.TokenExpiredError:
-            return redirect(url_for("google.login"))
-
-        assert resp.ok, resp.text
-
-        email = resp.json()["email"].lower()
-        user_name = resp.json()["name"]
-        authorized = email in current_app.config["AUTHORIZED_USERS"]
-        if not authorized:
-            current_app.logger.error(
-                "access attempt", extra={"user_email": email, "user_name": user_name}
-            )
-            abort(401)
+        denied = _authorize()
+        if denied is not None:
+            return denied
 
-        g.user_email = email
-        g.user_name = user_name
         return f(*args, **kwargs)
 
     return decorated
@@ -127,32 +140,10 @@ def topt_or_authorized(f):  # type: ignore
 def must_be_authorized(f):  # type: ignore
     @wraps(f)
     def decorated(*args, **kwargs):  # type: ignore
-        if current_app.config["BYPASS_OAUTH"]:
-            g.user_email = "dev@example.com"
-            g.user_name = "Developer User"
-            return f(*args, **kwargs)
-
-        if not google.authorized:
-            return redirect(url_for("google.login"))
-
-        try:
-            resp = google.get("/oauth2/v1/userinfo")
-        except oauthlib.oauth2.rfc6749.errors.TokenExpiredError:
-            return redirect(url_for("google.login"))
-
-        assert resp.ok, resp.text
-
-        email = resp.json()["email"].lower()
-        user_name = resp.json()["name"]
-        authorized = email in current_app.config["AUTHORIZED_USERS"]
-        if not authorized:
-            current_app.logger.error(
-                "access attempt", extra={"user_email": email, "user_name": user_name}
-            )
-            abort(401)
+        denied = _authorize()
+        if denied is not None:
+            return denied
 
-        g.user_email = email
-        g.user_name = user_name
         return f(*args, **kwargs)
 
     return decorated
@@ -168,23 +159,29 @@ def save_backup(
     return data_path
 
 
+def upload_spool_path(env_short_name: str) -> Path:
+    """
+    Path an incoming upload is spooled to before it has been validated
+    """
+    base_filename = f"{time.time()}.{env_short_name}"
+    return Path(UPLOAD_PATH, f"{base_filename}.csv.part")
+
+
 def save_upload(
-    data: StringIO,
+    spool_path: Path,
     user_name: str,
     user_email: str,
-    env_short_name: str,
     remote_addr: Optional[str] = None,
     retain_days: int = DEFAULT_RETENTION_DAYS,
 ) -> str:
     """
-    Saves upload an metadata about uploader.
+    Moves a spooled upload into place and saves metadata about uploader.
     Returns filename.
     """
-    base_filename = f"{time.time()}.{env_short_name}"
-    data_path = Path(UPLOAD_PATH, f"{base_filename}.csv")
+    data_path = spool_path.with_suffix("")
+    base_filename = data_path.name.removesuffix(".csv")
     meta_path = Path(UPLOAD_PATH, f"{base_filename}.meta.txt")
-    data_path.write_text(data.read())
-    data.seek(0)
+    spool_path.rename(data_path)
 
     meta_payload = f"""
 Date: {datetime.now()}
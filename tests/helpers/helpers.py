@@ -1,5 +1,6 @@
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
+import mysql.connector  # type: ignore
 import simplejson as json
 from pytest_snapshot.plugin import Snapshot  # type: ignore
 
@@ -25,3 +26,75 @@ def dict_assert(
 ) -> None:
     _compare_object = pdump(compare_object)
     snapshot.assert_match(_compare_object, snapshot_name)
+
+
+Row = Tuple[Any, ...]
+# answers a statement with the rows it returns, `params` is a tuple of
+# parameter rows for executemany
+Handler = Callable[[str, Tuple], Optional[Sequence[Row]]]
+
+
+class FakeCursor:
+    def __init__(self, cnn: "FakeConnection") -> None:
+        self.cnn = cnn
+        self.rows: List[Row] = []
+
+    def execute(self, sql: str, params: Optional[Sequence[Any]] = None) -> None:
+        self.rows = self.cnn.run(sql, tuple(params or ()))
+
+    def executemany(self, sql: str, seq_params: Sequence[Sequence[Any]]) -> None:
+        self.rows = self.cnn.run(sql, tuple(tuple(p) for p in seq_params))
+
+    def fetchall(self) -> List[Row]:
+        return self.rows
+
+    def fetchone(self) -> Optional[Row]:
+        return self.rows[0] if self.rows else None
+
+    def __iter__(self) -> Iterator[Row]:
+        return iter(self.rows)
+
+
+class FakeConnection:
+    """
+    Stands in for a MySQLConnection.
+
+    Every statement is recorded in `executed` with its whitespace collapsed.
+    Statements return `rows`, or whatever `handler` answers, and raise
+    mysql.connector.Error("denied") if they start with `fail_on`.
+    """
+
+    def __init__(
+        self,
+        rows: Sequence[Row] = (),
+        handler: Optional[Handler] = None,
+        fail_on: Optional[str] = None,
+    ) -> None:
+        self.rows = list(rows)
+        self.handler = handler
+        self.fail_on = fail_on
+        self.executed: List[Tuple[str, Tuple]] = []
+
+    def run(self, sql: str, params: Tuple) -> List[Row]:
+        sql = " ".join(sql.split())
+        self.executed.append((sql, params))
+
+        if self.fail_on is not None and sql.startswith(self.fail_on):
+            raise mysql.connector.Error("denied")
+
+        if self.handler is not None:
+            return list(self.handler(sql, params) or [])
+
+        return self.rows
+
+    def statements(self) -> List[str]:
+        return [sql for sql, _ in self.executed]
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+    def commit(self) -> None:
+        self.executed.append(("COMMIT", ()))
+
+    def rollback(self) -> None:
+        self.executed.append(("ROLLBACK", ()))
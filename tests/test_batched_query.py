@@ -0,0 +1,45 @@
+from typing import List, Tuple
+
+from src.batched_query import chunked, select_in_chunks
+from tests.helpers.helpers import FakeConnection
+
+
+def times_ten(sql: str, params: Tuple) -> List[Tuple]:
+    return [(p, p * 10) for p in params]
+
+
+def test_chunked() -> None:
+    assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+    assert list(chunked([], 2)) == []
+
+
+def test_select_in_chunks_dedupes_and_chunks() -> None:
+    cnn = FakeConnection(handler=times_ten)
+    sql = "SELECT id, x FROM t WHERE id IN ({keys})"
+
+    rows = list(select_in_chunks(cnn, sql, [5, 1, 3, 1, 2, 4, 5], chunk_size=2))  # type: ignore
+
+    assert rows == [(1, 10), (2, 20), (3, 30), (4, 40), (5, 50)]
+    assert cnn.executed == [
+        ("SELECT id, x FROM t WHERE id IN (%s, %s)", (1, 2)),
+        ("SELECT id, x FROM t WHERE id IN (%s, %s)", (3, 4)),
+        ("SELECT id, x FROM t WHERE id IN (%s)", (5,)),
+    ]
+
+
+def test_select_in_chunks_no_keys_no_queries() -> None:
+    cnn = FakeConnection()
+
+    assert list(select_in_chunks(cnn, "SELECT {keys}", [])) == []  # type: ignore
+    assert cnn.executed == []
+
+
+def test_select_in_chunks_row_constructor() -> None:
+    cnn = FakeConnection()
+    sql = "SELECT * FROM t WHERE (a, b) IN ({keys}) AND c = %s"
+
+    list(select_in_chunks(cnn, sql, [("2", "01"), ("1", "02")], params=(1,)))  # type: ignore
+
+    assert cnn.executed == [
+        ("SELECT * FROM t WHERE (a, b) IN ((%s, %s), (%s, %s)) AND c = %s", ("1", "02", "2", "01", 1)),
+    ]
@@ -0,0 +1,57 @@
+from typing import List
+
+from src.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_hit_miss_and_ttl() -> None:
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache("test", max_entries=4, ttl=10, clock=clock)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    clock.now = 10
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.expired, stats.size) == (1, 2, 1, 0)
+
+
+def test_lru_eviction() -> None:
+    cache: TTLCache[str, int] = TTLCache("test", max_entries=2, ttl=10, clock=FakeClock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats().evictions == 1
+
+
+def test_get_or_set_and_invalidate() -> None:
+    cache: TTLCache[tuple, str] = TTLCache("test", max_entries=8, ttl=10, clock=FakeClock())
+    calls: List[str] = []
+
+    def render() -> str:
+        calls.append("render")
+        return "page"
+
+    assert cache.get_or_set(("test", "v1"), render) == "page"
+    assert cache.get_or_set(("test", "v1"), render) == "page"
+    cache.set(("prod", "v1"), "other")
+    assert calls == ["render"]
+
+    assert cache.invalidate(lambda k: k[0] == "test") == 1
+    assert cache.get(("prod", "v1")) == "other"
+    assert cache.stats().invalidations == 1
@@ -0,0 +1,41 @@
+from typing import List, Tuple
+
+from src.models.data_version import RESULT_SOURCES, DataSources, data_fingerprint
+from tests.helpers.helpers import FakeConnection
+
+
+def result_db(scored_rows: Tuple[int, int]) -> FakeConnection:
+    def handler(sql: str, params: Tuple) -> List[Tuple]:
+        if sql.startswith("CHECKSUM TABLE"):
+            return [(table, i) for i, table in enumerate(RESULT_SOURCES.tables)]
+
+        return [scored_rows]
+
+    return FakeConnection(handler=handler)
+
+
+def test_large_tables_are_not_checksummed() -> None:
+    cnn = result_db((10, 1234))
+
+    data_fingerprint(cnn, RESULT_SOURCES)  # type: ignore
+
+    checksummed = [sql for sql in cnn.statements() if sql.startswith("CHECKSUM")]
+    assert checksummed == ["CHECKSUM TABLE judging_scores, special_best_data, judging_tables;"]
+
+
+def test_fingerprint_changes_with_shown_rows() -> None:
+    before = data_fingerprint(result_db((10, 1234)), RESULT_SOURCES)  # type: ignore
+
+    assert data_fingerprint(result_db((10, 1234)), RESULT_SOURCES) == before  # type: ignore
+    # a brewer renamed on a scored entry
+    assert data_fingerprint(result_db((10, 4321)), RESULT_SOURCES) != before  # type: ignore
+    # a score added
+    assert data_fingerprint(result_db((11, 1234)), RESULT_SOURCES) != before  # type: ignore
+
+
+def test_sources_without_tables_only_run_row_queries() -> None:
+    cnn = FakeConnection(rows=[(0, 0)])
+
+    data_fingerprint(cnn, DataSources(tables=[], row_queries=["SELECT 1"]))  # type: ignore
+
+    assert cnn.statements() == ["SELECT 1"]
@@ -1,6 +1,10 @@
+import os
+import shutil
+from pathlib import Path
+
 from pytest_snapshot.plugin import Snapshot  # type: ignore
 
-from src.db import extract_db_config
+from src.db import extract_db_config, load_db_config
 from tests.helpers.helpers import dict_assert
 
 
@@ -12,3 +16,18 @@ def test_get_config(snapshot: Snapshot) -> None:
     actual = extract_db_config('./tests/fixtures/extract_db_config_mysql_fn.php')
     
     dict_assert(snapshot, actual.to_dict(), "test_mysql_fn.json")
+
+
+def test_load_db_config_cached_until_changed(tmp_path: Path) -> None:
+    fp = Path(tmp_path, "config.php")
+    shutil.copy("./tests/fixtures/extract_db_config.php", fp)
+
+    first = load_db_config(str(fp))
+    assert load_db_config(str(fp)) is first
+
+    fp.write_text(fp.read_text().replace('"localhost"', '"db.example.com"'))
+    os.utime(fp, ns=(0, fp.stat().st_mtime_ns + 1_000_000))
+
+    changed = load_db_config(str(fp))
+    assert changed is not first
+    assert changed.host == "db.example.com"
@@ -0,0 +1,84 @@
+import threading
+import time
+from typing import List
+
+import pytest
+
+from src.datadefs import DBConfig
+from src.db_pool import ConnectionPool, PoolExhaustedError
+
+DB_CONFIG = DBConfig(user="u", password="p", host="localhost", database="db", port=3306)
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.closed = False
+        self.rollbacks = 0
+        self.fail_rollback = False
+
+    def rollback(self) -> None:
+        if self.fail_rollback:
+            raise RuntimeError("connection lost")
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def make_pool(size: int = 2, idle_timeout: float = 60, checkout_timeout: float = 0.05) -> ConnectionPool:
+    created: List[FakeConnection] = []
+
+    def connect(db_config: DBConfig) -> FakeConnection:
+        cnn = FakeConnection()
+        created.append(cnn)
+        return cnn
+
+    return ConnectionPool(DB_CONFIG, size, idle_timeout, checkout_timeout, connect=connect)  # type: ignore
+
+
+def test_reuses_released_connection() -> None:
+    pool = make_pool()
+
+    cnn = pool.checkout()
+    pool.release(cnn)
+
+    assert pool.checkout() is cnn
+    m = pool.metrics()
+    assert (m.created, m.reused, m.checked_out) == (1, 1, 1)
+    assert cnn.rollbacks == 1  # type: ignore
+
+
+def test_blocks_then_times_out_when_exhausted() -> None:
+    pool = make_pool(size=1)
+    pool.checkout()
+
+    with pytest.raises(PoolExhaustedError):
+        pool.checkout()
+
+    m = pool.metrics()
+    assert (m.waits, m.timeouts) == (1, 1)
+
+
+def test_waiting_checkout_gets_released_connection() -> None:
+    pool = make_pool(size=1, checkout_timeout=5)
+    cnn = pool.checkout()
+    threading.Timer(0.05, pool.release, args=(cnn,)).start()
+
+    assert pool.checkout() is cnn
+
+
+def test_idle_timeout_and_failed_rollback_discard() -> None:
+    pool = make_pool(idle_timeout=0.01)
+    cnn = pool.checkout()
+    pool.release(cnn)
+    time.sleep(0.02)
+
+    fresh = pool.checkout()
+    assert fresh is not cnn
+    assert cnn.closed  # type: ignore
+
+    fresh.fail_rollback = True  # type: ignore
+    pool.release(fresh)
+
+    m = pool.metrics()
+    assert (m.created, m.discarded, m.idle, m.checked_out) == (2, 2, 0, 0)
@@ -0,0 +1,77 @@
+from typing import Any, Dict, Optional
+
+from src.identity import SESSION_KEY, resolve_identity
+
+
+class FakeProvider:
+    def __init__(self, access_token: str = "t1") -> None:
+        self.access_token = access_token
+        self.expires_at: Optional[float] = None
+        self.calls = 0
+
+    def token(self) -> Optional[Dict[str, Any]]:
+        return {"access_token": self.access_token, "expires_at": self.expires_at}
+
+    def userinfo(self) -> Dict[str, Any]:
+        self.calls += 1
+        return {"email": "Judge@Example.com", "name": f"Judge {self.calls}"}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_reuses_identity_until_ttl() -> None:
+    session: Dict[str, Any] = {}
+    provider = FakeProvider()
+    clock = FakeClock()
+
+    first = resolve_identity(session, provider, ttl=60, clock=clock)
+    clock.now += 59
+    second = resolve_identity(session, provider, ttl=60, clock=clock)
+
+    assert (first.email, first.name) == ("judge@example.com", "Judge 1")
+    assert second == first
+    assert provider.calls == 1
+
+    clock.now += 1
+    assert resolve_identity(session, provider, ttl=60, clock=clock).name == "Judge 2"
+
+
+def test_new_token_revalidates() -> None:
+    session: Dict[str, Any] = {}
+    provider = FakeProvider()
+    clock = FakeClock()
+
+    resolve_identity(session, provider, ttl=60, clock=clock)
+    provider.access_token = "t2"
+    resolve_identity(session, provider, ttl=60, clock=clock)
+    resolve_identity(session, provider, ttl=60, clock=clock)
+
+    assert provider.calls == 2
+
+
+def test_expired_token_is_not_trusted() -> None:
+    session: Dict[str, Any] = {}
+    provider = FakeProvider()
+    clock = FakeClock()
+
+    resolve_identity(session, provider, ttl=60, clock=clock)
+    provider.expires_at = clock.now
+    resolve_identity(session, provider, ttl=60, clock=clock)
+
+    assert provider.calls == 2
+
+
+def test_unreadable_session_entry_is_replaced() -> None:
+    session: Dict[str, Any] = {SESSION_KEY: {"email": "old@example.com"}}
+    provider = FakeProvider()
+
+    identity = resolve_identity(session, provider, ttl=60, clock=FakeClock())
+
+    assert identity.email == "judge@example.com"
+    assert session[SESSION_KEY]["email"] == "judge@example.com"
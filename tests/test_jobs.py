@@ -0,0 +1,149 @@
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from src.jobs import JobLog, JobRunner, JobStatus, JobStore
+
+
+def wait_for(store: JobStore, job_id: str) -> None:
+    for _ in range(500):
+        job = store.get(job_id)
+        if job is not None and job.is_finished:
+            return
+        threading.Event().wait(0.01)
+
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_runs_job_and_keeps_message_log(tmp_path: Path) -> None:
+    runner = JobRunner(JobStore(tmp_path / "jobs.sqlite"))
+
+    def job(log: JobLog) -> bool:
+        log("one")
+        log("two")
+        return True
+
+    submitted = runner.submit("test", "upload", job, "a@example.com", ["zero"])
+    wait_for(runner.store, submitted.id)
+    runner.shutdown()
+
+    job_after = runner.store.get(submitted.id)
+    assert job_after is not None
+    assert job_after.status == JobStatus.SUCCEEDED
+    assert job_after.finished is not None
+    assert runner.store.messages(submitted.id) == ["zero", "one", "two"]
+    assert runner.store.messages(submitted.id, after=2) == ["two"]
+
+
+def test_failed_and_raising_jobs(tmp_path: Path) -> None:
+    runner = JobRunner(JobStore(tmp_path / "jobs.sqlite"))
+
+    def raises(log: JobLog) -> bool:
+        raise ValueError("boom")
+
+    failed = runner.submit("test", "upload", lambda log: False)
+    raised = runner.submit("prod", "upload", raises)
+    runner.shutdown()
+
+    assert runner.store.get(failed.id).status == JobStatus.FAILED  # type: ignore
+    assert runner.store.get(raised.id).status == JobStatus.FAILED  # type: ignore
+    assert runner.store.messages(raised.id) == ["Job failed: boom"]
+
+
+def test_same_env_runs_in_order_other_envs_in_parallel(tmp_path: Path) -> None:
+    runner = JobRunner(JobStore(tmp_path / "jobs.sqlite"), max_workers=2)
+    release = threading.Event()
+    order: List[str] = []
+
+    def blocking(log: JobLog) -> bool:
+        release.wait(5)
+        order.append("test 1")
+        return True
+
+    def second(log: JobLog) -> bool:
+        order.append("test 2")
+        return True
+
+    def other_env(log: JobLog) -> bool:
+        order.append("prod")
+        return True
+
+    first = runner.submit("test", "upload", blocking)
+    queued = runner.submit("test", "upload", second)
+    other = runner.submit("prod", "upload", other_env)
+
+    wait_for(runner.store, other.id)
+    assert runner.store.get(queued.id).status == JobStatus.QUEUED  # type: ignore
+
+    release.set()
+    runner.shutdown()
+
+    assert order == ["prod", "test 1", "test 2"]
+    assert runner.store.get(first.id).status == JobStatus.SUCCEEDED  # type: ignore
+
+
+def test_interrupt_stale_leaves_live_jobs(tmp_path: Path) -> None:
+    store = JobStore(tmp_path / "jobs.sqlite")
+    queued = store.create("test", "upload", None)
+    running = store.create("test", "upload", None)
+    store.set_status(running.id, JobStatus.RUNNING)
+    live = store.create("prod", "upload", None)
+
+    time.sleep(0.05)
+    store.heartbeat([live.id])
+
+    assert JobStore(tmp_path / "jobs.sqlite").interrupt_stale(stale_after=0.03) == 2
+    assert store.get(queued.id).status == JobStatus.INTERRUPTED  # type: ignore
+    assert store.get(running.id).is_finished  # type: ignore
+    assert store.get(live.id).status == JobStatus.QUEUED  # type: ignore
+
+
+def test_claim_keeps_environment_order(tmp_path: Path) -> None:
+    store = JobStore(tmp_path / "jobs.sqlite")
+    first = store.create("test", "upload", None)
+    second = store.create("test", "upload", None)
+    other = store.create("prod", "upload", None)
+
+    assert not store.claim(second.id)
+    assert store.claim(other.id)
+    assert store.claim(first.id)
+    assert not store.claim(first.id)
+    assert not store.claim(second.id)
+
+    store.set_status(first.id, JobStatus.SUCCEEDED)
+    assert store.claim(second.id)
+
+
+def test_processes_sharing_a_store_run_an_environment_in_order(tmp_path: Path) -> None:
+    # two runners on one store stand in for two server processes
+    runner_a = JobRunner(JobStore(tmp_path / "jobs.sqlite"), heartbeat_interval=0.01)
+    runner_b = JobRunner(JobStore(tmp_path / "jobs.sqlite"), heartbeat_interval=0.01)
+    release = threading.Event()
+    order: List[str] = []
+
+    def blocking(log: JobLog) -> bool:
+        release.wait(5)
+        order.append("a")
+        return True
+
+    def second(log: JobLog) -> bool:
+        order.append("b")
+        return True
+
+    first = runner_a.submit("test", "upload", blocking)
+    queued = runner_b.submit("test", "upload", second)
+    time.sleep(0.1)
+
+    assert runner_b.store.get(queued.id).status == JobStatus.QUEUED  # type: ignore
+    # neither process treats the other's live jobs as stale
+    assert runner_b.store.interrupt_stale(stale_after=0.05) == 0
+
+    release.set()
+    wait_for(runner_b.store, queued.id)
+    runner_a.shutdown()
+    runner_b.shutdown()
+
+    assert order == ["a", "b"]
+    assert runner_a.store.get(first.id).status == JobStatus.SUCCEEDED  # type: ignore
+    assert runner_b.store.get(queued.id).status == JobStatus.SUCCEEDED  # type: ignore
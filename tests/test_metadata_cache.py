@@ -0,0 +1,61 @@
+from typing import Any, Iterator, List, cast
+
+import pytest
+from mysql.connector import MySQLConnection
+
+from src import metadata_cache
+from src.metadata_cache import EnvMetadata
+from tests.helpers.helpers import FakeConnection
+
+CNN = cast(MySQLConnection, FakeConnection())
+
+
+@pytest.fixture
+def loads(monkeypatch: pytest.MonkeyPatch) -> Iterator[List[Any]]:
+    calls: List[Any] = []
+
+    def fake_get_sponsors(cnn: Any) -> List[str]:
+        calls.append(cnn)
+        return [f"sponsor {len(calls)}"]
+
+    monkeypatch.setattr(metadata_cache, "get_sponsors", fake_get_sponsors)
+    metadata_cache.purge()
+    yield calls
+    metadata_cache.purge()
+
+
+def test_loads_once_per_environment(loads: List[Any]) -> None:
+    assert EnvMetadata(CNN, "a").sponsors() == ["sponsor 1"]
+    assert EnvMetadata(CNN, "a").sponsors() == ["sponsor 1"]
+    assert EnvMetadata(CNN, "b").sponsors() == ["sponsor 2"]
+    assert len(loads) == 2
+
+
+def test_without_environment_always_loads(loads: List[Any]) -> None:
+    EnvMetadata(CNN, None).sponsors()
+    EnvMetadata(CNN, None).sponsors()
+    assert len(loads) == 2
+
+
+def test_purge_one_environment(loads: List[Any]) -> None:
+    EnvMetadata(CNN, "a").sponsors()
+    EnvMetadata(CNN, "b").sponsors()
+
+    assert metadata_cache.purge("a") == 1
+    assert EnvMetadata(CNN, "a").sponsors() == ["sponsor 3"]
+    assert EnvMetadata(CNN, "b").sponsors() == ["sponsor 2"]
+
+
+def test_purge_changes_versioned_fingerprint(loads: List[Any]) -> None:
+    before = metadata_cache.versioned("abc")
+    metadata_cache.purge("a")
+
+    assert metadata_cache.versioned("abc") != before
+    assert metadata_cache.versioned("abc").startswith("abc.")
+
+
+def test_new_data_version_loads_again(loads: List[Any]) -> None:
+    assert EnvMetadata(CNN, "a", "v1").sponsors() == ["sponsor 1"]
+    assert EnvMetadata(CNN, "a", "v1").sponsors() == ["sponsor 1"]
+    # e.g. a sponsor was edited, changing the page fingerprint
+    assert EnvMetadata(CNN, "a", "v2").sponsors() == ["sponsor 2"]
@@ -0,0 +1,146 @@
+from src.datadefs import CountbackStatus, CountbackStatusRec, ScoreEntry
+from src.place_getter import determine_place_getters, group_by_category
+from src.ranking import rank_entries
+
+
+def make_entry(
+    entry_id: int,
+    total_score: float,
+    overall: float = 5,
+    flavour: float = 10,
+    score_spread: float = 2,
+    category: str = "10",
+) -> ScoreEntry:
+    return ScoreEntry(
+        entry_id=entry_id,
+        category=category,
+        sub_category="01",
+        total_score=total_score,
+        aroma=8,
+        appearance=2,
+        flavour=flavour,
+        body=3,
+        overall=overall,
+        score_spread=score_spread,
+    )
+
+
+def test_rank_entries_orders_by_total_then_countback() -> None:
+    entries = [
+        make_entry(1, 30),
+        make_entry(2, 40),
+        make_entry(3, 40, overall=6),
+        make_entry(4, 40, overall=6, flavour=11),
+        make_entry(5, 40, overall=6, flavour=11, score_spread=1),
+    ]
+
+    rank_entries(entries)
+
+    assert [e.entry_id for e in entries] == [5, 4, 3, 2, 1]
+
+
+def test_rank_entries_records_countback_between_neighbours() -> None:
+    a = make_entry(1, 40, overall=6)
+    b = make_entry(2, 40, overall=5)
+    c = make_entry(3, 40, overall=5, score_spread=3)
+    d = make_entry(4, 20)
+    entries = [d, c, b, a]
+
+    rank_entries(entries)
+
+    assert a.countback_status == {
+        CountbackStatusRec(CountbackStatus.OVERALL_IMPRESSION, 2)
+    }
+    assert b.countback_status == {
+        CountbackStatusRec(CountbackStatus.OVERALL_IMPRESSION, 1),
+        CountbackStatusRec(CountbackStatus.SMALLEST_SCORE_SPREAD, 3),
+    }
+    assert c.countback_status == {
+        CountbackStatusRec(CountbackStatus.SMALLEST_SCORE_SPREAD, 2)
+    }
+    assert d.countback_status == set()
+
+    # ranking again does not add anything new
+    rank_entries(entries)
+    assert len(b.countback_status) == 2
+
+
+def test_determine_place_getters_recall_judges() -> None:
+    entries = [
+        make_entry(1, 40),
+        make_entry(2, 40),
+        make_entry(3, 35),
+        make_entry(4, 30),
+    ]
+
+    res = determine_place_getters(entries, 3)
+
+    assert not res.success
+    assert entries[0].entry_id == 1
+    assert CountbackStatusRec(CountbackStatus.RECALL_JUDGES, 2) in entries[0].countback_status
+
+
+def test_determine_place_getters_recall_judges_leaves_lower_entry_unplaced() -> None:
+    entries = [make_entry(1, 40), make_entry(2, 40), make_entry(3, 35), make_entry(4, 30)]
+
+    res = determine_place_getters(entries, 3)
+
+    assert not res.success
+    # the lower tied entry's place is skipped, as before count-backs were sped up
+    assert [(p.entry_id, p.score_place) for p in res.place_getters] == [(1, 1), (3, 3), (4, 4)]
+    assert entries[1].score_place is None
+
+
+def test_determine_place_getters_simple() -> None:
+    entries = [make_entry(1, 30), make_entry(2, 40), make_entry(3, 35), make_entry(4, 20)]
+
+    res = determine_place_getters(entries, 3)
+
+    assert res.success
+    assert [(p.entry_id, p.score_place) for p in res.place_getters] == [(2, 1), (3, 2), (1, 3)]
+
+
+def test_determine_place_getters_leaves_candidate_order() -> None:
+    entries = [make_entry(i, float(i % 7), overall=float(i)) for i in range(1, 50)]
+    expected = sorted(entries, key=lambda e: (e.total_score, e.overall, -e.score_spread), reverse=True)
+
+    res = determine_place_getters(entries, 3)
+
+    assert [e.entry_id for e in entries] == list(range(1, 50))
+    assert res.success
+    assert res.place_getters == expected[:3]
+
+
+def test_determine_place_getters_ignores_ties_from_other_categories() -> None:
+    entries = [
+        make_entry(1, 40, category="1"),
+        make_entry(2, 35, category="1"),
+        make_entry(3, 30, category="1"),
+        make_entry(4, 40, category="5"),
+        make_entry(5, 20, category="5"),
+    ]
+
+    # Brewer of Show over every entry leaves an exact tie between 1 and 4
+    assert not determine_place_getters(entries, 1).success
+
+    for entry in entries:
+        entry.score_place = None
+
+    results = {
+        category: determine_place_getters(group, 3)
+        for category, group in group_by_category(entries).items()
+    }
+
+    assert all(res.success for res in results.values())
+    assert [(p.entry_id, p.score_place) for p in results["1"].place_getters] == [(1, 1), (2, 2), (3, 3)]
+    assert [(p.entry_id, p.score_place) for p in results["5"].place_getters] == [(4, 1), (5, 2)]
+    # the Brewer of Show countback is still shown
+    assert CountbackStatusRec(CountbackStatus.RECALL_JUDGES, 4) in entries[0].countback_status
+
+
+def test_group_by_category() -> None:
+    entries = [make_entry(1, 30, category="10"), make_entry(2, 30, category="11"), make_entry(3, 40, category="10")]
+
+    groups = group_by_category(entries)
+
+    assert {k: [e.entry_id for e in v] for k, v in groups.items()} == {"10": [1, 3], "11": [2]}
@@ -0,0 +1,58 @@
+from src import constants
+from src.datadefs import CountbackStatus, CountbackStatusRec, ScopedScoreEntry, ScoreEntry
+from src.models.brewers import Brewer
+from src.report_model import build_report_model, scope_countbacks
+
+
+def make_entry(entry_id: int, total_score: float, score_place: int | None, club: str | None) -> ScoreEntry:
+    return ScoreEntry(
+        entry_id=entry_id,
+        category="10",
+        sub_category="01",
+        total_score=total_score,
+        aroma=8,
+        appearance=2,
+        flavour=10,
+        body=3,
+        overall=5,
+        score_spread=2,
+        score_place=score_place,
+        brewer=Brewer(id=entry_id, uid=entry_id, last_name="L", first_name="F", club=club),
+    )
+
+
+def test_scope_countbacks_keeps_only_placegetter_conflicts() -> None:
+    first = make_entry(1, 40, 1, None)
+    first.countback_status = {
+        CountbackStatusRec(CountbackStatus.FLAVOUR, 2),
+        CountbackStatusRec(CountbackStatus.FLAVOUR, 99),
+    }
+    second = make_entry(2, 40, 2, None)
+
+    scoped = scope_countbacks([first, second])
+
+    assert isinstance(scoped[0], ScopedScoreEntry)
+    assert scoped[0].countback_status == {CountbackStatusRec(CountbackStatus.FLAVOUR, 2)}
+    assert scoped[0].total_score == 40
+    # the underlying entry is untouched
+    assert len(first.countback_status) == 2
+
+
+def test_build_report_model() -> None:
+    entries = [
+        make_entry(1, 30, None, "  "),
+        make_entry(2, 45, 1, "Westgate"),
+        make_entry(3, 40, 2, "none"),
+    ]
+
+    model = build_report_model(entries, {constants.BREWER_OF_SHOW: 2, constants.BEST_NOVICE: 404}, True)
+
+    bos, novice, porter = model.placegetter_display_infos[:3]
+    assert [e.entry_id for e in bos.entries] == [2]
+    assert list(novice.entries) == []
+    assert [e.entry_id for e in porter.entries] == [2, 3]
+    # full results report their size up front and are ranked when iterated
+    assert len(model.all_results_display_infos[0].entries) == 3
+    assert [e.entry_id for e in model.all_results_display_infos[0].entries] == [2, 3, 1]
+    assert [c.name for c in model.club_of_show_list] == ["Westgate"]
+    assert entries[0].brewer is not None and entries[0].brewer.club is None
@@ -0,0 +1,140 @@
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+from flask import Flask
+
+from src import result_cache, snapshots
+from src.controllers import all_results
+from src.controllers.helpers import capture_stream, conditional_response
+
+
+def test_conditional_response_skips_render_when_not_modified() -> None:
+    app = Flask(__name__)
+    renders = []
+
+    def render() -> str:
+        renders.append(1)
+        return "<p>results</p>"
+
+    with app.test_request_context():
+        response = conditional_response("all_results", "abc", render)
+        etag, _ = response.get_etag()
+        assert response.status_code == 200
+        assert etag == "all_results-abc"
+
+    with app.test_request_context(headers={"If-None-Match": f'"{etag}"'}):
+        response = conditional_response("all_results", "abc", render)
+        assert response.status_code == 304
+
+    with app.test_request_context(headers={"If-None-Match": f'"{etag}"'}):
+        response = conditional_response("all_results", "def", render)
+        assert response.status_code == 200
+
+    assert len(renders) == 2
+
+
+def test_snapshot_keeps_fingerprint(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(snapshots, "SNAPSHOT_PATH", tmp_path)
+
+    snapshots.write_snapshot("test", "all_results", "<p>results</p>\n", "abc")
+    snapshot = snapshots.read_snapshot("test", "all_results", max_age=60)
+
+    assert snapshot is not None
+    assert snapshot.html == "<p>results</p>\n"
+    assert snapshot.fingerprint == "abc"
+    assert snapshots.read_snapshot("test", "all_results", max_age=-1) is None
+
+
+def test_concurrent_snapshot_writes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(snapshots, "SNAPSHOT_PATH", tmp_path)
+    errors: List[Exception] = []
+
+    def write(i: int) -> None:
+        try:
+            for _ in range(50):
+                snapshots.write_snapshot("test", "all_results", f"<p>{i}</p>", str(i))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    snapshot = snapshots.read_snapshot("test", "all_results", max_age=60)
+    assert snapshot is not None
+    assert snapshot.html == f"<p>{snapshot.fingerprint}</p>"
+    assert [p.name for p in (tmp_path / "test").iterdir()] == ["all_results.html"]
+
+
+def test_failed_snapshot_refresh_is_not_raised(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # a file where the environment's directory should be
+    (tmp_path / "test").write_text("")
+    monkeypatch.setattr(snapshots, "SNAPSHOT_PATH", tmp_path)
+
+    snapshots.refresh_snapshot("test", "all_results", "<p>results</p>", "abc", time.time())
+
+    assert (tmp_path / "test").is_file()
+
+
+def test_refresh_keeps_snapshot_written_after_render_started(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(snapshots, "SNAPSHOT_PATH", tmp_path)
+    started = time.time() - 1
+    # an upload finishing while the page rendered
+    snapshots.write_snapshot("test", "all_results", "<p>new</p>", "new")
+
+    snapshots.refresh_snapshot("test", "all_results", "<p>old</p>", "old", started)
+
+    snapshot = snapshots.read_snapshot("test", "all_results", max_age=60)
+    assert snapshot is not None
+    assert snapshot.fingerprint == "new"
+
+    snapshots.refresh_snapshot("test", "all_results", "<p>newer</p>", "newer", time.time() + 1)
+
+    assert snapshots.read_snapshot("test", "all_results", max_age=60).fingerprint == "newer"  # type: ignore
+
+
+def test_capture_stream_only_completes_when_fully_sent() -> None:
+    pages: List[str] = []
+
+    assert list(capture_stream(iter(["<p>", "results", "</p>"]), pages.append)) == [
+        "<p>",
+        "results",
+        "</p>",
+    ]
+    assert pages == ["<p>results</p>"]
+
+    partial = capture_stream(iter(["<p>", "results", "</p>"]), pages.append)
+    next(partial)
+    partial.close()
+    assert pages == ["<p>results</p>"]
+
+
+def test_result_cache_hit_refreshes_snapshot(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(snapshots, "SNAPSHOT_PATH", tmp_path)
+    monkeypatch.setattr(all_results, "db_config_for_env_shortname", lambda *args: None)
+    monkeypatch.setattr(all_results, "get_db_connection", lambda config: "cnn")
+    monkeypatch.setattr(all_results, "data_fingerprint", lambda cnn, sources: "abc")
+    result_cache.invalidate("test")
+    result_cache.put("test", snapshots.ALL_RESULTS_VIEW, "abc", "<p>cached</p>")
+
+    app = Flask(__name__)
+    app.config["BCOME_ENV_CHOICES"] = [("test", "Test")]
+    app.config["SNAPSHOT_MAX_AGE"] = 60
+
+    with app.test_request_context("/?comp_env=test"):
+        response = all_results.show()
+
+    assert response.get_data(as_text=True) == "<p>cached</p>"  # type: ignore
+    snapshot = snapshots.read_snapshot("test", snapshots.ALL_RESULTS_VIEW, max_age=60)
+    assert snapshot is not None
+    assert snapshot.html == "<p>cached</p>"
+    assert snapshot.fingerprint == "abc"
+    result_cache.invalidate("test")
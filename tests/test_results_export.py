@@ -0,0 +1,44 @@
+import io
+
+from src.datadefs import CountbackStatus, CountbackStatusRec, ScoreEntry
+from src.models.brewers import Brewer
+from src.models.judging_scores import parse_countback
+from src.results_export import iter_csv
+from src.score_process import load_entries_from_csv
+
+
+def test_export_can_be_uploaded_again() -> None:
+    countback = {
+        CountbackStatusRec(CountbackStatus.FLAVOUR, 9),
+        CountbackStatusRec(CountbackStatus.OVERALL_IMPRESSION, 3),
+    }
+    entries = [
+        ScoreEntry(
+            entry_id=i,
+            category="10",
+            sub_category="01",
+            total_score=30 + i,
+            aroma=8,
+            appearance=2,
+            flavour=10 + i,
+            body=3,
+            overall=7,
+            score_spread=2.5,
+            score_place=1 if i == 1 else None,
+            countback_status=countback if i == 1 else set(),
+            brewer=Brewer(id=i, uid=i, last_name="Smith, Jr", first_name="Jo", club="none"),
+        )
+        for i in range(1, 4)
+    ]
+
+    lines = list(iter_csv(entries))
+    assert len(lines) == 4
+
+    reloaded = load_entries_from_csv(io.StringIO("".join(lines)))
+    assert [(e.entry_id, e.total_score, e.flavour, e.score_spread) for e in reloaded] == [
+        (e.entry_id, e.total_score, e.flavour, e.score_spread) for e in entries
+    ]
+
+    first_row = lines[1]
+    assert '"Jo Smith, Jr"' in first_row
+    assert parse_countback(first_row.split('"')[1]) == countback
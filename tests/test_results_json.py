@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from src.datadefs import CountbackStatus, CountbackStatusRec, ScoreEntry
+from src.models.brewers import Brewer
+from src.report_model import ClubOfShowCandidate
+from src.results_json import (
+    DEFAULT_SCORE_FIELDS,
+    club_to_dict,
+    dumps,
+    parse_fields,
+    score_to_dict,
+)
+
+
+def test_parse_fields() -> None:
+    assert parse_fields(None) == DEFAULT_SCORE_FIELDS
+    assert parse_fields("entry_id, place,") == ["entry_id", "place"]
+
+    with pytest.raises(ValueError):
+        parse_fields("entry_id,password")
+
+
+def test_score_to_dict() -> None:
+    entry = ScoreEntry(
+        entry_id=7,
+        category="10",
+        sub_category="01",
+        total_score=40,
+        aroma=8,
+        appearance=2,
+        flavour=17,
+        body=4,
+        overall=9,
+        score_spread=2,
+        score_place=1,
+        countback_status={CountbackStatusRec(CountbackStatus.FLAVOUR, 9)},
+        brewer=Brewer(id=1, uid=1, last_name="Smith", first_name="Jo", club=" none "),
+    )
+
+    assert score_to_dict(entry, ["entry_id", "place", "countback", "brewer", "club"]) == {
+        "entry_id": 7,
+        "place": 1,
+        "countback": ["FLAVOUR vs 9"],
+        "brewer": "Jo Smith",
+        "club": None,
+    }
+
+
+def test_club_to_dict_is_compact() -> None:
+    club = ClubOfShowCandidate(name="Westgate", firsts_count=2, thirds_count=1, member_average_score=35.125, entry_count=4)
+
+    payload = dumps({"clubs": [club_to_dict(club, 1)]})
+
+    assert " " not in payload
+    assert json.loads(payload)["clubs"][0] == {
+        "place": 1,
+        "club": "Westgate",
+        "firsts": 2,
+        "seconds": 0,
+        "thirds": 1,
+        "score": 7,
+        "average_score": 35.12,
+        "entry_count": 4,
+    }
@@ -0,0 +1,122 @@
+from typing import Dict, List, Optional, Tuple
+
+from src.datadefs import CountbackStatus, CountbackStatusRec, ScoreEntry
+from src.models.judging_scores import JudgingScore
+from src.score_diff import apply_diff, diff_scores
+from tests.helpers.helpers import FakeConnection, Handler
+
+
+def entry(entry_id: int, total: float = 30, place: Optional[int] = None) -> ScoreEntry:
+    return ScoreEntry(
+        entry_id=entry_id,
+        category="10",
+        sub_category="01",
+        total_score=total,
+        aroma=8,
+        appearance=2,
+        flavour=12.3,
+        body=3,
+        overall=5,
+        score_spread=2,
+        brewer_id=100,
+        score_table=1,
+        score_place=place,
+    )
+
+
+def saved(id: int, e: ScoreEntry) -> JudgingScore:
+    """The score as read back from the database, FLOAT columns lose precision"""
+    return JudgingScore(
+        id=id,
+        brewer_id=e.brewer_id,  # type: ignore
+        score_table=e.score_table,  # type: ignore
+        entry_id=e.entry_id,
+        total_score=e.total_score,
+        aroma=e.aroma,
+        appearance=e.appearance,
+        flavour=12.300000190734863,
+        body=e.body,
+        overall=e.overall,
+        score_spread=e.score_spread,
+        countback_status=None,
+        score_place=e.score_place,
+    )
+
+
+def test_only_changes_are_written() -> None:
+    current = [saved(1, entry(1)), saved(2, entry(2)), saved(3, entry(3)), saved(4, entry(4))]
+    entries = [entry(1), entry(2, total=31), entry(3, place=1), entry(5)]
+
+    diff = diff_scores(current, entries)
+
+    assert [e.entry_id for e in diff.inserts] == [5]
+    assert [(id, e.entry_id) for id, e in diff.updates] == [(2, 2), (3, 3)]
+    assert diff.deletes == [4]
+    assert diff.unchanged == 1
+    assert diff.summary() == "1 new, 2 changed, 1 removed, 1 unchanged"
+
+
+def test_countback_change_is_an_update() -> None:
+    changed = entry(1)
+    changed.countback_status = {CountbackStatusRec(CountbackStatus.FLAVOUR, 2)}
+
+    diff = diff_scores([saved(1, entry(1))], [changed])
+
+    assert len(diff.updates) == 1
+
+
+def test_duplicate_rows_for_an_entry_are_removed() -> None:
+    diff = diff_scores([saved(7, entry(1)), saved(3, entry(1))], [entry(1)])
+
+    assert diff.unchanged == 1
+    assert diff.deletes == [7]
+
+
+def scores_table(current: List[JudgingScore]) -> Tuple[Dict[int, Tuple], Handler]:
+    """
+    judging_scores as (eid, scoreEntry) keyed on id, and a handler that
+    applies apply_diff's writes to it
+    """
+    table: Dict[int, Tuple] = {s.id: (s.entry_id, s.total_score) for s in current}
+
+    def handler(sql: str, params: Tuple) -> None:
+        if sql.startswith("DELETE"):
+            for id in params:
+                del table[id]
+        elif "ON DUPLICATE KEY" in sql:
+            for id, eid, _bid, _table, total, *_ in params:
+                table[id] = (eid, total)
+        elif sql.startswith("INSERT"):
+            for eid, _bid, _table, total, *_ in params:
+                table[max(table, default=0) + 1] = (eid, total)
+
+    return table, handler
+
+
+def test_apply_diff_batches_each_kind_of_write() -> None:
+    current = [saved(i, entry(i)) for i in range(1, 6)]
+    entries = [entry(i, total=40) for i in range(1, 4)] + [entry(8), entry(9)]
+    table, handler = scores_table(current)
+    cnn = FakeConnection(handler=handler)
+    messages: List[str] = []
+
+    assert apply_diff(cnn, diff_scores(current, entries), messages, chunk_size=2)  # type: ignore
+
+    assert sorted(table.values()) == [(1, 40), (2, 40), (3, 40), (8, 30), (9, 30)]
+    # ids are kept for updated scores
+    assert table[1] == (1, 40)
+    # 2 deletes, 3 updates and 2 inserts in one statement per chunk
+    assert len(cnn.executed) == 5
+    assert cnn.statements()[-1] == "COMMIT"
+    assert messages[-1].startswith("Saved 7 score changes")
+
+
+def test_apply_diff_rolls_back_on_error() -> None:
+    current = [saved(1, entry(1)), saved(2, entry(2))]
+    cnn = FakeConnection(fail_on="INSERT")
+    messages: List[str] = []
+
+    assert not apply_diff(cnn, diff_scores(current, [entry(1, total=40)]), messages)  # type: ignore
+
+    assert cnn.statements()[-1] == "ROLLBACK"
+    assert "Error saving score changes, rolled back: denied" in messages
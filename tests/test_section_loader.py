@@ -0,0 +1,58 @@
+import threading
+import time
+from typing import Any, Callable, List
+
+from src.datadefs import DBConfig
+from src.db_pool import ConnectionPool
+from src.section_loader import load_sections
+
+DB_CONFIG = DBConfig(user="u", password="p", host="localhost", database="db", port=3306)
+
+
+class FakeConnection:
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def slow(value: Any, seen: List[Any]) -> Callable[[Any], Any]:
+    def loader(cnn: Any) -> Any:
+        seen.append(cnn)
+        time.sleep(0.1)
+        return value
+
+    return loader
+
+
+def make_pool(size: int) -> ConnectionPool:
+    return ConnectionPool(DB_CONFIG, size, connect=lambda c: FakeConnection())  # type: ignore
+
+
+def test_sections_run_in_parallel_on_their_own_connections() -> None:
+    pool = make_pool(5)
+    own = pool.checkout()
+    seen: List[Any] = []
+
+    start = time.perf_counter()
+    loaded = load_sections(own, pool, {name: slow(name, seen) for name in "abcd"})
+    elapsed = time.perf_counter() - start
+
+    assert loaded.values == {"a": "a", "b": "b", "c": "c", "d": "d"}
+    assert elapsed < 0.3
+    assert len({id(c) for c in seen}) == 4
+    assert sorted(t.name for t in loaded.timings if t.parallel) == ["a", "b", "c"]
+    assert pool.metrics().checked_out == 1
+
+
+def test_busy_pool_falls_back_to_own_connection() -> None:
+    pool = make_pool(1)
+    own = pool.checkout()
+    seen: List[Any] = []
+
+    loaded = load_sections(own, pool, {name: slow(name, seen) for name in "ab"})
+
+    assert loaded.values == {"a": "a", "b": "b"}
+    assert seen == [own, own]
+    assert not any(t.parallel for t in loaded.timings)
@@ -0,0 +1,22 @@
+from src.models.special_best_data import SpecialBestData, get_all_by_sbi_name
+from tests.helpers.helpers import FakeConnection
+
+
+def test_get_all_by_sbi_name_is_one_query() -> None:
+    cnn = FakeConnection(
+        [
+            ("Brewer of Show", 1, 1, 20, 200, 1),
+            ("Best Novice", 2, 2, 21, 210, 1),
+            ("Brewer of Show", 3, 1, 22, 220, 1),
+            ("Best Lager", 4, 3, 23, 230, 1),
+        ]
+    )
+
+    winners = get_all_by_sbi_name(cnn)  # type: ignore
+
+    assert len(cnn.executed) == 1
+    assert winners == {
+        "Brewer of Show": SpecialBestData(id=1, sid=1, bid=20, eid=200, sbd_place=1),
+        "Best Novice": SpecialBestData(id=2, sid=2, bid=21, eid=210, sbd_place=1),
+        "Best Lager": SpecialBestData(id=4, sid=3, bid=23, eid=230, sbd_place=1),
+    }
@@ -0,0 +1,21 @@
+from src.models.staff import get_summary
+from tests.helpers.helpers import FakeConnection
+
+
+def test_get_summary_keeps_database_order_per_role() -> None:
+    # judge, steward, organizer, staff, brewer id, uid, first, last, club
+    cnn = FakeConnection(
+        [
+            (1, 0, 0, 1, 10, 100, "Al", "Able", None),
+            (0, 1, 0, 0, 11, 101, "Bo", "Baker", None),
+            (1, 1, 1, 0, 12, 102, "Cy", "Cole", "Westgate"),
+        ]
+    )
+
+    summary = get_summary(cnn)  # type: ignore
+
+    assert len(cnn.executed) == 1
+    assert [str(b) for b in summary.judges] == ["Al Able", "Cy Cole"]
+    assert [str(b) for b in summary.stewards] == ["Bo Baker", "Cy Cole"]
+    assert [str(b) for b in summary.organizers] == ["Cy Cole"]
+    assert [str(b) for b in summary.staffs] == ["Al Able"]
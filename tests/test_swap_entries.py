@@ -0,0 +1,92 @@
+from typing import Dict, List, Tuple
+
+from src.datadefs import ScoreEntry
+from src.score_process import swap_in_entries
+from tests.helpers.helpers import FakeConnection
+
+
+class FakeTables:
+    """
+    Just enough of MySQL's table statements to follow a swap, tables hold
+    the entry ids of their rows
+    """
+
+    def __init__(self, **tables: List[int]) -> None:
+        self.tables: Dict[str, List[int]] = dict(tables)
+
+    def __call__(self, sql: str, params: Tuple) -> None:
+        words = sql.replace(",", "").split()
+
+        if sql.startswith("DROP TABLE IF EXISTS"):
+            for name in words[4:]:
+                self.tables.pop(name, None)
+        elif sql.startswith("DROP TABLE"):
+            del self.tables[words[2]]
+        elif sql.startswith("CREATE TABLE"):
+            self.tables[words[2]] = []
+        elif sql.startswith("INSERT INTO"):
+            self.tables[words[2]].extend(row[0] for row in params)
+        elif sql.startswith("RENAME TABLE"):
+            renames = [(words[i], words[i + 2]) for i in range(2, len(words), 3)]
+            moved = {new: self.tables.pop(old) for old, new in renames}
+            self.tables.update(moved)
+
+
+def entry(entry_id: int) -> ScoreEntry:
+    return ScoreEntry(
+        entry_id=entry_id,
+        category="10",
+        sub_category="01",
+        total_score=30,
+        aroma=8,
+        appearance=2,
+        flavour=12,
+        body=3,
+        overall=5,
+        score_spread=2,
+    )
+
+
+def test_loads_staging_table_then_swaps() -> None:
+    db = FakeTables(judging_scores=[7, 8], judging_scores_staging=[9])
+    cnn = FakeConnection(handler=db)
+    messages: List[str] = []
+
+    assert swap_in_entries(cnn, [entry(1), entry(2)], messages, chunk_size=1)  # type: ignore
+
+    # a leftover staging table is not swapped in, the old scores are dropped
+    assert db.tables == {"judging_scores": [1, 2]}
+    assert cnn.statements()[-2].startswith("RENAME TABLE")
+
+
+def test_failed_load_leaves_live_table() -> None:
+    db = FakeTables(judging_scores=[7, 8])
+    cnn = FakeConnection(handler=db, fail_on="INSERT")
+    messages: List[str] = []
+
+    assert not swap_in_entries(cnn, [entry(1)], messages)  # type: ignore
+
+    assert db.tables == {"judging_scores": [7, 8]}
+    assert "ROLLBACK" in cnn.statements()
+
+
+def test_no_create_permission_changes_nothing() -> None:
+    db = FakeTables(judging_scores=[7, 8])
+    cnn = FakeConnection(handler=db, fail_on="CREATE")
+    messages: List[str] = []
+
+    assert not swap_in_entries(cnn, [entry(1)], messages)  # type: ignore
+
+    assert db.tables == {"judging_scores": [7, 8]}
+    assert "Unable to create staging table: denied" in messages
+
+
+def test_failed_retired_table_drop_still_succeeds() -> None:
+    db = FakeTables(judging_scores=[7, 8])
+    cnn = FakeConnection(handler=db, fail_on="DROP TABLE judging_scores_retired")
+    messages: List[str] = []
+
+    assert swap_in_entries(cnn, [entry(1)], messages)  # type: ignore
+
+    assert db.tables == {"judging_scores": [1], "judging_scores_retired": [7, 8]}
+    assert "Warning: unable to drop judging_scores_retired: denied" in messages
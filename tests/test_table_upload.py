@@ -0,0 +1,156 @@
+from typing import Any, Collection, Iterator, List, Optional
+
+import pytest
+
+from src import table_upload
+from src.controllers.upload_scores import confirm_description
+from src.datadefs import ScoreEntry, ScoreWriteMode
+from src.models.judging_scores import JudgingScore
+from src.models.judging_tables import TableStyles
+from src.table_upload import (
+    diff_table_scope,
+    load_bos_candidates,
+    load_table_scope,
+    table_ids_for_numbers,
+)
+
+
+def entry(entry_id: int, category: str, table: int, total: float) -> ScoreEntry:
+    return ScoreEntry(
+        entry_id=entry_id,
+        category=category,
+        sub_category="01",
+        total_score=total,
+        aroma=8,
+        appearance=2,
+        flavour=12,
+        body=3,
+        overall=5,
+        score_spread=2,
+        score_table=table,
+    )
+
+
+class FakeScores:
+    """Stands in for score_entries.iter_all over a list of saved scores"""
+
+    def __init__(self, saved: List[ScoreEntry]) -> None:
+        self.saved = sorted(saved, key=lambda e: e.total_score, reverse=True)
+        self.limits: List[Optional[int]] = []
+
+    def __call__(
+        self,
+        cnn: Any,
+        limit: Optional[int] = None,
+        categories: Optional[Collection[str]] = None,
+        score_tables: Optional[Collection[int]] = None,
+        exclude_tables: Collection[int] = (),
+    ) -> Iterator[ScoreEntry]:
+        self.limits.append(limit)
+        matching = [
+            e
+            for e in self.saved
+            if (categories is None or e.category in categories)
+            and (score_tables is None or e.score_table in score_tables)
+            and e.score_table not in exclude_tables
+        ]
+        return iter(matching if limit is None else matching[:limit])
+
+
+def test_table_ids_for_numbers() -> None:
+    tables = [TableStyles(10, "Table 1", 1, (1,)), TableStyles(11, "Table 2", 2, (2,))]
+
+    assert table_ids_for_numbers(tables, [2]) == ({11}, [])
+    assert table_ids_for_numbers(tables, [1, 3]) == ({10}, [3])
+
+
+def test_bos_candidates_include_ties_with_the_best(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = FakeScores([entry(i, "10", 1, 40) for i in range(1, 4)] + [entry(9, "10", 1, 20)])
+    monkeypatch.setattr(table_upload, "iter_all", fake)
+
+    candidates = load_bos_candidates(None, {2}, n=2)  # type: ignore
+
+    assert [e.entry_id for e in candidates] == [1, 2, 3, 9]
+    assert fake.limits == [2, 4]
+
+
+def test_scope_covers_categories_before_and_after(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = FakeScores(
+        [
+            # table 1 is being re-uploaded, entry 1 used to be in category 11
+            entry(1, "11", 1, 30),
+            entry(2, "10", 1, 31),
+            # other tables
+            entry(3, "10", 2, 35),
+            entry(4, "11", 2, 25),
+            entry(5, "12", 3, 45),
+            entry(6, "13", 3, 10),
+        ]
+    )
+    monkeypatch.setattr(table_upload, "iter_all", fake)
+    uploaded = [entry(2, "10", 1, 33), entry(7, "10", 1, 29), entry(8, "12", 2, 44)]
+
+    scope = load_table_scope(None, uploaded, {1})  # type: ignore
+
+    assert [e.entry_id for e in scope.entries] == [2, 7]
+    assert scope.categories == {"10", "11"}
+    assert sorted(scope.kept) == [3, 4, 5, 6]
+    assert sorted(e.entry_id for e in scope.category_entries()) == [2, 3, 4, 7]
+    assert sorted(e.entry_id for e in scope.bos_candidates) == [2, 3, 4, 5, 6, 7]
+    # the saved entry is shared, so placing it updates what is written back
+    assert scope.kept[3] is next(e for e in scope.bos_candidates if e.entry_id == 3)
+
+
+def saved_row(id: int, e: ScoreEntry) -> JudgingScore:
+    return JudgingScore(
+        id=id,
+        brewer_id=e.brewer_id,  # type: ignore
+        score_table=e.score_table,  # type: ignore
+        entry_id=e.entry_id,
+        total_score=e.total_score,
+        aroma=e.aroma,
+        appearance=e.appearance,
+        flavour=e.flavour,
+        body=e.body,
+        overall=e.overall,
+        score_spread=e.score_spread,
+        countback_status=None,
+        score_place=e.score_place,
+    )
+
+
+def test_entry_moved_from_another_table_is_not_saved_twice(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # entry 2 was saved on table 2, its style has since moved to table 1
+    saved = [entry(1, "10", 1, 30), entry(2, "11", 2, 31)]
+    rows = [saved_row(100 + e.entry_id, e) for e in saved]
+
+    def fake_load_scoped(
+        cnn: Any, score_tables: Collection[int], entry_ids: Collection[int]
+    ) -> List[JudgingScore]:
+        return [
+            r for r in rows if r.score_table in score_tables or r.entry_id in entry_ids
+        ]
+
+    monkeypatch.setattr(table_upload, "iter_all", FakeScores(saved))
+    monkeypatch.setattr(table_upload, "load_scoped", fake_load_scoped)
+    uploaded = [entry(1, "10", 1, 30), entry(2, "11", 1, 33)]
+
+    scope = load_table_scope(None, uploaded, {1})  # type: ignore
+    diff = diff_table_scope(None, scope)  # type: ignore
+
+    assert diff.inserts == []
+    assert diff.deletes == []
+    assert [(id, e.entry_id, e.score_table) for id, e in diff.updates] == [(102, 2, 1)]
+
+
+def test_confirm_text_matches_what_is_replaced() -> None:
+    assert "cleared" in confirm_description(ScoreWriteMode.CLEAR_AND_INSERT, False)
+    assert "cleared" not in confirm_description(ScoreWriteMode.SWAP, False)
+    assert "changed" in confirm_description(ScoreWriteMode.DIFF, False)
+    # tables are always diffed, whatever mode is picked
+    assert confirm_description(ScoreWriteMode.CLEAR_AND_INSERT, True) == confirm_description(
+        ScoreWriteMode.SWAP, True
+    )
+    assert "other scores are kept" in confirm_description(ScoreWriteMode.SWAP, True)
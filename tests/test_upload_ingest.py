@@ -0,0 +1,50 @@
+from io import BytesIO
+from pathlib import Path
+
+from src.csv_validate import REQUIRED_HEADERS
+from src.upload_ingest import READ_CHUNK_SIZE, ingest_upload
+
+ROW = "{eid},10,01,{total},2,3,10,7,{total_flavour},3\r\n"
+
+
+def make_csv(rows: int) -> bytes:
+    lines = [",".join(REQUIRED_HEADERS) + "\r\n"]
+    for i in range(rows, 0, -1):
+        lines.append(ROW.format(eid=i, total=30 + i % 10, total_flavour=10))
+    return "".join(lines).encode()
+
+
+def test_ingest_spools_and_parses(tmp_path: Path) -> None:
+    data = make_csv(5000)
+    assert len(data) > READ_CHUNK_SIZE
+    spool_path = Path(tmp_path, "upload.csv.part")
+
+    res = ingest_upload(BytesIO(data), spool_path)
+
+    assert res.ok, res.errors
+    assert res.spool_path == spool_path
+    assert spool_path.read_bytes() == data
+    assert res.bytes_read == len(data)
+    assert [e.entry_id for e in res.entries] == list(range(1, 5001))
+    assert res.entries[0].total_score == 31.0
+
+
+def test_ingest_rejects_binary(tmp_path: Path) -> None:
+    spool_path = Path(tmp_path, "upload.csv.part")
+
+    res = ingest_upload(BytesIO(b"\x89PNG\r\n\x1a\n\xff\xfe" * 100), spool_path)
+
+    assert not res.ok
+    assert res.errors == ["Binary files not supported!"]
+    assert not spool_path.exists()
+
+
+def test_ingest_missing_headers(tmp_path: Path) -> None:
+    spool_path = Path(tmp_path, "upload.csv.part")
+    header = ",".join(REQUIRED_HEADERS[:-1])
+
+    res = ingest_upload(BytesIO(f"{header}\n1,10,01,30,2,3,10,7,10\n".encode()), spool_path)
+
+    assert not res.ok
+    assert res.errors == ["Missing required headers: ['Score Spread']"]
+    assert not spool_path.exists()
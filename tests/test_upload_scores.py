@@ -0,0 +1,55 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+import pytest
+
+from src.controllers import upload_scores
+from src.controllers.upload_scores import load_brewers
+from src.datadefs import ScoreEntry
+from src.models.brewers import Brewer
+
+
+def entry(entry_id: int, brewer_id: Optional[int]) -> ScoreEntry:
+    return ScoreEntry(
+        entry_id=entry_id,
+        category="10",
+        sub_category="01",
+        total_score=30,
+        aroma=8,
+        appearance=2,
+        flavour=12,
+        body=3,
+        overall=5,
+        score_spread=2,
+        brewer_id=brewer_id,
+    )
+
+
+@pytest.fixture(autouse=True)
+def brewers(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_get_brewer_dict_for_ids(cnn: Any, brewer_ids: Iterable[int]) -> Dict[int, Brewer]:
+        return {
+            id: Brewer(id=id, uid=id, last_name="Able", first_name="Al", club=None)
+            for id in brewer_ids
+            if id != 404
+        }
+
+    monkeypatch.setattr(upload_scores, "get_brewer_dict_for_ids", fake_get_brewer_dict_for_ids)
+
+
+def test_load_brewers_sets_brewer() -> None:
+    entries = [entry(1, 100), entry(2, 101)]
+    messages: List[str] = []
+
+    assert load_brewers(None, entries, messages)  # type: ignore
+
+    assert [e.brewer.id for e in entries] == [100, 101]  # type: ignore
+    assert messages == []
+
+
+def test_load_brewers_reports_missing_brewers() -> None:
+    entries = [entry(1, 100), entry(2, None), entry(3, 404)]
+    messages: List[str] = []
+
+    assert not load_brewers(None, entries, messages)  # type: ignore
+
+    assert "Cannot find brewers for the following entries: [2, 3]" in messages